@@ -66,6 +66,9 @@ TRANSLATION_FILE_FORMATS = ('po', 'json')
 # YML Jobs Execution Types
 JOB_EXEC_TYPES = ('sequential', 'parallel')
 
+# YML Jobs Statuses
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed', 'cancelled')
+
 # Translation Workload Table Headers
 WORKLOAD_HEADERS = ('Total', 'Translated', 'Untranslated', 'Remaining')
 
@@ -13,10 +13,10 @@ class JobCommandBase(BaseManager):
 
     double_underscore_delimiter = "__"
 
-    def __init__(self):
+    def __init__(self, sandbox_path=None):
 
         kwargs = {
-            'sandbox_path': 'dashboard/sandbox/',
+            'sandbox_path': sandbox_path or 'dashboard/sandbox/',
         }
         super(JobCommandBase, self).__init__(**kwargs)
 
@@ -21,9 +21,13 @@ import os
 import difflib
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from inspect import getmembers, isfunction
 from shutil import rmtree
 
+# django
+from django.conf import settings
+
 # dashboard
 from dashboard.jobs_framework.cmds.apply import Apply
 from dashboard.jobs_framework.cmds.calculate import Calculate
@@ -38,6 +42,7 @@ from dashboard.jobs_framework.cmds.pullrequest import Pullrequest
 from dashboard.jobs_framework.cmds.unpack import Unpack
 from dashboard.jobs_framework.cmds.upload import Upload
 from dashboard.jobs_framework import BaseManager
+from dashboard.services.consume.decorators import release_db_connection
 
 __all__ = ['ActionMapper']
 
@@ -59,6 +64,8 @@ class ActionMapper(BaseManager):
         'PULLREQUEST': Pullrequest,     # Create and submit pull request
     }
 
+    MAX_PARALLEL_TASKS = 4
+
     def __init__(self,
                  tasks_structure,
                  job_base_dir,
@@ -87,7 +94,9 @@ class ActionMapper(BaseManager):
                  ci_target_langs,
                  ci_project_uid,
                  ci_lang_job_map,
-                 job_log_file):
+                 job_log_file,
+                 job_sandbox=None,
+                 job_cancelled=None):
         super(ActionMapper, self).__init__()
         self.tasks = tasks_structure
         self.tag = build_tag
@@ -117,6 +126,8 @@ class ActionMapper(BaseManager):
         self.ci_project_uid = ci_project_uid
         self.ci_lang_job_map = ci_lang_job_map
         self.log_f = job_log_file
+        self.sandbox = job_sandbox
+        self.job_cancelled = job_cancelled
         self.cleanup_resources = {}
         self.__build = None
         self.__result = None
@@ -157,7 +168,137 @@ class ActionMapper(BaseManager):
                 current_node.set_method(probable_method[0])
             current_node = current_node.next
 
-    def execute_tasks(self):
+    def _run_task(self, node):
+        return getattr(
+            node.get_namespace(),
+            node.get_method(), self.skip
+        )(node.get_namespace()(sandbox_path=self.sandbox_path), node.input, node.kwargs)
+
+    def _collect_output(self, current_node, initials):
+        """
+        Keep log and result of a finished task, and share its paths with later tasks
+        :return: False when the job should stop here
+        """
+        if current_node.log:
+            self.__log.update(current_node.log)
+        if self.sandbox:
+            self.sandbox.check_quota()
+
+        self.tasks.status = bool(current_node.output)
+        if current_node.output and 'builds' in current_node.output:
+            if not current_node.output['builds']:
+                return False
+            else:
+                self.__build = current_node.output.get('builds')
+        if current_node.output and 'srpm_path' in current_node.output:
+            d = {'srpm_path': current_node.output.get('srpm_path')}
+            initials.update(d)
+            self.cleanup_resources.update(d)
+        if current_node.output and current_node.output.get('srpm_sha256'):
+            initials.update({'srpm_sha256': current_node.output['srpm_sha256']})
+        if current_node.output and 'src_tar_dir' in current_node.output:
+            d = {'src_tar_dir': current_node.output.get('src_tar_dir')}
+            initials.update(d)
+            self.cleanup_resources.update(d)
+        if current_node.output and 'extract_dir' in current_node.output:
+            d = {'extract_dir': current_node.output.get('extract_dir')}
+            initials.update(d)
+            self.cleanup_resources.update(d)
+        if current_node.output and 'src_pot_file' in current_node.output:
+            d = {'src_pot_file': current_node.output.get('src_pot_file')}
+            initials.update(d)
+            self.cleanup_resources.update(d)
+        if current_node.output and 'platform_pot_path' in current_node.output:
+            d = {'platform_pot_path': current_node.output.get('platform_pot_path')}
+            initials.update(d)
+            self.cleanup_resources.update(d)
+        if current_node.output and 'download_dir' in current_node.output:
+            d = {'download_dir': current_node.output.get('download_dir')}
+            initials.update(d)
+            self.cleanup_resources.update(d)
+        if current_node.output and \
+                'trans_stats' in current_node.output or \
+                'pot_diff' in current_node.output or \
+                'push_files_resp' in current_node.output:
+            self.__result = current_node.output.get('trans_stats')
+            if not self.__result:
+                self.__result = current_node.output.copy()
+        return True
+
+    def _task_graph(self):
+        """
+        Tasks each task needs to be finished before it runs
+            - a task without needs waits for the task before it, as in sequential jobs
+            - needs: [] lets a task start right away
+        :return: OrderedDict {task node: [task nodes]}
+        """
+        nodes, task_ids = [], {}
+        current_node = self.tasks.head
+        while current_node is not None:
+            nodes.append(current_node)
+            if current_node.task_id:
+                if current_node.task_id in task_ids:
+                    raise Exception('Task id %s is used more than once.' % current_node.task_id)
+                task_ids[current_node.task_id] = current_node
+            current_node = current_node.next
+
+        task_graph = OrderedDict()
+        for position, node in enumerate(nodes):
+            if node.needs is None:
+                task_graph[node] = [nodes[position - 1]] if position else []
+                continue
+            unknown_ids = [task_id for task_id in node.needs if task_id not in task_ids]
+            if unknown_ids:
+                raise Exception('Task needs %s, no task has this id.' % unknown_ids[0])
+            task_graph[node] = [task_ids[task_id] for task_id in node.needs]
+        return task_graph
+
+    def _execute_task_graph(self, initials):
+        """
+        Run tasks as soon as the tasks they need are finished, MAX_PARALLEL_TASKS at a time
+            - input of a task is initials plus outputs of the tasks it needs
+        """
+        task_graph = self._task_graph()
+        pending, running, finished = list(task_graph), {}, []
+        stop, error = False, None
+        max_workers = getattr(settings, 'YML_JOBS_PARALLEL_TASKS', None) or self.MAX_PARALLEL_TASKS
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                if not stop and not error and self.job_cancelled and self.job_cancelled():
+                    error = Exception('Job cancelled.')
+                if not stop and not error:
+                    for node in [node for node in pending
+                                 if all(need in finished for need in task_graph[node])]:
+                        pending.remove(node)
+                        node.input = dict(initials)
+                        for need in task_graph[node]:
+                            node.input.update(need.output or {})
+                        running[executor.submit(release_db_connection(self._run_task), node)] = node
+                if not running:
+                    if pending and not stop and not error:
+                        error = Exception('Task needs form a cycle.')
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        node.output, node.log = future.result()
+                        finished.append(node)
+                        if not self._collect_output(node, initials):
+                            stop = True
+                    except Exception as e:
+                        error = error or e
+
+        if error:
+            raise error
+        self.tasks.status = bool(finished) and all(bool(node.output) for node in finished)
+
+    def execute_tasks(self, parallel=False):
+        """
+        Run tasks of the job
+        :param parallel: run tasks per their needs, instead of one after another
+        """
         count = 0
         current_node = self.tasks.head
         initials = {
@@ -176,59 +317,27 @@ class ActionMapper(BaseManager):
             'upstream_l10n_repo_url': self.upstream_l10n_url
         }
 
+        if parallel:
+            return self._execute_task_graph(initials)
+
         while current_node is not None:
+            if self.job_cancelled and self.job_cancelled():
+                raise Exception('Job cancelled.')
             if count == 0:
                 current_node.input = initials
             elif current_node.previous.output:
                 current_node.input = {**initials, **current_node.previous.output}
             count += 1
-            current_node.output, current_node.log = getattr(
-                current_node.get_namespace(),
-                current_node.get_method(), self.skip
-            )(current_node.get_namespace()(), current_node.input, current_node.kwargs)
+            current_node.output, current_node.log = self._run_task(current_node)
 
-            if current_node.log:
-                self.__log.update(current_node.log)
-
-            self.tasks.status = bool(current_node.output)
-            if current_node.output and 'builds' in current_node.output:
-                if not current_node.output['builds']:
-                    break
-                else:
-                    self.__build = current_node.output.get('builds')
-            if current_node.output and 'srpm_path' in current_node.output:
-                d = {'srpm_path': current_node.output.get('srpm_path')}
-                initials.update(d)
-                self.cleanup_resources.update(d)
-            if current_node.output and 'src_tar_dir' in current_node.output:
-                d = {'src_tar_dir': current_node.output.get('src_tar_dir')}
-                initials.update(d)
-                self.cleanup_resources.update(d)
-            if current_node.output and 'extract_dir' in current_node.output:
-                d = {'extract_dir': current_node.output.get('extract_dir')}
-                initials.update(d)
-                self.cleanup_resources.update(d)
-            if current_node.output and 'src_pot_file' in current_node.output:
-                d = {'src_pot_file': current_node.output.get('src_pot_file')}
-                initials.update(d)
-                self.cleanup_resources.update(d)
-            if current_node.output and 'platform_pot_path' in current_node.output:
-                d = {'platform_pot_path': current_node.output.get('platform_pot_path')}
-                initials.update(d)
-                self.cleanup_resources.update(d)
-            if current_node.output and 'download_dir' in current_node.output:
-                d = {'download_dir': current_node.output.get('download_dir')}
-                initials.update(d)
-                self.cleanup_resources.update(d)
-            if current_node.output and \
-                    'trans_stats' in current_node.output or \
-                    'pot_diff' in current_node.output or \
-                    'push_files_resp' in current_node.output:
-                self.__result = current_node.output.get('trans_stats')
-                if not self.__result:
-                    self.__result = current_node.output.copy()
+            if not self._collect_output(current_node, initials):
+                break
             current_node = current_node.next
 
+    @property
+    def sandbox_path(self):
+        return self.sandbox.path if self.sandbox else None
+
     @property
     def build(self):
         return self.__build or {}
@@ -247,6 +356,10 @@ class ActionMapper(BaseManager):
 
     def clean_workspace(self):
         """Remove downloaded SRPM, and its stuffs"""
+        if self.sandbox:
+            # everything of the job lives in its sandbox
+            self.sandbox.remove()
+            return
         try:
             if self.cleanup_resources.get('srpm_path'):
                 os.remove(self.cleanup_resources.get('srpm_path'))
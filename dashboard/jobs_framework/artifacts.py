@@ -0,0 +1,243 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import shutil
+import hashlib
+import logging
+from uuid import uuid4
+from subprocess import call
+
+# django
+from django.conf import settings
+
+
+__all__ = ['ArtifactCache', 'artifact_cache']
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactCache(object):
+    """
+    Content addressed cache of SRPMs and their extracted trees, shared across jobs
+        - entries are keyed by sha256 of the SRPM, an index maps its source to it
+        - the source is the hub URL with the build or task id, as scratch
+          and task SRPMs can share a file name with a build of another hub
+        - SRPMs are hard linked out, trees are copied with reflink where the fs allows
+        - least recently used entries are evicted beyond MAX_BYTES, each entry
+          records its own size so eviction does not walk the cache
+        - settings.ARTIFACT_CACHE overrides class defaults
+    """
+
+    ROOT = 'dashboard/artifacts/'
+    MAX_BYTES = 20 * 1024 ** 3
+    SIZE_FILE = '.size'
+
+    def _config(self, key):
+        cache_config = getattr(settings, 'ARTIFACT_CACHE', None) or {}
+        return cache_config.get(key, getattr(self, key))
+
+    @property
+    def root(self):
+        return self._config('ROOT')
+
+    def _entry_dir(self, sha256):
+        return os.path.join(self.root, 'objects', sha256)
+
+    def _index_path(self, source):
+        return os.path.join(self.root, 'index', hashlib.sha256(source.encode('utf-8')).hexdigest())
+
+    @staticmethod
+    def _write_atomic(file_path, text):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_path = '%s.%s' % (file_path, uuid4().hex)
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, file_path)
+
+    @staticmethod
+    def _copy_tree(src_dir, dest_dir):
+        # reflink when the filesystem supports it, a plain copy otherwise
+        os.makedirs(dest_dir, exist_ok=True)
+        return call(['cp', '-a', '--reflink=auto', os.path.join(src_dir, '.'), dest_dir]) == 0
+
+    def _touch(self, sha256):
+        try:
+            os.utime(self._entry_dir(sha256))
+        except OSError:
+            pass
+
+    def lookup(self, source, file_name):
+        """
+        sha256 of a cached SRPM
+        :param source: where the SRPM comes from, e.g. <hub_url>/build/<build_id>
+        :param file_name: SRPM file name, its NVR
+        :return: str or None
+        """
+        try:
+            with open(self._index_path(source)) as f:
+                sha256 = f.read().strip()
+        except OSError:
+            return None
+        if os.path.isfile(os.path.join(self._entry_dir(sha256), os.path.basename(file_name))):
+            return sha256
+        return None
+
+    def get_file(self, source, dest_path):
+        """
+        Link a cached SRPM to dest_path
+        :param source: where the SRPM comes from, e.g. <hub_url>/build/<build_id>
+        :return: sha256 or None when not cached
+        """
+        file_name = os.path.basename(dest_path)
+        sha256 = self.lookup(source, file_name)
+        if not sha256:
+            return None
+        cached_path = os.path.join(self._entry_dir(sha256), os.path.basename(file_name))
+        try:
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            try:
+                os.link(cached_path, dest_path)
+            except OSError:
+                # cache root on another filesystem
+                shutil.copy2(cached_path, dest_path)
+        except OSError as e:
+            logger.warning("Artifact cache could not provide %s: %s" % (file_name, e))
+            return None
+        self._touch(sha256)
+        return sha256
+
+    def put_file(self, source, file_path, sha256):
+        """Keep a downloaded SRPM under its sha256, indexed by its source"""
+        if not sha256:
+            return
+        file_name = os.path.basename(file_path)
+        entry_dir = self._entry_dir(sha256)
+        cached_path = os.path.join(entry_dir, file_name)
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            if not os.path.isfile(cached_path):
+                tmp_path = '%s.%s' % (cached_path, uuid4().hex)
+                try:
+                    os.link(file_path, tmp_path)
+                except OSError:
+                    shutil.copy2(file_path, tmp_path)
+                os.replace(tmp_path, cached_path)
+                self._add_size(entry_dir, os.path.getsize(cached_path))
+            self._write_atomic(self._index_path(source), sha256)
+        except OSError as e:
+            logger.warning("Artifact cache could not keep %s: %s" % (file_name, e))
+            return
+        self.evict()
+
+    def get_tree(self, sha256, name, dest_dir):
+        """
+        Copy a cached tree into dest_dir
+        :param sha256: sha256 of the SRPM the tree comes from
+        :param name: tree name, e.g. srpm or tarball file name
+        :return: relative path stored along the tree, or None when not cached
+        """
+        if not sha256:
+            return None
+        tree_dir = os.path.join(self._entry_dir(sha256), 'trees', name)
+        try:
+            with open(tree_dir + '.path') as f:
+                rel_path = f.read().strip()
+        except OSError:
+            return None
+        if not self._copy_tree(tree_dir, os.path.join(dest_dir, rel_path)):
+            return None
+        self._touch(sha256)
+        return rel_path
+
+    def put_tree(self, sha256, name, src_dir, rel_path='.'):
+        """Keep an extracted tree of an SRPM, rel_path is where it goes under the extract dir"""
+        if not sha256:
+            return
+        entry_dir = self._entry_dir(sha256)
+        if not os.path.isdir(entry_dir):
+            # SRPM got evicted meanwhile
+            return
+        tree_dir = os.path.join(entry_dir, 'trees', name)
+        if os.path.isdir(tree_dir):
+            return
+        tmp_dir = '%s.%s' % (tree_dir, uuid4().hex)
+        try:
+            if not self._copy_tree(src_dir, tmp_dir):
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return
+            os.rename(tmp_dir, tree_dir)
+            self._write_atomic(tree_dir + '.path', rel_path)
+            self._add_size(entry_dir, self._dir_size(tree_dir))
+        except OSError:
+            # a concurrent job kept it first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        self.evict()
+
+    @staticmethod
+    def _dir_size(dir_path):
+        size = 0
+        for root, dirs, files in os.walk(dir_path):
+            for file_name in files:
+                try:
+                    size += os.lstat(os.path.join(root, file_name)).st_size
+                except OSError:
+                    pass
+        return size
+
+    def _recorded_size(self, entry_dir):
+        try:
+            with open(os.path.join(entry_dir, self.SIZE_FILE)) as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _entry_size(self, entry_dir):
+        size = self._recorded_size(entry_dir)
+        if size is None:
+            # a new entry, or one kept before sizes were recorded: walked once
+            size = self._dir_size(entry_dir)
+            self._write_atomic(os.path.join(entry_dir, self.SIZE_FILE), str(size))
+        return size
+
+    def _add_size(self, entry_dir, size):
+        """Record size of what was just added to the entry"""
+        recorded_size = self._recorded_size(entry_dir)
+        if recorded_size is None:
+            self._entry_size(entry_dir)
+            return
+        self._write_atomic(os.path.join(entry_dir, self.SIZE_FILE), str(recorded_size + size))
+
+    def evict(self):
+        """Remove least recently used entries till the cache fits in MAX_BYTES"""
+        objects_dir = os.path.join(self.root, 'objects')
+        try:
+            entries = sorted((os.stat(entry).st_mtime, entry, self._entry_size(entry)) for entry in [
+                os.path.join(objects_dir, entry) for entry in os.listdir(objects_dir)
+            ] if os.path.isdir(entry))
+        except OSError:
+            # a concurrent eviction got there first
+            return
+        total_size = sum(size for _, _, size in entries)
+        for _, entry, size in entries:
+            if total_size <= self._config('MAX_BYTES'):
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+
+artifact_cache = ArtifactCache()
@@ -14,9 +14,8 @@
 # under the License.
 
 import os
-from shlex import split
 from shutil import copy2
-from subprocess import Popen, PIPE
+from subprocess import run, PIPE, STDOUT, DEVNULL
 from collections import OrderedDict
 
 from dashboard.jobs_framework import JobCommandBase
@@ -25,6 +24,43 @@ from dashboard.jobs_framework import JobCommandBase
 class Apply(JobCommandBase):
     """Handles all operations for APPLY Command"""
 
+    MAX_STRIP_LEVEL = 5
+
+    @staticmethod
+    def _patched_paths(patch_file):
+        """Paths named in the file headers of a patch"""
+        paths = []
+        with open(patch_file, errors='replace') as f:
+            for line in f:
+                if line.startswith(('--- ', '+++ ')):
+                    # drop timestamps, and quoting of paths with spaces
+                    path = line[4:].rstrip('\n').split('\t')[0].strip().strip('"')
+                    if path and path != '/dev/null' and path not in paths:
+                        paths.append(path)
+        return paths
+
+    def _strip_level(self, patch_file, tree_dir):
+        """
+        -p value of a patch, the one whose stripped header paths exist most in the tree
+            - files a patch creates only count through their parent directory
+        :return: int
+        """
+        patched_paths = self._patched_paths(patch_file)
+        scores = OrderedDict()
+        for p_value in range(self.MAX_STRIP_LEVEL + 1):
+            scores[p_value] = [0, 0]
+            for path in patched_paths:
+                parts = [part for part in path.split('/') if part]
+                if path.startswith('/') or len(parts) <= p_value:
+                    continue
+                stripped_path = os.path.join(tree_dir, *parts[p_value:])
+                if os.path.isfile(stripped_path):
+                    scores[p_value][0] += 1
+                elif len(parts) > p_value + 1 and os.path.isdir(os.path.dirname(stripped_path)):
+                    scores[p_value][1] += 1
+        best_p_value = max(scores, key=lambda p_value: scores[p_value])
+        return best_p_value if any(scores[best_p_value]) else 1
+
     def _apply_prep(self, input, prep_section, tar_dir, w_log, sub):
         file_ext = '.po'
         prep_steps = []
@@ -81,32 +117,33 @@ class Apply(JobCommandBase):
                 task_log.update(self._log_task(input['log_f'], task_subject, 'No patches found.'))
                 return tar_dir, {task_subject: task_log}
 
-            # apply patches
-            [copy2(patch, input['src_tar_dir']) for patch in patches]
-            os.chdir(input['src_tar_dir'])
+            # apply patches, each with the -p value its headers match
+            failed_patches = []
             for patch in patches:
-                err_msg = "Perhaps you used the wrong -p"
-                command_std_output = "Perhaps you used the wrong -p or --strip option?"
-                p_value = 0
-                p_value_limit = 5
-                while err_msg in command_std_output and p_value < p_value_limit:
-                    command = "patch -p" + str(p_value) + " -i " + patch.split('/')[-1]
-                    command = split(command)
-                    patch_output = Popen(command, stdout=PIPE)
-                    command_std_output = patch_output.stdout.read().decode("utf-8")
-                    patch_output.kill()
-                    p_value += 1
+                patch_file = os.path.abspath(patch)
+                # patch asks on the terminal, not stdin, of reversed or applied patches
+                command = ['patch', '--batch', '--forward',
+                           '-p%s' % self._strip_level(patch_file, input['src_tar_dir']),
+                           '-i', patch_file]
+                patch_output = run(command, cwd=input['src_tar_dir'], stdin=DEVNULL,
+                                   stdout=PIPE, stderr=STDOUT)
+                if patch_output.returncode != 0:
+                    failed_patches.append(os.path.basename(patch))
         except Exception as e:
-            os.chdir(input['base_dir'])
             task_log.update(self._log_task(
                 input['log_f'], task_subject,
                 'Something went wrong in applying patches: %s' % str(e)
             ))
         else:
-            os.chdir(input['base_dir'])
+            if failed_patches:
+                task_log.update(self._log_task(
+                    input['log_f'], task_subject, failed_patches,
+                    text_prefix='%s patches failed to apply' % len(failed_patches)
+                ))
             task_log.update(self._log_task(
-                input['log_f'], task_subject, patches,
-                text_prefix='%s patches applied' % len(patches)
+                input['log_f'], task_subject,
+                [patch for patch in patches if os.path.basename(patch) not in failed_patches],
+                text_prefix='%s patches applied' % (len(patches) - len(failed_patches))
             ))
 
         return tar_dir, {task_subject: task_log}
@@ -17,13 +17,50 @@ import os
 import polib
 from subprocess import Popen, PIPE
 from collections import OrderedDict
+# celery's fork of multiprocessing, its pools start in daemonic worker processes too
+from billiard import Pool, ProcessError, WorkerLostError
 
 from dashboard.jobs_framework import JobCommandBase
 
 
+def po_file_stats(po_file):
+    """
+    Message counts of a PO (or MO) file, run in pool processes
+    :return: ((translated, untranslated, fuzzy), None) or (None, parse error)
+    """
+    try:
+        po = polib.mofile(po_file) if po_file.endswith('mo') else polib.pofile(po_file)
+    except Exception as e:
+        return None, str(e)
+    return (
+        len(po.translated_entries()),
+        len(po.untranslated_entries()),
+        len([f_entry for f_entry in po.fuzzy_entries() if not f_entry.obsolete])
+    ), None
+
+
 class Calculate(JobCommandBase):
     """Handles all operations for CALCULATE Command"""
 
+    # below this many files, parsing in this process is faster than starting a pool
+    PARALLEL_MIN_FILES = 8
+
+    def _po_files_stats(self, po_files):
+        """
+        po_file_stats of each file, in order of po_files
+            - files are parsed in a pool of one process per CPU, when worth it
+        """
+        processes = min(os.cpu_count() or 1, len(po_files))
+        if processes >= 2 and len(po_files) >= self.PARALLEL_MIN_FILES:
+            try:
+                with Pool(processes=processes) as pool:
+                    return pool.map(
+                        po_file_stats, po_files, chunksize=max(1, len(po_files) // (processes * 4))
+                    )
+            except (OSError, ProcessError, WorkerLostError) as e:
+                self.app_logger('WARNING', "PO files are parsed serially, no process pool: %s" % e)
+        return [po_file_stats(po_file) for po_file in po_files]
+
     def stats(self, input, kwargs):
         """Calculate stats from filtered translations"""
 
@@ -37,24 +74,20 @@ class Calculate(JobCommandBase):
             elif input.get('upstream_repo_url'):
                 trans_stats['id'] = 'Upstream'
             trans_stats['stats'] = []
-            for po_file in input['trans_files']:
-                try:
-                    po = polib.mofile(po_file) if po_file.endswith('mo') else polib.pofile(po_file)
-                except Exception as e:
+            po_files = list(input['trans_files'])
+            for po_file, (po_stats, error) in zip(po_files, self._po_files_stats(po_files)):
+                if error is not None:
                     task_log.update(self._log_task(
                         input['log_f'], task_subject,
-                        'Something went wrong while parsing %s: %s' % (po_file, str(e))
+                        'Something went wrong while parsing %s: %s' % (po_file, error)
                     ))
                 else:
                     temp_trans_stats = {}
                     temp_trans_stats['unit'] = "MESSAGE"
                     temp_trans_stats['locale'] = po_file.split(os.sep)[input.get('locale_index', -2)] \
                         if input.get('podir') else po_file.split(os.sep)[-1].split('.')[0]
-                    temp_trans_stats['translated'] = len(po.translated_entries())
-                    temp_trans_stats['untranslated'] = len(po.untranslated_entries())
-                    temp_trans_stats['fuzzy'] = len(
-                        [f_entry for f_entry in po.fuzzy_entries() if not f_entry.obsolete]
-                    )
+                    temp_trans_stats['translated'], temp_trans_stats['untranslated'], \
+                        temp_trans_stats['fuzzy'] = po_stats
                     temp_trans_stats['total'] = temp_trans_stats['translated'] + \
                         temp_trans_stats['untranslated'] + temp_trans_stats['fuzzy']
                     trans_stats['stats'].append(temp_trans_stats.copy())
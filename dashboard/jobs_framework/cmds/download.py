@@ -15,34 +15,88 @@
 
 import os
 import polib
+import hashlib
 from requests.auth import HTTPBasicAuth
 import requests
 from collections import OrderedDict
 
+from django.conf import settings
+
 from dashboard.constants import (
     BUILD_SYSTEMS, TRANSPLATFORM_ENGINES, BRANCH_MAPPING_KEYS, API_TOKEN_PREFIX
 )
 from dashboard.jobs_framework.mixins import LanguageFormatterMixin
 from dashboard.jobs_framework import JobCommandBase
+from dashboard.jobs_framework.artifacts import artifact_cache
+from dashboard.services.consume.sessions import session_registry
 
 
 class Download(LanguageFormatterMixin, JobCommandBase):
     """Handles all operations for DOWNLOAD Command"""
 
-    def _download_file(self, file_link, file_path=None, headers=None, auth=None):
-        req = requests.get(file_link, headers=headers, auth=auth)
-        if req.status_code == 404:
-            return '404'
+    CHUNK_SIZE = 1024 * 1024
+    RESUME_ATTEMPTS = 3
+
+    def __init__(self, sandbox_path=None):
+        super(Download, self).__init__(sandbox_path=sandbox_path)
+        # hex digests of downloaded files, keyed by path
+        self.checksums = {}
+
+    @staticmethod
+    def _write_stream(response, file_obj, chunk_size, hasher=None):
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if chunk:
+                file_obj.write(chunk)
+                if hasher:
+                    hasher.update(chunk)
+
+    def _download_file(self, file_link, file_path=None, headers=None, auth=None,
+                       checksum=None, chunk_size=None):
+        """
+        Stream file to disk, chunk by chunk
+            - interrupted downloads resume from the partial file with a Range request
+        :param checksum: hashlib algorithm, hex digest is kept in self.checksums[file_path]
+        :return: file_path, '404' or '' on failure
+        """
         if not file_path:
             file_path = self.sandbox_path + file_link.split('/')[-1]
-        try:
-            with open(file_path, 'wb') as f:
-                f.write(req.content)
+        chunk_size = chunk_size or getattr(settings, 'DOWNLOAD_CHUNK_SIZE', self.CHUNK_SIZE)
+        part_path = file_path + '.part'
+        session = session_registry.get(file_link)
+        for _ in range(self.RESUME_ATTEMPTS):
+            request_headers = dict(headers or {})
+            downloaded = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+            if downloaded:
+                request_headers['Range'] = 'bytes=%s-' % downloaded
+            hasher = hashlib.new(checksum) if checksum else None
+            try:
+                with session.get(file_link, headers=request_headers, auth=auth, stream=True,
+                                 timeout=session_registry.timeout('download')) as req:
+                    if req.status_code == 404:
+                        return '404'
+                    if req.status_code == 416:
+                        # stale partial file, start over
+                        os.remove(part_path)
+                        continue
+                    if not req.ok:
+                        return ''
+                    resumed = bool(downloaded) and req.status_code == 206
+                    if hasher and resumed:
+                        with open(part_path, 'rb') as f:
+                            for chunk in iter(lambda: f.read(chunk_size), b''):
+                                hasher.update(chunk)
+                    with open(part_path, 'ab' if resumed else 'wb') as f:
+                        self._write_stream(req, f, chunk_size, hasher=hasher)
+                os.replace(part_path, file_path)
+                if hasher:
+                    self.checksums[file_path] = hasher.hexdigest()
                 return file_path
-        except FileNotFoundError:
-            return ''
-        except Exception:
-            return ''
+            except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError):
+                # keep the partial file, next attempt resumes it
+                continue
+            except Exception:
+                return ''
+        return ''
 
     def srpm(self, input, kwargs):
 
@@ -53,7 +107,7 @@ class Download(LanguageFormatterMixin, JobCommandBase):
         task = input.get('task')
 
         pkgs_download_server_url = ''
-        srpm_downloaded_path, srpm_download_url = '', ''
+        srpm_downloaded_path, srpm_download_url, srpm_source = '', '', ''
         if input.get('build_system', '') == BUILD_SYSTEMS[0]:
             pkgs_download_server_url = 'http://download.eng.bos.redhat.com/brewroot'
         elif input.get('build_system', '') == BUILD_SYSTEMS[1]:
@@ -62,13 +116,13 @@ class Download(LanguageFormatterMixin, JobCommandBase):
         if builds and len(builds) > 0 and 'hub_url' in input:
             latest_build = builds[0]
             build_id = latest_build.get('id', 0)
-            build_info = self.api_resources.get_build(hub_url=input['hub_url'], build_id=build_id)
-            rpms = self.api_resources.list_RPMs(hub_url=input['hub_url'], build_id=build_id)
+            build_info, rpms = self.api_resources.build_with_rpms(hub_url=input['hub_url'], build_id=build_id)
             src_rpm = [rpm for rpm in rpms if rpm.get('arch') == 'src'][0]
             srpm_download_url = os.path.join(
                 self.api_resources.get_path_info(build=build_info),
                 self.api_resources.get_path_info(srpm=src_rpm)
             ).replace('/mnt/koji', pkgs_download_server_url)
+            srpm_source = '%s/build/%s' % (input['hub_url'], build_id)
 
         if task and 'hub_url' in input and task.get('task_id'):
             srpm = ''
@@ -79,21 +133,37 @@ class Download(LanguageFormatterMixin, JobCommandBase):
             srpm_download_url = os.path.join(
                 self.api_resources.get_path_info(task=task['task_id']), srpm
             ).replace('/mnt/koji', pkgs_download_server_url)
+            srpm_source = '%s/task/%s' % (input['hub_url'], task['task_id'])
+
+        srpm_downloaded_path = self.sandbox_path + srpm_download_url.split('/')[-1]
+        srpm_sha256 = artifact_cache.get_file(srpm_source, srpm_downloaded_path) \
+            if srpm_source else None
+        if srpm_sha256:
+            task_log.update(self._log_task(
+                input['log_f'], task_subject,
+                'Found in artifact cache, sha256: %s' % srpm_sha256
+            ))
+            return {'srpm_path': srpm_downloaded_path, 'srpm_sha256': srpm_sha256}, \
+                {task_subject: task_log}
 
-        srpm_downloaded_path = self._download_file(srpm_download_url)
+        srpm_downloaded_path = self._download_file(srpm_download_url, checksum='sha256')
         if srpm_downloaded_path == '404':
             raise Exception('SRPM download failed. URL returns 404 NOT FOUND error.')
+        srpm_sha256 = self.checksums.get(srpm_downloaded_path, '')
         if srpm_downloaded_path:
+            if srpm_source:
+                artifact_cache.put_file(srpm_source, srpm_downloaded_path, srpm_sha256)
             task_log.update(self._log_task(
                 input['log_f'], task_subject,
-                'Successfully downloaded from %s' % srpm_download_url
+                'Successfully downloaded from %s, sha256: %s' % (srpm_download_url, srpm_sha256)
             ))
         else:
             task_log.update(self._log_task(
                 input['log_f'], task_subject,
                 'SRPM could not be downloaded from %s' % srpm_download_url
             ))
-        return {'srpm_path': srpm_downloaded_path}, {task_subject: task_log}
+        return {'srpm_path': srpm_downloaded_path, 'srpm_sha256': srpm_sha256}, \
+            {task_subject: task_log}
 
     def platform_pot_file(self, input, kwargs):
 
@@ -262,7 +332,7 @@ class Download(LanguageFormatterMixin, JobCommandBase):
             if not input.get('ci_project_uid') and kwargs.get('branch'):
                 project_version = kwargs.get('branch')
 
-            service_kwargs.update(dict(no_cache_api=True))
+            service_kwargs.update(dict(no_cache_api=True, stream=True))
 
             service_args = []
             service_args.append(platform_project)
@@ -305,7 +375,12 @@ class Download(LanguageFormatterMixin, JobCommandBase):
                         if not os.path.exists(download_folder):
                             os.makedirs(download_folder)
                         with open(d_file_path, 'wb') as f:
-                            f.write(pull_resp)
+                            if isinstance(pull_resp, bytes):
+                                f.write(pull_resp)
+                            else:
+                                with pull_resp:
+                                    self._write_stream(pull_resp, f, getattr(
+                                        settings, 'DOWNLOAD_CHUNK_SIZE', self.CHUNK_SIZE))
                     except Exception as e:
                         task_log.update(self._log_task(
                             input['log_f'], task_subject,
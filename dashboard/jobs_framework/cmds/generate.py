@@ -63,17 +63,15 @@ class Generate(JobCommandBase):
             if os.path.exists(pot_file) and kwargs.get('overwrite'):
                 os.unlink(pot_file)
             try:
-                os.chdir(input['src_tar_dir'])
-                generate_pot = Popen(command, stdout=PIPE, shell=True)
+                # run in the source tree, without moving the whole process there
+                generate_pot = Popen(command, stdout=PIPE, shell=True, cwd=input['src_tar_dir'])
                 output, error = generate_pot.communicate()
             except Exception as e:
-                os.chdir(input['base_dir'])
                 task_log.update(self._log_task(
                     input['log_f'], task_subject,
                     'POT file generation failed %s' % str(e)
                 ))
             else:
-                os.chdir(input['base_dir'])
                 if os.path.isfile(pot_file):
                     pot_file_path = pot_file
                     task_log.update(self._log_task(
@@ -20,6 +20,7 @@ from subprocess import Popen, PIPE, call
 from collections import OrderedDict
 
 from dashboard.jobs_framework import JobCommandBase
+from dashboard.jobs_framework.artifacts import artifact_cache
 
 
 class Unpack(JobCommandBase):
@@ -35,17 +36,19 @@ class Unpack(JobCommandBase):
         task_log = OrderedDict()
 
         try:
-            command = "rpm2cpio " + os.path.join(
-                input['base_dir'], input['srpm_path']
-            )
-            command = split(command)
-            rpm2cpio = Popen(command, stdout=PIPE)
             extract_dir = os.path.join(self.sandbox_path, input['package'])
-            if not os.path.exists(extract_dir):
-                os.makedirs(extract_dir)
-            command = "cpio -idm -D %s" % extract_dir
-            command = split(command)
-            call(command, stdin=rpm2cpio.stdout)
+            if artifact_cache.get_tree(input.get('srpm_sha256'), 'srpm', extract_dir) is None:
+                command = "rpm2cpio " + os.path.join(
+                    input['base_dir'], input['srpm_path']
+                )
+                command = split(command)
+                rpm2cpio = Popen(command, stdout=PIPE)
+                if not os.path.exists(extract_dir):
+                    os.makedirs(extract_dir)
+                command = "cpio -idm -D %s" % extract_dir
+                command = split(command)
+                if call(command, stdin=rpm2cpio.stdout) == 0:
+                    artifact_cache.put_tree(input.get('srpm_sha256'), 'srpm', extract_dir)
         except Exception as e:
             task_log.update(self._log_task(
                 input['log_f'], task_subject,
@@ -71,6 +74,19 @@ class Unpack(JobCommandBase):
         task_subject = "Unpack tarball"
         task_log = OrderedDict()
 
+        tar_files = [input['src_tar_file']] + list(input['related_tarballs'] or [])
+        tree_name = 'tarball-' + '-'.join(os.path.basename(tar_file) for tar_file in tar_files)
+        cached_tar_dir = artifact_cache.get_tree(input.get('srpm_sha256'), tree_name, input['extract_dir'])
+        if cached_tar_dir is not None:
+            src_tar_dir = os.path.join(input['extract_dir'], cached_tar_dir)
+            task_log.update(self._log_task(
+                input['log_f'], task_subject, os.listdir(src_tar_dir),
+                text_prefix='Tarball [ %s ] Found in artifact cache' % input['src_tar_file'].split('/')[-1]
+            ))
+            return {'src_tar_dir': src_tar_dir, 'src_translations': input['src_translations'],
+                    'spec_obj': input['spec_obj'], 'spec_sections': input['spec_sections']}, \
+                   {task_subject: task_log}
+
         try:
             src_tar_dir = None
             with tarfile.open(input['src_tar_file']) as tar_file:
@@ -102,6 +118,9 @@ class Unpack(JobCommandBase):
         else:
             if not os.path.isdir(src_tar_dir):
                 src_tar_dir = self._determine_tar_dir(input)
+            rel_tar_dir = os.path.relpath(src_tar_dir, input['extract_dir'])
+            if not rel_tar_dir.startswith(os.pardir) and rel_tar_dir != os.curdir:
+                artifact_cache.put_tree(input.get('srpm_sha256'), tree_name, src_tar_dir, rel_tar_dir)
             task_log.update(self._log_task(
                 input['log_f'], task_subject, os.listdir(src_tar_dir),
                 text_prefix='Tarball [ %s ] Extracted Successfully' % input['src_tar_file'].split('/')[-1]
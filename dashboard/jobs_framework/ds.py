@@ -26,6 +26,9 @@ class TaskNode(object):
         self.output = None
         self.log = None
         self.kwargs = {}
+        # dependencies, for parallel execution
+        self.task_id = None
+        self.needs = None
 
         self.__namespace = None
         self.__method = None
@@ -57,6 +60,13 @@ class TaskNode(object):
         self.output = res
 
     def set_kwargs(self, kwargs):
+        kwargs = dict(kwargs)
+        # id and needs are not command arguments
+        if 'id' in kwargs:
+            self.task_id = str(kwargs.pop('id'))
+        if 'needs' in kwargs:
+            needs = kwargs.pop('needs') or []
+            self.needs = [str(need) for need in (needs if isinstance(needs, list) else [needs])]
         self.kwargs.update(kwargs)
 
     def get_kwargs(self):
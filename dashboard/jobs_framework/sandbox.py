@@ -0,0 +1,116 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import time
+import shutil
+import logging
+
+# django
+from django.conf import settings
+
+
+__all__ = ['JobSandbox']
+
+logger = logging.getLogger(__name__)
+
+
+class JobSandbox(object):
+    """
+    Working directory of one job run, keyed by the job UUID
+        - every command of the job resolves its paths under it,
+          so jobs running at the same time never share files
+        - its disk usage is capped at MAX_BYTES
+        - left over directories older than MAX_AGE_HOURS (crashed runs) are purged
+        - settings.JOB_SANDBOX overrides class defaults
+    """
+
+    ROOT = 'dashboard/sandbox/jobs/'
+    MAX_BYTES = 5 * 1024 ** 3
+    MAX_AGE_HOURS = 24
+
+    def __init__(self, job_id):
+        self.job_id = str(job_id)
+
+    def _config(self, key):
+        sandbox_config = getattr(settings, 'JOB_SANDBOX', None) or {}
+        return sandbox_config.get(key, getattr(self, key))
+
+    @property
+    def root(self):
+        return self._config('ROOT')
+
+    @property
+    def path(self):
+        # commands append file names to it
+        return os.path.join(self.root, self.job_id, '')
+
+    @property
+    def log_file(self):
+        # followed by the job form while the job runs
+        return os.path.join(self.path, '.log')
+
+    def create(self):
+        self.purge_stale()
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path)
+        return self.path
+
+    def remove(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def disk_usage(self):
+        """Bytes used by files of the sandbox"""
+        usage = 0
+        for root, dirs, files in os.walk(self.path):
+            for file in files:
+                try:
+                    usage += os.lstat(os.path.join(root, file)).st_size
+                except OSError:
+                    pass
+        return usage
+
+    def check_quota(self):
+        """
+        :raise Exception: when the sandbox outgrew MAX_BYTES
+        """
+        usage, max_bytes = self.disk_usage(), self._config('MAX_BYTES')
+        if max_bytes and usage > max_bytes:
+            raise Exception('Job sandbox exceeded its disk quota: %s of %s bytes.' % (usage, max_bytes))
+
+    def purge_stale(self):
+        """Remove sandboxes of runs older than MAX_AGE_HOURS"""
+        try:
+            job_dirs = os.listdir(self.root)
+        except OSError:
+            return
+        stale_before = time.time() - self._config('MAX_AGE_HOURS') * 3600
+        for job_dir in job_dirs:
+            job_path = os.path.join(self.root, job_dir)
+            try:
+                if job_dir != self.job_id and os.path.isdir(job_path) and \
+                        os.stat(job_path).st_mtime < stale_before:
+                    shutil.rmtree(job_path, ignore_errors=True)
+            except OSError as e:
+                logger.warning("Stale job sandbox %s could not be purged: %s" % (job_path, e))
+
+    def __enter__(self):
+        self.create()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.remove()
+        return False
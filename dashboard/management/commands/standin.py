@@ -0,0 +1,74 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from django.core.management.base import BaseCommand
+
+from dashboard.services.consume.replay import response_recorder
+from dashboard.services.standin import StandInServer, KOJI_HUB_PATH
+
+
+class Command(BaseCommand):
+
+    help = 'Serve recorded platform responses and a fake Koji hub, for offline sync runs.'
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            '--port', type=int, default=8090,
+            help='Port to listen on.',
+        )
+
+        parser.add_argument(
+            '--fixtures-dir', default=response_recorder.fixtures_dir,
+            help='Directory of recorded fixtures, and koji.json of the fake hub.',
+        )
+
+        parser.add_argument(
+            '--latency-ms', type=int, default=0,
+            help='Delay added to every response.',
+        )
+
+        parser.add_argument(
+            '--error-rate', type=float, default=0.0,
+            help='Share of requests answered with --error-status, between 0 and 1.',
+        )
+
+        parser.add_argument(
+            '--error-status', type=int, default=503,
+            help='Status code of injected errors.',
+        )
+
+        parser.add_argument(
+            '--seed', type=int, default=None,
+            help='Seed of error injection, for repeatable runs.',
+        )
+
+    def handle(self, *args, **options):
+
+        server = StandInServer(
+            ('127.0.0.1', options['port']), options['fixtures_dir'],
+            latency_ms=options['latency_ms'], error_rate=options['error_rate'],
+            error_status=options['error_status'], seed=options['seed']
+        )
+        self.stdout.write(
+            "Serving %s on http://127.0.0.1:%s, Koji hub at %s" % (
+                options['fixtures_dir'], options['port'], KOJI_HUB_PATH)
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -46,8 +46,8 @@ class Command(BaseCommand):
     location_manager = GeoLocationManager()
     pipeline_manager = CIPipelineManager()
 
-    def _sync_package(self, pkg):
-        self.package_manager.sync_update_package_stats(pkg)
+    def _sync_package(self, pkg, stats_index=None):
+        self.package_manager.sync_update_package_stats(pkg, stats_index=stats_index)
         self.package_manager.fetch_latest_builds(pkg)
         self.pipeline_manager.refresh_pkg_pipelines(pkg)
 
@@ -56,9 +56,11 @@ class Command(BaseCommand):
         all_packages = self.package_manager.get_packages().filter(
             platform_last_updated__lte=timezone.now() - timedelta(hours=6)
         ).order_by('platform_url')
+        # platform documents fetched in this run, shared by its packages
+        stats_index = {}
         for package in all_packages:
             th = threading.Thread(
-                target=self._sync_package, args=(package.package_name, )
+                target=self._sync_package, args=(package.package_name, stats_index)
             )
             th.start()
             th.join()
@@ -100,8 +102,7 @@ class Command(BaseCommand):
                 **job_data, **{'params': [p.upper() for p in t_params],
                                'type': TS_JOB_TYPES[3]},
                 **{'active_user_email': 'anonymous@transtats.org'},
-                **{'sandbox_path': temp_path},
-                **{'job_log_file': temp_path + '.log'}
+                **{'sandbox_path': temp_path}
             )
 
             try:
@@ -17,7 +17,7 @@ import inspect
 import logging
 
 # dashboard
-from dashboard.services.resources import APIResources
+from dashboard.services.resources import APIResources, AsyncAPIResources
 
 
 __all__ = ['BaseManager']
@@ -40,6 +40,7 @@ class BaseManager(object):
                 setattr(self, str(attrib), value)
 
         self.api_resources = APIResources()
+        self.async_api_resources = AsyncAPIResources()
 
     def app_logger(self, log_level, log_msg):
         """Custom application logger"""
@@ -19,7 +19,6 @@
 import io
 import os
 import json
-import shutil
 import time
 from collections import OrderedDict
 from datetime import datetime
@@ -31,13 +30,17 @@ from yaml import load, FullLoader
 from django.conf import settings
 from django.utils import timezone
 
+# third party
+from celery import current_app
+
 # dashboard
 from dashboard.constants import (
-    TS_JOB_TYPES, JOB_EXEC_TYPES, GIT_REPO_TYPE, SYS_EMAIL_ADDR
+    TS_JOB_TYPES, JOB_EXEC_TYPES, JOB_STATUSES, GIT_REPO_TYPE, SYS_EMAIL_ADDR
 )
 from dashboard.jobs_framework.action_mapper import ActionMapper
 from dashboard.jobs_framework.ds import TaskList
 from dashboard.jobs_framework.parser import YMLPreProcessor, YMLJobParser
+from dashboard.jobs_framework.sandbox import JobSandbox
 from dashboard.managers import BaseManager
 from dashboard.managers.packages import PackagesManager
 from dashboard.managers.inventory import ReleaseBranchManager
@@ -79,11 +82,12 @@ class JobManager(object):
         """a UUID based on the host ID and current time"""
         return uuid4()
 
-    def __init__(self, job_type):
+    def __init__(self, job_type, job_uuid=None):
         """
         Entry point for initiating new job
         :param http_request: object
         :param job_type: string
+        :param job_uuid: UUID of a queued job
         """
         self.start_time = None
         self.log_json = OrderedDict()
@@ -91,7 +95,9 @@ class JobManager(object):
         self.job_remarks = None
         self.output_json = {}
         self.job_type = job_type
-        self.uuid = self._new_job_id()
+        # a queued job is logged already
+        self.queued = bool(job_uuid)
+        self.uuid = job_uuid or self._new_job_id()
         self.start_time = timezone.now()
         self.job_params = {}
         self.job_yml = None
@@ -100,12 +106,15 @@ class JobManager(object):
         self.ci_pipeline = None
 
     def create_job(self, user_email=None):
+        if self.queued:
+            return self._start_queued_job()
         match_params = {}
         match_params.update(dict(job_uuid=self.uuid))
         kwargs = {}
         kwargs.update(match_params)
         kwargs.update(dict(job_type=self.job_type))
         kwargs.update(dict(job_start_time=self.start_time))
+        kwargs.update(dict(job_status=JOB_STATUSES[1]))
         if user_email:
             kwargs.update(dict(triggered_by=user_email))
         try:
@@ -118,13 +127,61 @@ class JobManager(object):
         else:
             return True
 
+    def queue_job(self, user_email=None, remarks=None):
+        """Log a job which waits for a worker"""
+        try:
+            Job.objects.create(
+                job_uuid=self.uuid, job_type=self.job_type, job_start_time=self.start_time,
+                job_status=JOB_STATUSES[0], triggered_by=user_email, job_remarks=remarks
+            )
+        except Exception:
+            return False
+        else:
+            return True
+
+    def _start_queued_job(self):
+        """
+        Mark a queued job running
+            - a job cancelled meanwhile stays cancelled
+            - it keeps the start time it was queued at
+        """
+        try:
+            started = Job.objects.filter(
+                job_uuid=self.uuid, job_status=JOB_STATUSES[0]
+            ).update(job_status=JOB_STATUSES[1])
+            job = Job.objects.only('job_start_time').filter(job_uuid=self.uuid).first()
+        except Exception:
+            # log event, pass for now
+            return False
+        if job:
+            self.start_time = job.job_start_time
+        return bool(started)
+
+    def set_task_id(self, task_id):
+        """Keep the celery task id of a queued job, to revoke it"""
+        return Job.objects.filter(job_uuid=self.uuid).update(job_task_id=task_id)
+
+    def is_cancelled(self):
+        return Job.objects.filter(job_uuid=self.uuid, job_status=JOB_STATUSES[4]).exists()
+
+    def mark_job_failed(self, remarks=None):
+        """Close a queued or running job which could not finish on its own"""
+        return Job.objects.filter(
+            job_uuid=self.uuid, job_status__in=JOB_STATUSES[:2]
+        ).update(job_status=JOB_STATUSES[3], job_result=False,
+                 job_end_time=timezone.now(), job_remarks=remarks)
+
     def mark_job_finish(self, remove=None):
         """Update job with finish details"""
         try:
             if remove:
                 Job.objects.filter(job_uuid=self.uuid).delete()
             else:
+                job_status = JOB_STATUSES[2] if self.job_result else JOB_STATUSES[3]
+                if self.is_cancelled():
+                    job_status = JOB_STATUSES[4]
                 Job.objects.filter(job_uuid=self.uuid).update(
+                    job_status=job_status,
                     job_end_time=timezone.now(),
                     job_log_json_str=json.dumps(self.log_json),
                     job_result=self.job_result,
@@ -174,6 +231,26 @@ class JobsLogManager(BaseManager):
         job_log = Job.objects.filter(job_uuid=job_id).first()
         return job_log
 
+    def cancel_job(self, job_id):
+        """
+        Cancel a queued or running job
+            - a queued job never starts, a running one stops before its next task
+        :param job_id: Job ID: uuid
+        :return: bool
+        """
+        job = self.get_job_detail(job_id)
+        if not job or job.status not in JOB_STATUSES[:2]:
+            return False
+        cancelled = Job.objects.filter(
+            job_uuid=job_id, job_status__in=JOB_STATUSES[:2]
+        ).update(job_status=JOB_STATUSES[4])
+        if cancelled and job.job_task_id:
+            try:
+                current_app.control.revoke(job.job_task_id)
+            except Exception as e:
+                self.app_logger('ERROR', "Job task could not be revoked, details: " + str(e))
+        return bool(cancelled)
+
     def get_joblog_stats(self):
         """Stats about jobs log"""
         last_ran_on = None
@@ -555,22 +632,15 @@ class YMLBasedJobManager(BaseManager):
     """
 
     sandbox_path = 'dashboard/sandbox/'
-    job_log_file = sandbox_path + '.log'
 
     package_manager = PackagesManager()
     ci_pipeline_manager = CIPipelineManager()
 
-    @staticmethod
-    def job_suffix(args):
-        return "-".join(args)
-
     def __init__(self, *args, **kwargs):
         """Set Job Environment here"""
         super(YMLBasedJobManager, self).__init__(**kwargs)
-        self.suffix = self.job_suffix(
-            [getattr(self, param, '') for param in self.params][:3]
-        )
-        self.job_log_file = self.sandbox_path + '.log'
+        # to rebuild the job on a worker
+        self.job_kwargs = kwargs
 
     def _get_package(self):
         package_details = \
@@ -744,18 +814,27 @@ class YMLBasedJobManager(BaseManager):
             )
             raise Exception('Details could NOT be saved in db.')
 
-    def _wipe_workspace(self):
-        """This makes sandbox clean for a new job to run"""
-        # remove log file if exists
-        if os.path.exists(self.job_log_file):
-            os.remove(self.job_log_file)
-        for file in os.listdir(self.sandbox_path):
-            file_path = os.path.join(self.sandbox_path, file)
-            if os.path.isdir(file_path):
-                shutil.rmtree(file_path)
-            elif os.path.isfile(file_path) and not file_path.endswith('.py') \
-                    and '.log.' not in file_path:
-                os.unlink(file_path)
+    def enqueue_job(self):
+        """
+        Queue the job for a celery worker, instead of running it here
+        :return: job UUID
+        """
+        # tasks build on this module
+        from dashboard.tasks import task_run_yml_job
+
+        job_manager = JobManager(self.type)
+        if not job_manager.queue_job(user_email=getattr(self, 'active_user_email', None),
+                                     remarks=getattr(self, 'PACKAGE_NAME', None)):
+            raise Exception('Job could NOT be queued.')
+        job_kwargs = dict(self.job_kwargs)
+        job_kwargs.update(dict(job_uuid=str(job_manager.uuid)))
+        try:
+            task = task_run_yml_job.delay(job_kwargs)
+        except Exception as e:
+            job_manager.mark_job_failed(remarks='Job could not be queued: %s' % e)
+            raise Exception('Job could NOT be queued.')
+        job_manager.set_task_id(task.id)
+        return job_manager.uuid
 
     def execute_job(self):
         """
@@ -769,8 +848,6 @@ class YMLBasedJobManager(BaseManager):
         """
         can_publish_job = False
 
-        self._wipe_workspace()
-
         yml_preprocessed = YMLPreProcessor(self.YML_FILE, **{
             param: getattr(self, param, '') for param in self.params
         }).output
@@ -802,24 +879,32 @@ class YMLBasedJobManager(BaseManager):
                          ci_pipeline=self.ci_pipeline_uuid)
 
         # for sequential jobs, tasks should be pushed to linked list
-        # and output of previous task will be input for next task
-        if JOB_EXEC_TYPES[0] in yml_job.execution:
+        # and output of previous task will be input for next task,
+        # parallel jobs keep the list, tasks name the ones they need
+        if JOB_EXEC_TYPES[0] in yml_job.execution or JOB_EXEC_TYPES[1] in yml_job.execution:
             self.tasks_ds = TaskList()
         else:
             raise Exception('%s exec type is NOT supported yet.' % yml_job.execution)
 
         # lets create a job
-        job_manager = JobManager(self.type)
+        job_manager = JobManager(self.type, getattr(self, 'job_uuid', None))
+        if not job_manager.queued and getattr(self, 'JOB_UUID', None):
+            # the job form follows the log by it
+            job_manager.uuid = self.JOB_UUID
         if job_manager.create_job(user_email=self.active_user_email):
             self.job_id = job_manager.uuid
             job_manager.job_remarks = self.package
+        elif job_manager.is_cancelled():
+            # cancelled while it waited for a worker
+            return None, can_publish_job
+        # its files stay apart from those of other running jobs
+        job_sandbox = JobSandbox(job_manager.uuid)
         # and set tasks
         tasks = yml_job.tasks
         for task in tasks:
             self.tasks_ds.add_task(task)
-        log_file = self.job_log_file + ".%s.%s" % (self.suffix, self.type)
-        if os.path.exists(log_file):
-            os.unlink(log_file)
+        # goes away with the sandbox
+        log_file = job_sandbox.log_file
         action_mapper = ActionMapper(
             self.tasks_ds,
             self.job_base_dir,
@@ -848,12 +933,15 @@ class YMLBasedJobManager(BaseManager):
             getattr(self, 'ci_target_langs', []),
             getattr(self, 'ci_project_uid', ''),
             getattr(self, 'ci_lang_job_map', {}),
-            log_file
+            log_file,
+            job_sandbox,
+            job_manager.is_cancelled
         )
         action_mapper.set_actions()
         # lets execute collected tasks
         try:
-            action_mapper.execute_tasks()
+            job_sandbox.create()
+            action_mapper.execute_tasks(parallel=JOB_EXEC_TYPES[1] in yml_job.execution)
         except Exception as e:
             job_manager.job_result = False
             setattr(self, 'exception', e)
@@ -899,6 +987,4 @@ class YMLBasedJobManager(BaseManager):
                 self._save_stats_in_db(action_mapper.result, action_mapper.build)
             if self.type in ([TS_JOB_TYPES[7], TS_JOB_TYPES[9]]):
                 self._save_push_results_in_db(action_mapper.result.get('push_files_resp', {}))
-        if os.path.exists(log_file):
-            os.unlink(log_file)
         return self.job_id, can_publish_job
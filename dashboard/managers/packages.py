@@ -477,10 +477,12 @@ class PackagesManager(InventoryManager):
                 update_pkg_status = True
         return update_pkg_status
 
-    def sync_update_package_stats(self, package_name):
+    def sync_update_package_stats(self, package_name, stats_index=None):
         """
         Sync with translation platform and update trans stats in db for a package
         :param package_name: str
+        :param stats_index: dict shared by the packages of one sync run, fetched
+                            platform documents are parsed once for all of them
         :return: boolean
         """
         update_stats_status = False
@@ -494,14 +496,15 @@ class PackagesManager(InventoryManager):
                 # this is a quick fix for chinese in DamnedLies modules
                 locales = [locale.locale_alias if 'zh' not in locale.locale_id else locale.locale_id
                            for locale in self.get_locales(only_active=True)]
-                locales_stats_list = []
-                for locale in locales:
-                    locale_stats = self.api_resources.fetch_translation_statistics(
-                        package.platform_slug.engine_name, package.platform_slug.api_url,
-                        locale, version, **dict(package_name=package_name)
-                    )
-                    if locale_stats:
-                        locales_stats_list.append(locale_stats)
+                # one document per locale, fetched concurrently, shared by the packages of a sync run
+                locales_stats_list = [
+                    locale_stats for locale_stats in self.async_api_resources.gather(
+                        ('fetch_translation_statistics',
+                         (package.platform_slug.engine_name, package.platform_slug.api_url, locale, version),
+                         dict(package_name=package_name, stats_index=stats_index))
+                        for locale in locales
+                    ) if locale_stats
+                ]
                 proj_trans_stats_response_dict.update({"id": version, "stats": locales_stats_list})
             else:
                 proj_trans_stats_response_dict = self.api_resources.fetch_translation_statistics(
@@ -764,7 +767,8 @@ class PackagesManager(InventoryManager):
             builds = self.api_resources.build_info(
                 hub_url=product_hub_url,
                 tag=build_tag,
-                pkg=package_name
+                pkg=package_name,
+                snapshot=True
             )
 
             latest_build = {}
@@ -847,13 +851,14 @@ class PackagesManager(InventoryManager):
                     product_build_system_hub_url, build_sys_pkg_id
                 )
                 pkg_builds = pkg_builds[::-1][:self.LATEST_BUILD_COUNT]
+                builds_tags = self.api_resources.list_tags_bulk(
+                    product_build_system_hub_url,
+                    [pkg_build['build_id'] for pkg_build in pkg_builds if pkg_build.get('build_id')]
+                )
                 for pkg_build in pkg_builds:
                     if pkg_build.get('build_id'):
-                        build_tags = self.api_resources.list_tags(
-                            product_build_system_hub_url, pkg_build['build_id']
-                        )
                         pkg_build.update(
-                            {'build_tags': build_tags}
+                            {'build_tags': builds_tags.get(pkg_build['build_id'], [])}
                         )
                 key = "{}-{}".format(product.product_slug, product.product_build_system)
                 pkg_latest_builds[key] = pkg_builds
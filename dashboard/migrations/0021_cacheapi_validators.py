@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0020_update_job_templates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cacheapi',
+            name='response_etag',
+            field=models.CharField(blank=True, max_length=400, null=True),
+        ),
+        migrations.AddField(
+            model_name='cacheapi',
+            name='response_last_modified',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.28 on 2026-10-16 11:40
+
+from django.db import migrations, models
+
+
+def clear_api_cache(apps, schema_editor):
+    # cached responses are refetched, no need to convert them
+    CacheAPI = apps.get_model('dashboard', 'CacheAPI')
+    CacheAPI.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0021_cacheapi_validators'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_api_cache, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='cacheapi',
+            name='response_content',
+        ),
+        migrations.RemoveField(
+            model_name='cacheapi',
+            name='response_content_json_str',
+        ),
+        migrations.AddField(
+            model_name='cacheapi',
+            name='response_content_gz',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='cacheapi',
+            index=models.Index(fields=['base_url', 'resource'], name='ts_cacheapi_url_resource_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cacheapi',
+            index=models.Index(fields=['expiry'], name='ts_cacheapi_expiry_idx'),
+        ),
+    ]
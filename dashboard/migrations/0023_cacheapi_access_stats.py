@@ -0,0 +1,28 @@
+# Generated by Django 2.2.28 on 2026-10-16 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0022_cacheapi_compressed_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cacheapi',
+            name='service',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='cacheapi',
+            name='hits',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='cacheapi',
+            name='last_accessed',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-16 20:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0023_cacheapi_access_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='job_status',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='job_task_id',
+            field=models.CharField(blank=True, max_length=200, null=True),
+        ),
+    ]
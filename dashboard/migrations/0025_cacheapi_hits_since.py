@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-16 22:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0024_job_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cacheapi',
+            name='hits_since',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-16 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0025_cacheapi_hits_since'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cacheapi',
+            name='response_link',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
@@ -16,6 +16,7 @@
 # python
 import json
 import yaml
+import zlib
 from uuid import uuid4
 
 # django
@@ -29,6 +30,8 @@ from django.utils import timezone
 # third party
 from rest_framework.authtoken.models import Token
 
+from dashboard.constants import JOB_STATUSES
+
 
 TABLE_PREFIX = 'ts_'
 
@@ -606,6 +609,17 @@ class Job(ModelMixin, models.Model):
     job_output_json_str = models.TextField(null=True, blank=True)
     triggered_by = models.EmailField(null=True)
     job_visible_on_url = models.BooleanField(default=False)
+    job_status = models.CharField(max_length=20, null=True, blank=True)
+    job_task_id = models.CharField(max_length=200, null=True, blank=True)
+
+    @property
+    def status(self):
+        if self.job_status:
+            return self.job_status
+        # jobs logged before statuses were kept
+        if not self.job_end_time:
+            return JOB_STATUSES[1]
+        return JOB_STATUSES[2] if self.job_result else JOB_STATUSES[3]
 
     @property
     def job_log_json(self):
@@ -699,16 +713,39 @@ class CacheAPI(ModelMixin, models.Model):
         models.CharField(max_length=400, blank=True), default=list
     )
     request_kwargs = models.CharField(max_length=1000)
-    response_content = models.TextField(max_length=10000)
-    response_content_json_str = models.TextField(null=True, blank=True)
+    response_content_gz = models.BinaryField(null=True, blank=True)
+    response_etag = models.CharField(max_length=400, null=True, blank=True)
+    response_last_modified = models.CharField(max_length=100, null=True, blank=True)
+    response_link = models.TextField(null=True, blank=True)
     expiry = models.DateTimeField()
+    service = models.CharField(max_length=100, null=True, blank=True)
+    hits = models.PositiveIntegerField(default=0)
+    hits_since = models.DateTimeField(null=True, blank=True)
+    last_accessed = models.DateTimeField(null=True, blank=True)
+
+    @staticmethod
+    def compress(content):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return zlib.compress(content or b'')
+
+    @property
+    def response_content(self):
+        # decompressed on access, the row holds a single zlib payload
+        if not self.response_content_gz:
+            return b''
+        return zlib.decompress(bytes(self.response_content_gz))
 
     @property
     def response_content_json(self):
-        return self.str2json(self.response_content_json_str)
+        return self.str2json(self.response_content)
 
     class Meta:
         db_table = TABLE_PREFIX + 'cacheapi'
+        indexes = [
+            models.Index(fields=['base_url', 'resource'], name='ts_cacheapi_url_resource_idx'),
+            models.Index(fields=['expiry'], name='ts_cacheapi_expiry_idx'),
+        ]
 
 
 class CacheBuildDetails(ModelMixin, models.Model):
@@ -13,30 +13,164 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import os
+import sys
 import json
+import atexit
+import time
 import iso8601
-import requests
+import threading
+from collections import Counter, OrderedDict
 from datetime import timedelta
+from celery.signals import worker_process_shutdown
 
 # django
+from django.conf import settings
+from django.db.models import Case, F, Q, Value, When
 from django.utils import timezone
 
 # dashboard
 from dashboard.constants import TRANSPLATFORM_ENGINES
 from dashboard.models import CacheAPI, Platform
+from dashboard.services.consume.decorators import release_db_connection
 
 from dashboard.services.consume.config.memsource import \
     resources as memsource_resources, media_types as memsource_media_types
+from dashboard.services.consume.sessions import session_registry
+
+
+class LRUResponseCache(object):
+    """
+    Bounded in-process LRU of decoded API responses
+        - entries are evicted by count, by bytes of their content and by TTL
+        - constructor arguments override settings.API_MEMORY_CACHE,
+          which overrides class defaults
+        - cached json is shared, callers must not mutate it
+    """
+
+    MAX_ENTRIES = 512
+    MAX_BYTES = 64 * 1024 ** 2
+    TTL_SEC = 600
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl_sec=None):
+        self._overrides = {key: value for key, value in
+                           (('MAX_ENTRIES', max_entries), ('MAX_BYTES', max_bytes), ('TTL_SEC', ttl_sec))
+                           if value is not None}
+        # key: (expires at, value, bytes)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _config(self, key):
+        if key in self._overrides:
+            return self._overrides[key]
+        cache_config = getattr(settings, 'API_MEMORY_CACHE', None) or {}
+        return cache_config.get(key, getattr(self, key))
+
+    @property
+    def max_entries(self):
+        return self._config('MAX_ENTRIES')
+
+    @property
+    def max_bytes(self):
+        return self._config('MAX_BYTES')
+
+    @property
+    def ttl_sec(self):
+        return self._config('TTL_SEC')
+
+    @staticmethod
+    def _size(value):
+        """Bytes of the raw content held by an entry, the decoded json is of the same order"""
+        items = value if isinstance(value, tuple) else (value,)
+        return sum(len(item) for item in items if isinstance(item, (str, bytes))) or sys.getsizeof(value)
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= entry[2]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                self._pop(key)
+            self.misses += 1
+        return None
+
+    def set(self, key, value, ttl_sec=None):
+        ttl_sec = self.ttl_sec if ttl_sec is None else min(ttl_sec, self.ttl_sec)
+        max_entries, max_bytes = self.max_entries, self.max_bytes
+        size = self._size(value)
+        with self._lock:
+            self._pop(key)
+            if ttl_sec <= 0 or size > max_bytes:
+                # too big to share the budget with anything else
+                return
+            self._entries[key] = (time.monotonic() + ttl_sec, value, size)
+            self._bytes += size
+            while len(self._entries) > max_entries or self._bytes > max_bytes:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
 
 
 class CacheAPIManager(object):
     """Class to handle db interface to services"""
 
     EXPIRY_MIN = 60
+    STALE_KEEP_DAYS = 7
+
+    ACCESS_FLUSH_SEC = 60
+    HOT_WINDOW_HOURS = 24
+
+    TOKEN_REFRESH_MIN = 10
+    TOKEN_HOLD_MIN = 30
+
+    # shared by every manager instance of the process
+    memory_cache = LRUResponseCache()
+    # (base_url, resource): lookups since the last flush
+    access_counts = Counter()
+    access_counts_lock = threading.Lock()
+    # pid of the process running the flusher thread, forked workers start their own
+    access_flusher_pid = [None]
+    # server_url: (token, token_expiry, held_since)
+    auth_tokens = {}
+    auth_token_locks = {}
+    auth_tokens_lock = threading.Lock()
 
     def save_api_response(self, req_base_url, req_resource, resp_content,
-                          resp_content_json, *req_args, **req_kwargs):
-        """Save API responses in db"""
+                          resp_content_json, *req_args, service=None, resp_headers=None, **req_kwargs):
+        """Save API responses in db, along with validators and pagination links"""
+        resp_headers = resp_headers or {}
         cache_params = {}
         match_params = {
             'base_url': req_base_url,
@@ -45,9 +179,18 @@ class CacheAPIManager(object):
         cache_params.update(match_params)
         cache_params['request_args'] = req_args
         cache_params['request_kwargs'] = str(req_kwargs)
-        cache_params['response_content'] = resp_content
-        cache_params['response_content_json_str'] = json.dumps(resp_content_json)
+        # json_content is decoded again from the compressed raw content on read
+        cache_params['response_content_gz'] = CacheAPI.compress(resp_content)
+        cache_params['response_etag'] = resp_headers.get('ETag')
+        cache_params['response_last_modified'] = resp_headers.get('Last-Modified')
+        # next and last pages of a listing, cached first pages still page on
+        cache_params['response_link'] = resp_headers.get('Link')
         cache_params['expiry'] = timezone.now() + timedelta(minutes=self.EXPIRY_MIN)
+        cache_params['service'] = service
+        self.memory_cache.set(
+            (req_base_url, req_resource), (resp_content, resp_content_json, cache_params['response_link']),
+            ttl_sec=self.EXPIRY_MIN * 60
+        )
         try:
             CacheAPI.objects.update_or_create(
                 base_url=req_base_url, resource=req_resource, defaults=cache_params
@@ -58,13 +201,17 @@ class CacheAPIManager(object):
 
     def get_cached_response(self, base_url, resource):
         """
-        Check cached response in db
+        Check cached response in memory, then in db
         :param base_url:
         :param resource:
-        :return:
+        :return: (content, json_content, link header)
         """
+        self._record_access(base_url, resource)
+        memory_cached = self.memory_cache.get((base_url, resource))
+        if memory_cached:
+            return memory_cached
         try:
-            fields = ['expiry', 'response_content', 'response_content_json_str']
+            fields = ['expiry', 'response_content_gz', 'response_link']
             filter_params = {
                 'base_url': base_url,
                 'resource': resource,
@@ -76,15 +223,171 @@ class CacheAPIManager(object):
         else:
             if cache:
                 if cache.expiry > timezone.now():
-                    return cache.response_content, cache.response_content_json
-        return False, False
+                    response_content = cache.response_content
+                    cached_response = response_content, cache.str2json(response_content), cache.response_link
+                    self.memory_cache.set(
+                        (base_url, resource), cached_response,
+                        ttl_sec=(cache.expiry - timezone.now()).total_seconds()
+                    )
+                    return cached_response
+        return False, False, None
+
+    def _record_access(self, base_url, resource):
+        """
+        Count lookups of a cached response, for warm-up of hot ones
+            - counts are kept in memory, lookups never write to db
+            - a flusher thread of the process writes them every ACCESS_FLUSH_SEC,
+              and once more when the process exits
+        """
+        with self.access_counts_lock:
+            self.access_counts[(base_url, resource)] += 1
+            if self.access_flusher_pid[0] == os.getpid():
+                return
+            self.access_flusher_pid[0] = os.getpid()
+        atexit.register(self.flush_access_counts)
+        threading.Thread(
+            target=self._flush_access_counts_forever, name='cache-access-flusher', daemon=True
+        ).start()
+
+    @classmethod
+    def _flush_access_counts_forever(cls):
+        while True:
+            time.sleep(cls.ACCESS_FLUSH_SEC)
+            cls.flush_access_counts()
+
+    @classmethod
+    @release_db_connection
+    def flush_access_counts(cls):
+        """
+        Add lookups counted in this process to the hits of cached responses
+            - hits are counted per HOT_WINDOW_HOURS window, starting at hits_since;
+              the first lookup after a window lapsed starts a new one
+        """
+        with cls.access_counts_lock:
+            access_counts = dict(cls.access_counts)
+            cls.access_counts.clear()
+        if not access_counts:
+            return
+        now = timezone.now()
+        window_hours = (getattr(settings, 'CACHE_WARMUP', None) or {}).get(
+            'HOT_WINDOW_HOURS', cls.HOT_WINDOW_HOURS)
+        in_window = Q(hits_since__gte=now - timedelta(hours=window_hours))
+        try:
+            for (base_url, resource), count in access_counts.items():
+                CacheAPI.objects.filter(base_url=base_url, resource=resource).update(
+                    hits=Case(When(in_window, then=F('hits') + count), default=Value(count)),
+                    hits_since=Case(When(in_window, then=F('hits_since')), default=Value(now)),
+                    last_accessed=now
+                )
+        except Exception as e:
+            # log error
+            pass
+
+    def get_stale_response(self, base_url, resource):
+        """
+        Expired cached response which can still be revalidated
+        :param base_url:
+        :param resource:
+        :return: dict
+        """
+        try:
+            fields = ['response_content_gz', 'response_etag', 'response_last_modified', 'response_link']
+            filter_params = {
+                'base_url': base_url,
+                'resource': resource,
+            }
+            cache = CacheAPI.objects.only(*fields).filter(**filter_params).first()
+        except Exception as e:
+            # log error
+            pass
+        else:
+            if cache and (cache.response_etag or cache.response_last_modified):
+                response_content = cache.response_content
+                return {
+                    'content': response_content,
+                    'json_content': cache.str2json(response_content),
+                    'etag': cache.response_etag,
+                    'last_modified': cache.response_last_modified,
+                    'link': cache.response_link,
+                }
+        return {}
+
+    def refresh_expiry(self, base_url, resource, resp_content, resp_content_json, resp_link=None):
+        """
+        Extend expiry of a revalidated (304 Not Modified) cached response
+        :param base_url:
+        :param resource:
+        :param resp_content:
+        :param resp_content_json:
+        :param resp_link: Link header of the cached response
+        """
+        self.memory_cache.set(
+            (base_url, resource), (resp_content, resp_content_json, resp_link),
+            ttl_sec=self.EXPIRY_MIN * 60
+        )
+        try:
+            CacheAPI.objects.filter(base_url=base_url, resource=resource).update(
+                expiry=timezone.now() + timedelta(minutes=self.EXPIRY_MIN)
+            )
+        except Exception as e:
+            # log error
+            pass
+
+    def purge_expired(self):
+        """
+        Delete expired cached responses
+            - ones with validators are kept STALE_KEEP_DAYS for conditional GETs
+        :return: number of rows deleted
+        """
+        now = timezone.now()
+        expired = Q(expiry__lt=now - timedelta(days=self.STALE_KEEP_DAYS)) | Q(
+            expiry__lt=now, response_etag__isnull=True, response_last_modified__isnull=True
+        )
+        try:
+            deleted, _ = CacheAPI.objects.filter(expired).delete()
+        except Exception as e:
+            # log error
+            return 0
+        return deleted
 
     def tally_auth_token(self, server_url):
         """
         Tally auth token if it is still valid,
             if not get a new one, and save
+            - tokens are held in process memory, keyed by platform url
+            - refreshed TOKEN_REFRESH_MIN ahead of their expiry
         :return: api_auth_token: str
         """
+        auth_token = self._held_auth_token(server_url)
+        if auth_token:
+            return auth_token
+        with self._auth_token_lock(server_url):
+            # another thread may have logged in meanwhile
+            auth_token = self._held_auth_token(server_url)
+            if auth_token:
+                return auth_token
+            auth_token, token_expiry = self._db_or_new_auth_token(server_url)
+            if auth_token and token_expiry:
+                self.auth_tokens[server_url] = (auth_token, token_expiry, timezone.now())
+            return auth_token
+
+    def _held_auth_token(self, server_url):
+        auth_token, token_expiry, held_since = self.auth_tokens.get(server_url) or ('', None, None)
+        if auth_token and \
+                token_expiry - timedelta(minutes=self.TOKEN_REFRESH_MIN) > timezone.now() and \
+                held_since + timedelta(minutes=self.TOKEN_HOLD_MIN) > timezone.now():
+            return auth_token
+        return ''
+
+    def _auth_token_lock(self, server_url):
+        with self.auth_tokens_lock:
+            return self.auth_token_locks.setdefault(server_url, threading.Lock())
+
+    def _db_or_new_auth_token(self, server_url):
+        """
+        Auth token saved in db, or a new one from the platform
+        :return: (api_auth_token: str, token_expiry: datetime)
+        """
         try:
             filter_params = dict(api_url=server_url)
             platform = Platform.objects.filter(**filter_params).first()
@@ -94,13 +397,14 @@ class CacheAPIManager(object):
         else:
             # API auth token is still valid
             if platform and platform.engine_name == TRANSPLATFORM_ENGINES[4]:
-                if platform.token_status and \
+                if platform.token_expiry and \
+                        platform.token_expiry - timedelta(minutes=self.TOKEN_REFRESH_MIN) > timezone.now() and \
                         platform.token_api_json and \
                         platform.auth_login_id == \
                         platform.token_api_json.get("user", {}).get("userName", ""):
-                    return platform.token_api_json.get("token", "")
+                    return platform.token_api_json.get("token", ""), platform.token_expiry
                 else:
-                    # either no or invalid API auth token, prepare and call API
+                    # either no, expiring or invalid API auth token, prepare and call API
                     config = memsource_resources.get('request_token')
                     payload = {}
                     payload.update(dict(userName=platform.auth_login_id))
@@ -110,7 +414,10 @@ class CacheAPIManager(object):
                     headers['Content-Type'] = memsource_media_types[0]
 
                     auth_api_url = platform.api_url + "/api2/v1" + config.mount_point
-                    response = requests.post(url=auth_api_url, json=payload, headers=headers)
+                    response = session_registry.get(auth_api_url).post(
+                        url=auth_api_url, json=payload, headers=headers,
+                        timeout=session_registry.timeout(platform.engine_name)
+                    )
                     if response.ok:
                         response_json = response.json()
                         token_expiry = iso8601.parse_date(response_json.get("expires", ""))
@@ -123,5 +430,11 @@ class CacheAPIManager(object):
                         except Exception as e:
                             # log error
                             pass
-                        return response_json.get("token", "")
-        return ''
+                        return response_json.get("token", ""), token_expiry
+        return '', None
+
+
+@worker_process_shutdown.connect
+def flush_access_counts_on_shutdown(**kwargs):
+    # pool processes leave through os._exit, past the atexit hooks
+    CacheAPIManager.flush_access_counts()
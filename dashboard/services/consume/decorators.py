@@ -13,14 +13,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from functools import wraps
+
 # django
 from django.conf import settings
+from django.db import connection
 from django.utils import timezone
 
 # dashboard
 from dashboard.constants import TRANSPLATFORM_ENGINES, API_TOKEN_PREFIX, GIT_PLATFORMS
 from dashboard.models import CacheAPI
-from dashboard.services.consume.cache import CacheAPIManager
 
 
 def cache_api_response():
@@ -59,8 +61,7 @@ def set_api_auth():
                 kwargs['headers'] = {}
             if rest_client.service == TRANSPLATFORM_ENGINES[4]:
                 # Memsource needs token in Authorization header.
-                cache_api_manager = CacheAPIManager()
-                latest_token = cache_api_manager.tally_auth_token(url)
+                latest_token = rest_client.cache_manager.tally_auth_token(url)
                 memsource_auth_user = API_TOKEN_PREFIX.get(rest_client.service) or kwargs['auth_user']
                 kwargs['headers']['Authorization'] = f"{memsource_auth_user} {latest_token}"
             if kwargs.get('auth_user') and kwargs.get('auth_token'):
@@ -86,3 +87,18 @@ def set_api_auth():
             return caller(rest_client, url, resource, *args, **kwargs)
         return inner_decorator
     return service_decorator
+
+
+def release_db_connection(func):
+    """
+    decorator for calls run in worker threads
+        django keeps one db connection per thread, close it once done
+    :return: func result
+    """
+    @wraps(func)
+    def inner_decorator(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connection.close()
+    return inner_decorator
@@ -0,0 +1,201 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+# django
+from django.conf import settings
+
+from dashboard.services.consume.sessions import SessionRegistry
+
+
+__all__ = ['RateLimiter', 'RateLimiterRegistry', 'rate_limiters']
+
+
+class RateLimiter(object):
+    """
+    Token bucket of a platform host
+        - callers wait for a token instead of failing
+        - rate adapts to X-RateLimit-* and Retry-After response headers,
+          and is back to base_rate once the advertised window resets
+        - a 429 without those headers blocks the host for a jittered,
+          exponential backoff of its consecutive 429s
+    """
+
+    # Retry-After / reset waits longer than this are not honoured in-process
+    MAX_WAIT_SEC = 300
+    LIMITED_BACKOFF_SEC = 1.0
+    LIMITED_BACKOFF_MAX_SEC = 60
+
+    def __init__(self, rate, burst):
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.blocked_until = 0.0
+        self.rate_reset_at = 0.0
+        self.limited = 0
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        if self.rate_reset_at and now >= self.rate_reset_at:
+            # window of the lowered rate is over
+            self.rate = self.base_rate
+            self.rate_reset_at = 0.0
+
+    def _limited_backoff(self):
+        """Full jitter: random wait up to base * 2 ** (429s in a row - 1), capped"""
+        return random.uniform(0, min(
+            self.LIMITED_BACKOFF_MAX_SEC, self.LIMITED_BACKOFF_SEC * 2 ** (self.limited - 1)
+        ))
+
+    def acquire(self):
+        """
+        Block till a request may be sent
+        :return: seconds waited
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait_sec = max(self.blocked_until - now, 0.0)
+                if not wait_sec:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    wait_sec = (1 - self.tokens) / self.rate
+            wait_sec = min(wait_sec, self.MAX_WAIT_SEC)
+            time.sleep(wait_sec)
+            waited += wait_sec
+
+    @staticmethod
+    def _seconds_until(header_value, now_epoch):
+        """Retry-After or X-RateLimit-Reset as seconds from now"""
+        try:
+            value = float(header_value)
+        except (TypeError, ValueError):
+            try:
+                # Retry-After can be an HTTP date
+                return parsedate_to_datetime(header_value).timestamp() - now_epoch
+            except (TypeError, ValueError, IndexError):
+                return None
+        # GitHub sends epoch seconds, Weblate seconds till reset
+        return value - now_epoch if value > 1e9 else value
+
+    def update(self, status_code, headers):
+        """
+        Adapt to the rate limit state advertised by the platform
+        :param status_code: int
+        :param headers: response headers
+        """
+        headers = headers or {}
+        now_epoch = time.time()
+        retry_after = self._seconds_until(headers.get('Retry-After'), now_epoch)
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_in = self._seconds_until(headers.get('X-RateLimit-Reset'), now_epoch)
+        with self._lock:
+            now = time.monotonic()
+            self.limited = self.limited + 1 if status_code == 429 else 0
+            if retry_after and status_code in (429, 503):
+                self.blocked_until = now + min(retry_after, self.MAX_WAIT_SEC)
+                self.tokens = 0.0
+            elif remaining is not None and reset_in and reset_in > 0:
+                self._pace(now, remaining, reset_in)
+            if status_code == 429 and self.blocked_until <= now:
+                # throttled, but not told for how long
+                self.blocked_until = now + self._limited_backoff()
+                self.tokens = 0.0
+
+    def _pace(self, now, remaining, reset_in):
+        try:
+            remaining = int(remaining)
+        except ValueError:
+            return
+        if remaining <= 0:
+            self.blocked_until = now + min(reset_in, self.MAX_WAIT_SEC)
+            self.tokens = 0.0
+        else:
+            # spread what is left of the window evenly till its reset
+            self.rate = max(min(remaining / reset_in, self.base_rate), 0.01)
+            self.rate_reset_at = now + reset_in
+            self.tokens = min(self.tokens, float(remaining))
+
+
+class RateLimiterRegistry(object):
+    """
+    Rate limiter per platform host
+        - settings.HTTP_RATE_LIMITS overrides class defaults,
+          'HOSTS' maps scheme://host to (requests per second, burst)
+    """
+
+    RATE = 10
+    BURST = 20
+    RETRIES_ON_LIMIT = 3
+    HOSTS = {}
+
+    def __init__(self):
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _config(self, key):
+        limits_config = getattr(settings, 'HTTP_RATE_LIMITS', None) or {}
+        return limits_config.get(key, getattr(self, key))
+
+    def get(self, url):
+        """
+        Get rate limiter for the host of url
+        :param url: str
+        :return: RateLimiter
+        """
+        self._reset_after_fork()
+        key = SessionRegistry.host_key(url)
+        limiter = self._limiters.get(key)
+        if limiter:
+            return limiter
+        with self._lock:
+            if key not in self._limiters:
+                rate, burst = (self._config('HOSTS') or {}).get(
+                    key, (self._config('RATE'), self._config('BURST'))
+                )
+                self._limiters[key] = RateLimiter(rate, burst)
+            return self._limiters[key]
+
+    def _reset_after_fork(self):
+        # a forked worker must not inherit locks held in the parent
+        if self._pid != os.getpid():
+            self._limiters = {}
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+
+    @property
+    def retries_on_limit(self):
+        return self._config('RETRIES_ON_LIMIT')
+
+    def stats(self):
+        return {host: {'rate': round(limiter.rate, 3), 'tokens': round(limiter.tokens, 3),
+                       'blocked_for': round(max(limiter.blocked_until - time.monotonic(), 0), 3)}
+                for host, limiter in self._limiters.items()}
+
+
+rate_limiters = RateLimiterRegistry()
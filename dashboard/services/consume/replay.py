@@ -0,0 +1,159 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import json
+import base64
+import hashlib
+from urllib.parse import urlparse
+from uuid import uuid4
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# django
+from django.conf import settings
+
+
+__all__ = ['ResponseRecorder', 'response_recorder']
+
+RECORD_REPLAY_MODES = ('record', 'replay')
+
+# headers which do not describe the recorded (already decoded) body
+SKIPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie')
+
+
+class ResponseRecorder(object):
+    """
+    Record platform responses to fixtures, and replay them offline
+        - mode and fixtures_dir arguments override settings.HTTP_RECORD_REPLAY,
+          which overrides class defaults
+        - MODE is 'record', 'replay' or empty for live requests
+        - fixtures are json files per host, keyed by method, path and query
+        - request headers are never recorded, recordings carry no credentials
+    """
+
+    MODE = ''
+    FIXTURES_DIR = 'dashboard/tests/testdata/platforms/'
+
+    def __init__(self, fixtures_dir=None, mode=None):
+        self._overrides = {key: value for key, value in
+                           (('FIXTURES_DIR', fixtures_dir), ('MODE', mode)) if value is not None}
+
+    def _config(self, key):
+        if key in self._overrides:
+            return self._overrides[key]
+        replay_config = getattr(settings, 'HTTP_RECORD_REPLAY', None) or {}
+        return replay_config.get(key, getattr(self, key))
+
+    @property
+    def mode(self):
+        return self._config('MODE')
+
+    @property
+    def fixtures_dir(self):
+        return self._config('FIXTURES_DIR')
+
+    @staticmethod
+    def request_key(http_method, url):
+        """
+        Host independent key of a request
+        :param http_method: str
+        :param url: full url, or path with query
+        :return: str
+        """
+        parsed_url = urlparse(url)
+        path_query = parsed_url.path + ('?' + parsed_url.query if parsed_url.query else '')
+        return hashlib.sha1(f"{http_method.upper()} {path_query}".encode('utf-8')).hexdigest()
+
+    def fixture_path(self, http_method, url):
+        host_dir = urlparse(url).netloc.replace(':', '_') or 'localhost'
+        return os.path.join(self.fixtures_dir, host_dir, self.request_key(http_method, url) + '.json')
+
+    def record(self, http_method, url, response):
+        """Save a response as fixture of the request"""
+        body = response.content or b''
+        fixture = {
+            'method': http_method.upper(),
+            'url': url,
+            'status_code': response.status_code,
+            'headers': {key: value for key, value in response.headers.items()
+                        if key.lower() not in SKIPPED_HEADERS},
+        }
+        try:
+            fixture['body'] = body.decode('utf-8')
+        except UnicodeDecodeError:
+            fixture['body_b64'] = base64.b64encode(body).decode('ascii')
+        fixture_path = self.fixture_path(http_method, url)
+        os.makedirs(os.path.dirname(fixture_path), exist_ok=True)
+        tmp_path = '%s.%s' % (fixture_path, uuid4().hex)
+        with open(tmp_path, 'w') as f:
+            json.dump(fixture, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, fixture_path)
+
+    @staticmethod
+    def load(fixture_path):
+        try:
+            with open(fixture_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def fixture_body(fixture):
+        if 'body_b64' in fixture:
+            return base64.b64decode(fixture['body_b64'])
+        return (fixture.get('body') or '').encode('utf-8')
+
+    def find(self, http_method, url):
+        """
+        Fixture of the request, recorded for its host or else for any host
+        :return: dict or None
+        """
+        fixture = self.load(self.fixture_path(http_method, url))
+        if fixture:
+            return fixture
+        file_name = self.request_key(http_method, url) + '.json'
+        try:
+            host_dirs = sorted(os.listdir(self.fixtures_dir))
+        except OSError:
+            return None
+        for host_dir in host_dirs:
+            fixture = self.load(os.path.join(self.fixtures_dir, host_dir, file_name))
+            if fixture:
+                return fixture
+        return None
+
+    def replay(self, http_method, url):
+        """
+        Recorded response of the request, 404 when none is recorded
+        :return: requests.Response
+        """
+        fixture = self.find(http_method, url) or {
+            'status_code': 404, 'headers': {'Content-Type': 'application/json'},
+            'body': json.dumps({'detail': 'No fixture recorded for %s %s' % (http_method, url)}),
+        }
+        response = requests.Response()
+        response.status_code = fixture['status_code']
+        response.headers = CaseInsensitiveDict(fixture.get('headers') or {})
+        response._content = self.fixture_body(fixture)
+        response._content_consumed = True
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = url
+        response.request = requests.Request(http_method, url).prepare()
+        return response
+
+
+response_recorder = ResponseRecorder()
@@ -14,7 +14,12 @@
 # under the License.
 # ToDo: Refactor the code to adhere Plugin Design Pattern to extend support.
 
+import re
+import threading
+from functools import partial
+from collections import namedtuple
 from requests.auth import HTTPBasicAuth
+from requests.structures import CaseInsensitiveDict
 import requests
 
 # DamnedLies specific imports
@@ -52,99 +57,135 @@ from .config.zanata import resource_config_dict as zanata_config
 from dashboard.constants import GIT_PLATFORMS, TRANSPLATFORM_ENGINES
 from dashboard.services.consume.cache import CacheAPIManager
 from dashboard.services.consume.decorators import set_api_auth
+from dashboard.services.consume.ratelimit import rate_limiters
+from dashboard.services.consume.replay import RECORD_REPLAY_MODES, response_recorder
+from dashboard.services.consume.retry import retry_policy
+from dashboard.services.consume.sessions import session_registry
 
 
 NO_CERT_VALIDATION = True
 
 
-__all__ = ['ServiceConfig', 'RestHandle', 'RestClient']
+__all__ = ['ServiceConfig', 'RestHandle', 'RestClient', 'SingleFlight']
+
+
+# service: (resource config dict, service-to-resource mappings, middle url, uses HTTPBasicAuth)
+SERVICE_PLATFORMS = {
+    GIT_PLATFORMS[0]: (github_config, github_resources, '', True),
+    GIT_PLATFORMS[1]: (gitlab_config, gitlab_resources, '/api/v4', True),
+    GIT_PLATFORMS[2]: (pagure_config, pagure_resources, '/api/0', True),
+    TRANSPLATFORM_ENGINES[0]: (damnedlies_config, damnedlies_resources, '', False),
+    TRANSPLATFORM_ENGINES[1]: (transifex_config, transifex_resources, '/api/2', True),
+    TRANSPLATFORM_ENGINES[2]: (zanata_config, zanata_resources, '/rest', False),
+    TRANSPLATFORM_ENGINES[3]: (weblate_config, weblate_resources, '/api', False),
+    TRANSPLATFORM_ENGINES[4]: (memsource_config, memsource_resources, '/api2/v1', False),
+}
+
+# precompiled, immutable configuration of a service resource
+ResourceConfig = namedtuple(
+    'ResourceConfig', 'resource_group mount_points mount_point http_method resource '
+                      'path_params query_params query_string request_media_type '
+                      'response_media_type basic_auth'
+)
+
+
+def _compile_service_registry():
+    """(service, resource): ResourceConfig for every configured resource"""
+    registry = {}
+    for service, (config_dict, resources, middle_url, basic_auth) in SERVICE_PLATFORMS.items():
+        for resource_name, service_resource in resources.items():
+            try:
+                resource_group = config_dict[service_resource.rest_resource]
+                method_config = resource_group[service_resource.mount_point][service_resource.http_method]
+            except KeyError:
+                # incomplete config, ServiceConfig raises for it on use
+                continue
+            query_params = method_config.get('query_params')
+            registry[(service, resource_name)] = ResourceConfig(
+                resource_group=service_resource.rest_resource,
+                mount_points=tuple(resource_group.keys()),
+                mount_point=service_resource.mount_point,
+                http_method=service_resource.http_method,
+                resource=middle_url + service_resource.mount_point,
+                path_params=tuple(method_config.get('path_params') or ()),
+                query_params=tuple(query_params) if query_params else None,
+                query_string="&".join(query_params) if query_params else None,
+                request_media_type=method_config.get('request_media_type'),
+                response_media_type=method_config.get('response_media_type'),
+                basic_auth=basic_auth,
+            )
+    return registry
+
+
+class CircuitOpenError(Exception):
+    """Requests to the host are skipped till its circuit closes"""
+    pass
 
 
 class ServiceConfig(object):
     """REST communication service configuration"""
 
-    def _set_initials(self, service, resource, auth=None):
-        """Sets initial params"""
-        master_config_dict = {
-            GIT_PLATFORMS[0]: {
-                '_config_dict': github_config,
-                '_middle_url': '',
-                '_service': github_resources.get(resource),
-                'http_auth': HTTPBasicAuth(*auth) if auth else None
-            },
-            GIT_PLATFORMS[1]: {
-                '_config_dict': gitlab_config,
-                '_middle_url': '/api/v4',
-                '_service': gitlab_resources.get(resource),
-                'http_auth': HTTPBasicAuth(*auth) if auth else None
-            },
-            GIT_PLATFORMS[2]: {
-                '_config_dict': pagure_config,
-                '_middle_url': '/api/0',
-                '_service': pagure_resources.get(resource),
-                'http_auth': HTTPBasicAuth(*auth) if auth else None
-            },
-            TRANSPLATFORM_ENGINES[0]: {
-                '_config_dict': damnedlies_config,
-                '_middle_url': '',
-                '_service': damnedlies_resources.get(resource),
-                'http_auth': None
-            },
-            TRANSPLATFORM_ENGINES[1]: {
-                '_config_dict': transifex_config,
-                '_middle_url': "/api/2",
-                '_service': transifex_resources.get(resource),
-                'http_auth': HTTPBasicAuth(*auth) if auth else None
-            },
-            TRANSPLATFORM_ENGINES[2]: {
-                '_config_dict': zanata_config,
-                '_middle_url': '/rest',
-                '_service': zanata_resources.get(resource),
-                'http_auth': None
-            },
-            TRANSPLATFORM_ENGINES[3]: {
-                '_config_dict': weblate_config,
-                '_middle_url': '/api',
-                '_service': weblate_resources.get(resource),
-                'http_auth': None
-            },
-            TRANSPLATFORM_ENGINES[4]: {
-                '_config_dict': memsource_config,
-                '_middle_url': '/api2/v1',
-                '_service': memsource_resources.get(resource),
-                'http_auth': None
-            },
-        }
-        required_config = master_config_dict.get(service).copy()
-        for attrib, value in required_config.items():
-            setattr(self, str(attrib), value)
+    __slots__ = ('_config', 'http_auth')
+
+    registry = _compile_service_registry()
 
     def __init__(self, service, resource, auth=None):
         """entry point"""
-        self._set_initials(service, resource, auth)
-        for attrib, value in (self._config_dict[self._service.rest_resource]
-                              [self._service.mount_point][self._service.http_method].items()):
-            setattr(self, str(attrib), value)
+        self._config = self.registry[(service, resource)]
+        self.http_auth = HTTPBasicAuth(*auth) if auth and self._config.basic_auth else None
+
+    def __getattr__(self, item):
+        # path_params, query_params, media types etc.
+        if item.startswith('_'):
+            raise AttributeError(item)
+        return getattr(self._config, item)
+
+    @classmethod
+    def response_media_type_of(cls, service, resource):
+        """
+        Response media type of a GET resource, by its formatted path
+        :param service: str
+        :param resource: formatted resource, query string included
+        :return: str or None
+        """
+        path = resource.split('?')[0]
+        # most specific path first
+        resource_configs = sorted(
+            [resource_config for (config_service, _), resource_config in cls.registry.items()
+             if config_service == service and resource_config.http_method == 'GET'],
+            key=lambda resource_config: len(resource_config.resource), reverse=True
+        )
+        for resource_config in resource_configs:
+            path_pattern = re.sub(r'\\{\w+\\}', '[^?]+?', re.escape(resource_config.resource))
+            if re.fullmatch(path_pattern, path):
+                return resource_config.response_media_type
+        return None
+
+    def format_resource(self, *args):
+        """Resource path with path params filled in"""
+        if not args:
+            return self._config.resource
+        return self._config.resource.format(**dict(zip(self._config.path_params, args)))
 
     @property
     def resource_group(self):
-        return self._service.rest_resource
+        return self._config.resource_group
 
     @property
     def mount_points(self):
-        return list(self._config_dict[self._service.rest_resource].keys())
+        return list(self._config.mount_points)
 
     @property
     def resource(self):
-        return self._middle_url + self._service.mount_point
+        return self._config.resource
 
     @property
     def mount_point(self):
-        return self._service.mount_point
+        return self._config.mount_point
 
     @property
     def http_method(self):
-        return self._service.http_method
+        return self._config.http_method
 
     @property
     def auth(self):
@@ -177,15 +218,69 @@ class RestHandle(object):
         return f"{self.base_url}{self.uri}{getattr(self, 'ext')}" \
             if hasattr(self, 'ext') else f"{self.base_url}{self.uri}"
 
+    @staticmethod
+    def _send_request(uri, http_method, **kwargs):
+        # send request over the pooled session of the host,
+        # paced by its rate limiter, wait and resend when throttled
+        if response_recorder.mode == RECORD_REPLAY_MODES[1]:
+            # offline, answer from recorded fixtures
+            return response_recorder.replay(http_method, uri)
+        session = session_registry.get(uri)
+        rate_limiter = rate_limiters.get(uri)
+        for attempt in range(rate_limiters.retries_on_limit + 1):
+            rate_limiter.acquire()
+            rest_response = session.request(http_method, uri, **kwargs)
+            rate_limiter.update(rest_response.status_code, rest_response.headers)
+            if rest_response.status_code != 429 or attempt == rate_limiters.retries_on_limit:
+                break
+            # a streamed response holds its pooled connection until closed
+            rest_response.close()
+        if response_recorder.mode == RECORD_REPLAY_MODES[0]:
+            response_recorder.record(http_method, uri, rest_response)
+        return rest_response
+
+    def _send_with_retries(self, uri, http_method, **kwargs):
+        # retry idempotent requests on network errors and 5xx,
+        # skip hosts whose circuit is open
+        circuit_breaker = retry_policy.breaker(uri)
+        max_retries = retry_policy.max_retries(http_method)
+        attempt = 0
+        while True:
+            if not circuit_breaker.allow_request():
+                retry_policy.record_skip(uri)
+                raise CircuitOpenError(circuit_breaker.host)
+            try:
+                rest_response = self._send_request(uri, http_method, **kwargs)
+            except (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError):
+                circuit_breaker.record_failure()
+                if attempt >= max_retries:
+                    raise
+            except Exception:
+                # not retried, but a half-open probe must not stay in flight
+                circuit_breaker.record_failure()
+                raise
+            else:
+                if not retry_policy.is_retryable_status(rest_response.status_code):
+                    circuit_breaker.record_success()
+                    return rest_response
+                circuit_breaker.record_failure()
+                if attempt >= max_retries:
+                    return rest_response
+                rest_response.close()
+            retry_policy.wait(uri, attempt)
+            attempt += 1
+
     def _call_request(self, uri, http_method, **kwargs):
         # TS gateway to services
         try:
             # filter kwargs
             kwargs.pop('body')
             kwargs.pop('connection_type')
-            # send request
-            rest_response = requests.request(http_method, uri, **kwargs)
-            return rest_response
+            return self._send_with_retries(uri, http_method, **kwargs)
+        except CircuitOpenError:
+            # platform host is failing, do not wait on it
+            return False
         except requests.ConnectionError:
             # event of a network problem (e.g. DNS failure, refused connection, etc)
             return False
@@ -211,7 +306,7 @@ class RestHandle(object):
             return False
 
     def get_response_dict(self):
-        request_args = ('body', 'data', 'files', 'headers', 'connection_type', 'auth')
+        request_args = ('body', 'data', 'files', 'headers', 'connection_type', 'auth', 'timeout', 'stream')
         args_dict = dict(zip(
             request_args, [getattr(self, arg, None) for arg in request_args]
         ))
@@ -220,34 +315,116 @@ class RestHandle(object):
             args_dict.update(dict(verify=False))
 
         response = self._call_request(self._get_url(), self.method, **args_dict)
-        response_dict = {}
         if response is False:
-            return response_dict
-        if response.ok:
-            try:
-                response_dict.update(dict(json_content=response.json()))
-            except ValueError:
-                response_dict.update(dict(json_content={}))
-        else:
-            try:
-                response_dict.update(dict(err_content=response.json()))
-            except ValueError:
-                response_dict.update(dict(err_content={}))
+            return {}
+        response_dict = LazyResponseDict()
         response_dict.update(dict(status_code=response.status_code))
         response_dict.update(dict(headers=response.headers))
         response_dict.update(dict(time_delta=response.elapsed))
-        response_dict.update(dict(content=response.content))
-        response_dict.update(dict(text=response.text))
         response_dict.update(dict(url=response.url))
         response_dict.update(dict(raw=response))
+        if response.ok and getattr(self, 'stream', False):
+            # body is left unread for the caller to stream
+            return response_dict
+        response_dict.update(dict(content=response.content))
+        response_dict.set_lazy('json_content' if response.ok else 'err_content',
+                               partial(self._json_or_empty, response))
+        response_dict.set_lazy('text', lambda: response.text)
         return response_dict
 
+    @staticmethod
+    def _json_or_empty(response):
+        try:
+            return response.json()
+        except ValueError:
+            return {}
+
+
+class LazyResponseDict(dict):
+    """
+    Response dict whose decoded views are built on first access
+        - json_content, err_content and text are only decoded when read
+        - behaves like a plain dict for call_service handlers
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(LazyResponseDict, self).__init__(*args, **kwargs)
+        self._loaders = {}
+
+    def set_lazy(self, key, loader):
+        self._loaders[key] = loader
+
+    def __missing__(self, key):
+        loader = self._loaders.get(key)
+        if loader is None:
+            raise KeyError(key)
+        # single-flight waiters share the dict, a concurrent reader may decode too
+        value = loader()
+        self[key] = value
+        self._loaders.pop(key, None)
+        return value
+
+    def __contains__(self, key):
+        return super(LazyResponseDict, self).__contains__(key) or key in self._loaders
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class SingleFlight(object):
+    """
+    Coalesce concurrent identical calls
+        - first caller of a key runs the call, others wait for its result
+    """
+
+    class _Call(object):
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """
+        Run func once for all concurrent callers of key
+        :param key: hashable
+        :param func: callable
+        :return: func result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+        if not leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
 
 class RestClient(object):
     """REST Client for all Managers"""
 
     SAVE_RESPONSE = True
     cache_manager = CacheAPIManager()
+    single_flight = SingleFlight()
 
     def __init__(self, service):
 
@@ -267,44 +444,95 @@ class RestClient(object):
         :param kwargs: dict
         :return: dict
         """
-        headers = kwargs['headers'] if 'headers' in kwargs else {}
-        body = kwargs['body'] if 'body' in kwargs else None
-        data = kwargs['data'] if 'data' in kwargs else None
-        files = kwargs['files'] if 'files' in kwargs else None
+        # copy, callers may reuse kwargs for the next page
+        headers = dict(kwargs.pop('headers', None) or {})
         extension = kwargs.get('ext')
         # set headers
         auth_tuple = kwargs.get('auth_tuple')
         service_details = ServiceConfig(self.service, resource, auth=auth_tuple)
-        if hasattr(service_details, 'response_media_type') and service_details.response_media_type:
+        if service_details.response_media_type:
             headers['Accept'] = service_details.response_media_type
-        if hasattr(service_details, 'request_media_type') and service_details.request_media_type:
+        if service_details.request_media_type:
             headers['Content-Type'] = service_details.request_media_type
         # format resource
-        resource = (
-            service_details.resource.format(**dict(zip(service_details.path_params or [], args)))
-            if args else service_details.resource
-        )
+        resource = service_details.format_resource(*args)
         # handle extensions
         if isinstance(extension, bool):   # extension should be boolean
-            ext = "&".join(service_details.query_params)
-            resource = resource + "?" + ext
+            resource = resource + "?" + service_details.query_string
         elif isinstance(extension, str):
             resource = resource + "?" + extension
-        # Lets check with cache, if it's a GET request
         if service_details.http_method == 'GET' and not kwargs.get('no_cache_api'):
-            c_content, c_json_content = self.cache_manager.get_cached_response(base_url, resource)
-            if c_content:
-                return {'content': c_content, 'json_content': c_json_content}
-        # initiate service call
+            # concurrent identical GETs share one upstream call and one cache write
+            flight_key = (base_url, resource, tuple(sorted(headers.items())), auth_tuple)
+            return self.single_flight.do(flight_key, partial(
+                self._cached_request, base_url, resource, service_details.auth, headers, *args, **kwargs
+            ))
+        return self._request(base_url, resource, service_details.http_method, headers,
+                             auth=service_details.auth, **kwargs)
+
+    def _request(self, base_url, resource, http_method, headers, auth=None, **kwargs):
+        """Initiate service call"""
         rest_handle = RestHandle(
-            base_url, resource, service_details.http_method, auth=service_details.auth,
-            body=body, data=data, files=files, headers=headers, connection_type=None, cache=None,
+            base_url, resource, http_method, auth=auth,
+            body=kwargs.get('body'), data=kwargs.get('data'), files=kwargs.get('files'),
+            headers=headers, connection_type=None, cache=None,
+            timeout=session_registry.timeout(self.service), stream=kwargs.get('stream'),
             disable_ssl_certificate_validation=self.disable_ssl_certificate_validation
         )
-        api_response_dict = rest_handle.get_response_dict()
+        return rest_handle.get_response_dict()
+
+    def _cached_request(self, base_url, resource, auth, headers, *args, **kwargs):
+        """Serve GET from cache, else call the service and cache its response"""
+        c_content, c_json_content, c_link = self.cache_manager.get_cached_response(base_url, resource)
+        if c_content:
+            cached_response = {'content': c_content, 'json_content': c_json_content}
+            if c_link:
+                # paginated listings page on from the first page's Link header
+                cached_response['headers'] = CaseInsensitiveDict({'Link': c_link})
+            return cached_response
+        return self._revalidate(base_url, resource, auth, headers, *args, **kwargs)
+
+    def refresh_cached_response(self, base_url, resource, headers=None, auth_tuple=None):
+        """
+        Refresh a cached GET response ahead of its expiry
+        :param base_url: str
+        :param resource: formatted resource, as cached
+        :param headers: dict, auth headers of the platform
+        :param auth_tuple: tuple, for platforms with basic auth
+        :return: dict
+        """
+        headers = dict(headers or {})
+        response_media_type = ServiceConfig.response_media_type_of(self.service, resource)
+        if response_media_type:
+            headers['Accept'] = response_media_type
+        auth = HTTPBasicAuth(*auth_tuple) if auth_tuple and SERVICE_PLATFORMS[self.service][3] else None
+        return self._revalidate(base_url, resource, auth, headers)
+
+    def _revalidate(self, base_url, resource, auth, headers, *args, **kwargs):
+        """Conditional GET of a cached resource, save what comes back"""
+        stale_response = self.cache_manager.get_stale_response(base_url, resource)
+        if stale_response.get('etag'):
+            headers['If-None-Match'] = stale_response['etag']
+        if stale_response.get('last_modified'):
+            headers['If-Modified-Since'] = stale_response['last_modified']
+        api_response_dict = self._request(base_url, resource, 'GET', headers, auth=auth, **kwargs)
+        if stale_response and api_response_dict.get('status_code') == 304:
+            # not modified, cached response is still good
+            self.cache_manager.refresh_expiry(
+                base_url, resource, stale_response['content'], stale_response['json_content'],
+                stale_response.get('link')
+            )
+            api_response_dict.update(dict(
+                content=stale_response['content'], json_content=stale_response['json_content']
+            ))
+            if stale_response.get('link') and not (api_response_dict.get('headers') or {}).get('Link'):
+                api_response_dict['headers'] = CaseInsensitiveDict(api_response_dict.get('headers') or {})
+                api_response_dict['headers']['Link'] = stale_response['link']
+            return api_response_dict
         if api_response_dict.get('json_content') and self.SAVE_RESPONSE:
             self.cache_manager.save_api_response(
                 base_url, resource, api_response_dict['content'],
-                api_response_dict['json_content'], *args, **kwargs
+                api_response_dict['json_content'], *args, service=self.service,
+                resp_headers=api_response_dict.get('headers'), **kwargs
             )
         return api_response_dict
@@ -0,0 +1,156 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import time
+import random
+import logging
+import threading
+from collections import Counter
+
+# django
+from django.conf import settings
+
+from dashboard.services.consume.sessions import SessionRegistry
+
+
+__all__ = ['CircuitBreaker', 'RetryPolicy', 'retry_policy']
+
+logger = logging.getLogger(__name__)
+
+BREAKER_STATES = ('closed', 'open', 'half-open')
+
+
+class CircuitBreaker(object):
+    """
+    Circuit breaker of a platform host
+        - opens after failure_threshold consecutive failures
+        - after reset_timeout_sec lets one probe request through (half-open)
+        - closes again on the first success
+    """
+
+    def __init__(self, host, failure_threshold, reset_timeout_sec):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_sec = reset_timeout_sec
+        self.state = BREAKER_STATES[0]
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """Whether a request to the host may be sent now"""
+        with self._lock:
+            if self.state == BREAKER_STATES[0]:
+                return True
+            if self.state == BREAKER_STATES[1] and \
+                    time.monotonic() - self.opened_at >= self.reset_timeout_sec:
+                self.state = BREAKER_STATES[2]
+            if self.state == BREAKER_STATES[2] and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != BREAKER_STATES[0]:
+                logger.info("Circuit closed for %s" % self.host)
+            self.state = BREAKER_STATES[0]
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == BREAKER_STATES[2] or \
+                    (self.state == BREAKER_STATES[0] and self.failures >= self.failure_threshold):
+                if self.state == BREAKER_STATES[0]:
+                    logger.warning("Circuit opened for %s after %s failures" % (self.host, self.failures))
+                self.state = BREAKER_STATES[1]
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        return {'state': self.state, 'failures': self.failures}
+
+
+class RetryPolicy(object):
+    """
+    Retry with jittered exponential backoff, and circuit breakers per host
+        - settings.HTTP_RETRY overrides class defaults
+    """
+
+    MAX_RETRIES = 3
+    BACKOFF_SEC = 0.5
+    BACKOFF_MAX_SEC = 30
+    RETRY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+    RETRY_STATUSES = (500, 502, 503, 504)
+    FAILURE_THRESHOLD = 5
+    RESET_TIMEOUT_SEC = 120
+
+    def __init__(self):
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self.retries = Counter()
+        self.skipped = Counter()
+
+    def _config(self, key):
+        retry_config = getattr(settings, 'HTTP_RETRY', None) or {}
+        return retry_config.get(key, getattr(self, key))
+
+    def breaker(self, url):
+        """
+        Get circuit breaker for the host of url
+        :param url: str
+        :return: CircuitBreaker
+        """
+        key = SessionRegistry.host_key(url)
+        circuit_breaker = self._breakers.get(key)
+        if circuit_breaker:
+            return circuit_breaker
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(
+                    key, self._config('FAILURE_THRESHOLD'), self._config('RESET_TIMEOUT_SEC')
+                )
+            return self._breakers[key]
+
+    def max_retries(self, http_method):
+        """Only idempotent requests are retried"""
+        return self._config('MAX_RETRIES') if http_method.upper() in self._config('RETRY_METHODS') else 0
+
+    def is_retryable_status(self, status_code):
+        return status_code in self._config('RETRY_STATUSES')
+
+    def backoff(self, attempt):
+        """Full jitter: random wait up to base * 2 ** attempt, capped"""
+        return random.uniform(0, min(
+            self._config('BACKOFF_MAX_SEC'), self._config('BACKOFF_SEC') * 2 ** attempt
+        ))
+
+    def wait(self, url, attempt):
+        self.retries[SessionRegistry.host_key(url)] += 1
+        time.sleep(self.backoff(attempt))
+
+    def record_skip(self, url):
+        self.skipped[SessionRegistry.host_key(url)] += 1
+
+    def stats(self):
+        return {host: dict(circuit_breaker.stats(), retries=self.retries[host],
+                           skipped=self.skipped[host])
+                for host, circuit_breaker in self._breakers.items()}
+
+
+retry_policy = RetryPolicy()
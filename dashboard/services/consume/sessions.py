@@ -0,0 +1,117 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# django
+from django.conf import settings
+
+
+__all__ = ['SessionRegistry', 'session_registry']
+
+
+class SessionRegistry(object):
+    """
+    Pooled requests sessions, one per platform scheme+host
+        - sessions are shared by callers with different credentials,
+          so they neither keep nor send cookies
+        - settings.HTTP_SESSION_POOL overrides class defaults
+    """
+
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 20
+    KEEP_ALIVE = True
+    TIMEOUT = (10, 120)
+    SERVICE_TIMEOUTS = {}
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _config(self, key):
+        pool_config = getattr(settings, 'HTTP_SESSION_POOL', None) or {}
+        return pool_config.get(key, getattr(self, key))
+
+    @staticmethod
+    def host_key(url):
+        """scheme://host[:port] of the url"""
+        parsed_url = urlparse(url)
+        return f"{parsed_url.scheme}://{parsed_url.netloc}".lower()
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self._config('POOL_CONNECTIONS'),
+            pool_maxsize=self._config('POOL_MAXSIZE')
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        if not self._config('KEEP_ALIVE'):
+            session.headers['Connection'] = 'close'
+        return session
+
+    def _reset_after_fork(self):
+        # celery prefork workers must not share sockets with the parent
+        if self._pid != os.getpid():
+            self._sessions = {}
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+
+    def get(self, url):
+        """
+        Get pooled session for the host of url
+        :param url: str
+        :return: requests.Session
+        """
+        self._reset_after_fork()
+        key = self.host_key(url)
+        session = self._sessions.get(key)
+        if session:
+            return session
+        with self._lock:
+            if key not in self._sessions:
+                self._sessions[key] = self._create_session()
+            return self._sessions[key]
+
+    def timeout(self, service=None):
+        """
+        (connect, read) timeout for a service
+        :param service: str
+        :return: tuple
+        """
+        service_timeouts = self._config('SERVICE_TIMEOUTS') or {}
+        return tuple(service_timeouts.get(service) or self._config('TIMEOUT'))
+
+    def close_all(self):
+        """Close every pooled session"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+    @property
+    def hosts(self):
+        return list(self._sessions.keys())
+
+
+session_registry = SessionRegistry()
@@ -0,0 +1,112 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import logging
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+# django
+from django.conf import settings
+from django.utils import timezone
+
+from dashboard.models import CacheAPI, Platform
+from dashboard.services.consume.decorators import set_api_auth, release_db_connection
+from dashboard.services.consume.restclient import RestClient, SERVICE_PLATFORMS
+
+
+__all__ = ['CacheWarmer']
+
+logger = logging.getLogger(__name__)
+
+
+@set_api_auth()
+def _auth_kwargs(rest_client, url, resource, *args, **kwargs):
+    # same headers and auth_tuple a regular call of the platform gets
+    return kwargs
+
+
+class CacheWarmer(object):
+    """
+    Refresh hot cached API responses shortly before they expire
+        - hot: looked up at least MIN_HITS times in its current window of HOT_WINDOW_HOURS
+        - at most MAX_KEYS per run, CONCURRENCY at a time
+        - settings.CACHE_WARMUP overrides class defaults
+    """
+
+    AHEAD_MIN = 10
+    MIN_HITS = 3
+    HOT_WINDOW_HOURS = 24
+    MAX_KEYS = 200
+    CONCURRENCY = 4
+
+    def _config(self, key):
+        warmup_config = getattr(settings, 'CACHE_WARMUP', None) or {}
+        return warmup_config.get(key, getattr(self, key))
+
+    def hot_entries(self):
+        """Hot cached responses expiring within AHEAD_MIN, most looked up first"""
+        now = timezone.now()
+        return list(CacheAPI.objects.only('base_url', 'resource', 'service').filter(
+            service__in=list(SERVICE_PLATFORMS.keys()),
+            hits__gte=self._config('MIN_HITS'),
+            hits_since__gte=now - timedelta(hours=self._config('HOT_WINDOW_HOURS')),
+            expiry__lte=now + timedelta(minutes=self._config('AHEAD_MIN')),
+        ).order_by('-hits')[:self._config('MAX_KEYS')])
+
+    @staticmethod
+    def _platform_auth(base_url):
+        platform = Platform.objects.only('auth_login_id', 'auth_token_key').filter(
+            api_url=base_url
+        ).first()
+        if platform and platform.auth_login_id and platform.auth_token_key:
+            return dict(auth_user=platform.auth_login_id, auth_token=platform.auth_token_key)
+        return {}
+
+    def refresh(self, cache_entry):
+        """
+        Refresh one cached response, a conditional GET when it has validators
+        :return: bool
+        """
+        rest_client = RestClient(cache_entry.service)
+        auth_kwargs = _auth_kwargs(
+            rest_client, cache_entry.base_url, cache_entry.resource,
+            **self._platform_auth(cache_entry.base_url)
+        )
+        response = rest_client.refresh_cached_response(
+            cache_entry.base_url, cache_entry.resource,
+            headers=auth_kwargs.get('headers'), auth_tuple=auth_kwargs.get('auth_tuple')
+        )
+        return response.get('status_code') in (200, 304)
+
+    def warm(self):
+        """
+        Refresh hot cached responses ahead of their expiry
+        :return: number of refreshed responses
+        """
+        cache_entries = self.hot_entries()
+        if not cache_entries:
+            return 0
+
+        @release_db_connection
+        def _refresh(cache_entry):
+            try:
+                return self.refresh(cache_entry)
+            except Exception as e:
+                logger.warning("Cache warm-up of %s%s failed: %s" % (
+                    cache_entry.base_url, cache_entry.resource, e))
+                return False
+
+        with ThreadPoolExecutor(max_workers=self._config('CONCURRENCY')) as executor:
+            return sum(executor.map(_refresh, cache_entries))
@@ -17,6 +17,7 @@
 import yaml
 
 # django
+from django.conf import settings
 from django.urls import reverse
 from django.http import HttpResponse
 from django.utils.decorators import method_decorator
@@ -35,6 +36,9 @@ from dashboard.managers.graphs import GraphManager
 from dashboard.managers.jobs import (
     JobTemplateManager, JobsLogManager, YMLBasedJobManager
 )
+from dashboard.services.consume.cache import CacheAPIManager
+from dashboard.services.consume.ratelimit import rate_limiters
+from dashboard.services.consume.retry import retry_policy
 
 
 class InventoryManagerMixin(object):
@@ -65,6 +69,21 @@ class PingServer(APIView):
         return Response(response_text)
 
 
+class ServicesHealth(APIView):
+    """Platform Services Health API"""
+    authentication_classes = (TokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        """Circuit breakers, retries, rate limits and cache counters of this process."""
+        response_text = {
+            "hosts": retry_policy.stats(),
+            "rate_limits": rate_limiters.stats(),
+            "memory_cache": CacheAPIManager.memory_cache.stats(),
+        }
+        return Response(response_text)
+
+
 class PackageExist(GraphManagerMixin, APIView):
     """Package Exist API"""
     def get(self, request, **kwargs):
@@ -334,13 +353,25 @@ class RunJob(JobManagerMixin, APIView):
                         **{'params': job_params, 'type': input_job_type},
                         **{'active_user_email': active_user_email}
                     )
+                    run_async = getattr(settings, 'YML_JOBS_ASYNC', False) or \
+                        str(query_params.get('ASYNC', '')).lower() in ('1', 'true', 'yes')
                     try:
-                        job_uuid, _ = job_manager.execute_job()
+                        if run_async:
+                            job_uuid = job_manager.enqueue_job()
+                        else:
+                            job_uuid, _ = job_manager.execute_job()
                     except Exception as e:
                         return Response({
                             "Exception": "Something went wrong while job execution."
                         }, status=500)
                     else:
+                        if run_async:
+                            return Response({
+                                "Success": "Job queued. Status URL: %s" %
+                                           self.request.build_absolute_uri(reverse(
+                                               'api_job_status', kwargs={'job_id': str(job_uuid)})),
+                                "job_id": str(job_uuid)
+                            }, status=202)
                         response_text, response_code = {
                             "Success": "Job created and logged. URL: %s" %
                                        self.request.get_raw_uri().replace(
@@ -361,6 +392,46 @@ class RunJob(JobManagerMixin, APIView):
         return Response(response_text, status=response_code)
 
 
+class JobStatus(JobManagerMixin, APIView):
+    """Job Status API"""
+
+    def get(self, request, **kwargs):
+        """Status of a YML job: queued, running, succeeded, failed or cancelled."""
+        job = self.job_log_manager.get_job_detail(kwargs.get('job_id'))
+        if not job:
+            return Response({kwargs.get('job_id'): "Job not found"}, status=404)
+        response_text = {
+            'id': str(job.job_uuid),
+            'type': job.job_type,
+            'status': job.status,
+            'result': job.job_result,
+            'remarks': job.job_remarks,
+            'start_time': job.job_start_time.strftime("%Y-%m-%d %H:%M:%S"),
+            'end_time': job.job_end_time.strftime("%Y-%m-%d %H:%M:%S") if job.job_end_time else None,
+        }
+        if job.job_visible_on_url:
+            response_text['log_url'] = request.build_absolute_uri(
+                reverse('api_job_log', kwargs={'job_id': str(job.job_uuid)}))
+        return Response(response_text)
+
+
+class CancelJob(JobManagerMixin, APIView):
+    """Cancel Job API"""
+
+    authentication_classes = (TokenAuthentication, )
+    permission_classes = (IsAuthenticated, )
+
+    def post(self, request, **kwargs):
+        """Cancel a queued or running YML job. Requires authentication token."""
+        job_id = kwargs.get('job_id')
+        job = self.job_log_manager.get_job_detail(job_id)
+        if not job:
+            return Response({job_id: "Job not found"}, status=404)
+        if not self.job_log_manager.cancel_job(job_id):
+            return Response({job_id: "Job is %s, it cannot be cancelled." % job.status}, status=409)
+        return Response({job_id: "Job cancelled"})
+
+
 class JobLog(JobManagerMixin, APIView):
     """Job Log API"""
 
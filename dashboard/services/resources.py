@@ -18,15 +18,26 @@
 #  Factory Design Pattern to group calls for operation(s)
 #  Strategy Design Pattern to transform data
 
+import os
 import json
+import math
+import time
+import asyncio
 import logging
+import threading
+from functools import partial
+from contextlib import contextmanager
 from subprocess import Popen, PIPE
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 try:
     import koji
 except Exception as e:
     raise Exception("koji could not be imported, details: %s" % e)
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+# django
+from django.conf import settings
 
 # dashboard
 from dashboard.constants import (
@@ -34,15 +45,88 @@ from dashboard.constants import (
 )
 from dashboard.converters.xml2dict import parse
 from dashboard.services.consume import call_service
+from dashboard.services.consume.decorators import release_db_connection
+from dashboard.services.consume.restclient import RestClient
 
 
-__all__ = ['APIResources']
+__all__ = ['APIResources', 'AsyncAPIResources']
 
 logger = logging.getLogger(__name__)
 
 
 class ResourcesBase(object):
     """Base class for resources"""
+
+    PAGE_WORKERS = 4
+
+    @staticmethod
+    def _fetch_pages(service, base_url, resource, page_exts, *url_params, **kwargs):
+        """
+        Fetch remaining pages of a listing concurrently
+        :param service: Platform engine
+        :param page_exts: query string of every page to fetch
+        :return: list of response dicts, in order of page_exts
+        """
+        kwargs.pop('rest_response', None)
+        kwargs.pop('combine_results', None)
+
+        @release_db_connection
+        def _fetch_page(page_ext):
+            page_kwargs = dict(kwargs, ext=page_ext)
+            page_kwargs['headers'] = dict(kwargs.get('headers') or {})
+            return RestClient(service).process_request(
+                base_url, resource, *url_params, **page_kwargs
+            )
+
+        if not page_exts:
+            return []
+        workers = min(ResourcesBase.PAGE_WORKERS, len(page_exts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_fetch_page, page_exts))
+
+    @staticmethod
+    def _page_query(query, page_param, page_number):
+        """Query string with page_param set to page_number"""
+        query_params = OrderedDict(parse_qsl(query))
+        query_params[page_param] = page_number
+        return urlencode(query_params)
+
+    @staticmethod
+    def _weblate_page_exts(json_content):
+        """Remaining page queries of a Weblate listing"""
+        results, next_url = json_content.get('results') or [], json_content.get('next')
+        if not (results and next_url):
+            return []
+        next_query = urlparse(next_url).query
+        next_page = int(dict(parse_qsl(next_query)).get('page', 2))
+        total_pages = math.ceil(json_content.get('count', 0) / len(results))
+        return [ResourcesBase._page_query(next_query, 'page', page)
+                for page in range(next_page, total_pages + 1)]
+
+    @staticmethod
+    def _memsource_page_exts(json_content):
+        """Remaining page queries of a Memsource listing, pageNumber is 0-based"""
+        page_number = json_content.get("pageNumber", 0)
+        total_pages = json_content.get("totalPages", 0)
+        return ["{}={}".format("pageNumber", page) for page in range(page_number + 1, total_pages)]
+
+    @staticmethod
+    def _github_page_exts(header_link):
+        """Remaining page queries of a GitHub listing, from the Link header"""
+        page_links = {}
+        for page_ref in (header_link or '').split(','):
+            if ';' not in page_ref:
+                continue
+            page_url, rel = page_ref.split(';', 1)
+            page_links[rel.strip().replace('rel=', '').strip('"')] = page_url.strip().strip('<>')
+        if not page_links.get('next'):
+            return []
+        next_query = urlparse(page_links['next']).query
+        next_page = int(dict(parse_qsl(next_query)).get('page', 2))
+        last_page = int(dict(parse_qsl(urlparse(page_links.get('last', '')).query)).get('page', next_page))
+        return [ResourcesBase._page_query(next_query, 'page', page)
+                for page in range(next_page, last_page + 1)]
+
     @staticmethod
     def _execute_method(api_config, *args, **kwargs):
         """Executes located method with required params"""
@@ -68,27 +152,18 @@ class GitPlatformResources(ResourcesBase):
     @staticmethod
     @call_service(GIT_PLATFORMS[0])
     def _fetch_github_repo_branches(base_url, resource, *url_params, **kwargs):
-
-        def _get_github_next_page(header_link):
-            page_ref = [page_ref for page_ref in header_link.split(',') if 'next' in page_ref]
-            next_url, rel = '', ''
-            if len(page_ref) >= 1 and ";" in page_ref[0]:
-                next_url, rel = page_ref[0].split(";")
-                next_url = next_url[next_url.index("?") + 1: next_url.index(">")]
-            return next_url
-
         response = kwargs.get('rest_response', {})
+        combine_results = kwargs['combine_results']
         if isinstance(response.get('json_content'), list):
-            kwargs['combine_results'].extend(response.get('json_content'))
-
-        if 'link' in response['raw'].headers and response['raw'].headers.get('link'):
-            next_page = _get_github_next_page(response['raw'].headers['link'])
-            if next_page:
-                kwargs['ext'] = next_page
-                GitPlatformResources._fetch_github_repo_branches(
-                    base_url, resource, *url_params, **kwargs
-                )
-        return [branch.get('name', '') for branch in kwargs['combine_results']]
+            combine_results.extend(response.get('json_content'))
+
+        # cached first pages keep their Link header
+        page_exts = GitPlatformResources._github_page_exts((response.get('headers') or {}).get('link'))
+        for page_response in GitPlatformResources._fetch_pages(
+                GIT_PLATFORMS[0], base_url, resource, page_exts, *url_params, **kwargs):
+            if isinstance(page_response.get('json_content'), list):
+                combine_results.extend(page_response['json_content'])
+        return [branch.get('name', '') for branch in combine_results]
 
     @staticmethod
     @call_service(GIT_PLATFORMS[1])
@@ -281,6 +356,11 @@ class GitPlatformResources(ResourcesBase):
 class TransplatformResources(ResourcesBase):
     """Translation Platform related Resources"""
 
+    # stats_index entry of its (base_url, locale, release): lock dict,
+    # one fetch of a document at a time; the locks go with the index
+    DAMNEDLIES_INDEX_LOCKS = 'locks'
+    damnedlies_stats_index_lock = threading.Lock()
+
     @staticmethod
     @call_service(TRANSPLATFORM_ENGINES[0])
     def _fetch_damnedlies_projects(base_url, resource, *url_params, **kwargs):
@@ -305,31 +385,27 @@ class TransplatformResources(ResourcesBase):
     @call_service(TRANSPLATFORM_ENGINES[3])
     def _fetch_weblate_projects(base_url, resource, *url_params, **kwargs):
         response = kwargs.get('rest_response', {})
+        combine_results = kwargs['combine_results']
         if response.get('json_content', {}).get('results'):
-            kwargs['combine_results'].extend(response['json_content']['results'])
-        if response.get('json_content', {}).get('next'):
-            next_api_url = urlparse(response['json_content']['next'])
-            if next_api_url.query:
-                kwargs['ext'] = next_api_url.query
-            TransplatformResources._fetch_weblate_projects(
-                base_url, resource, *url_params, **kwargs
-            )
-        return kwargs['combine_results']
+            combine_results.extend(response['json_content']['results'])
+        page_exts = TransplatformResources._weblate_page_exts(response.get('json_content') or {})
+        for page_response in TransplatformResources._fetch_pages(
+                TRANSPLATFORM_ENGINES[3], base_url, resource, page_exts, *url_params, **kwargs):
+            combine_results.extend((page_response.get('json_content') or {}).get('results') or [])
+        return combine_results
 
     @staticmethod
     @call_service(TRANSPLATFORM_ENGINES[4])
     def _fetch_memsource_projects(base_url, resource, *url_params, **kwargs):
         response = kwargs.get('rest_response', {})
+        combine_results = kwargs['combine_results']
         if response.get("json_content", {}).get("content"):
-            kwargs['combine_results'].extend(response['json_content']['content'])
-        resp_page_number = response.get("json_content", {}).get("pageNumber", 0)
-        resp_total_pages = response.get("json_content", {}).get("totalPages", 0)
-        if resp_total_pages > 1 and resp_page_number < resp_total_pages:
-            kwargs['ext'] = "{}={}".format("pageNumber", resp_page_number + 1)
-            TransplatformResources._fetch_memsource_projects(
-                base_url, resource, *url_params, **kwargs
-            )
-        return kwargs['combine_results']
+            combine_results.extend(response['json_content']['content'])
+        page_exts = TransplatformResources._memsource_page_exts(response.get('json_content') or {})
+        for page_response in TransplatformResources._fetch_pages(
+                TRANSPLATFORM_ENGINES[4], base_url, resource, page_exts, *url_params, **kwargs):
+            combine_results.extend((page_response.get('json_content') or {}).get('content') or [])
+        return combine_results
 
     @staticmethod
     @call_service(TRANSPLATFORM_ENGINES[0])
@@ -374,7 +450,8 @@ class TransplatformResources(ResourcesBase):
         required_project = {}
         for project in projects:
             if project.get('fields', {}).get('name', '') == url_params[0]:
-                required_project = project
+                # copy, cached responses are shared
+                required_project = dict(project)
         if kwargs.get('more_resources'):
             for next_resource in kwargs['more_resources']:
                 if next_resource == 'releases':
@@ -401,7 +478,8 @@ class TransplatformResources(ResourcesBase):
     @call_service(TRANSPLATFORM_ENGINES[3])
     def _fetch_weblate_project_details(base_url, resource, *url_params, **kwargs):
         response = kwargs.get('rest_response', {})
-        resp_json_content = response.get('json_content')
+        # copy, cached responses are shared
+        resp_json_content = dict(response.get('json_content') or {})
         if kwargs.get('more_resources'):
             for next_resource in kwargs['more_resources']:
                 if next_resource == 'project_components':
@@ -414,16 +492,14 @@ class TransplatformResources(ResourcesBase):
     @call_service(TRANSPLATFORM_ENGINES[3])
     def _fetch_weblate_project_components(base_url, resource, *url_params, **kwargs):
         response = kwargs.get('rest_response', {})
+        combine_results = kwargs['combine_results']
         if response.get('json_content', {}).get('results'):
-            kwargs['combine_results'].extend(response['json_content']['results'])
-        if response.get('json_content', {}).get('next'):
-            next_api_url = urlparse(response['json_content']['next'])
-            if next_api_url.query:
-                kwargs['ext'] = next_api_url.query
-            TransplatformResources._fetch_weblate_project_components(
-                base_url, resource, *url_params, **kwargs
-            )
-        return kwargs['combine_results']
+            combine_results.extend(response['json_content']['results'])
+        page_exts = TransplatformResources._weblate_page_exts(response.get('json_content') or {})
+        for page_response in TransplatformResources._fetch_pages(
+                TRANSPLATFORM_ENGINES[3], base_url, resource, page_exts, *url_params, **kwargs):
+            combine_results.extend((page_response.get('json_content') or {}).get('results') or [])
+        return combine_results
 
     @staticmethod
     @call_service(TRANSPLATFORM_ENGINES[4])
@@ -431,7 +507,7 @@ class TransplatformResources(ResourcesBase):
         response = kwargs.get('rest_response', {})
         if response.get('err_content') and not response.get('json_content'):
             return response.get('err_content')
-        resp_json_content = response.get('json_content')
+        resp_json_content = dict(response.get('json_content') or {})
         workflow_steps = resp_json_content.get('workflowSteps', [])
 
         if kwargs.get('more_resources'):
@@ -456,16 +532,16 @@ class TransplatformResources(ResourcesBase):
     @call_service(TRANSPLATFORM_ENGINES[4])
     def _fetch_memsource_project_jobs(base_url, resource, *url_params, **kwargs):
         response = kwargs.get('rest_response', {})
+        combine_results = kwargs['combine_results']
         if response.get("json_content", {}).get("content"):
-            kwargs['combine_results'].extend(response['json_content']['content'])
-        resp_page_number = response.get("json_content", {}).get("pageNumber", 0)
-        resp_total_pages = response.get("json_content", {}).get("totalPages", 0)
-        if resp_total_pages > 1 and resp_page_number < resp_total_pages:
-            kwargs['ext'] = "{}={}".format("pageNumber", resp_page_number + 1)
-            TransplatformResources._fetch_memsource_project_jobs(
-                base_url, resource, *url_params, **kwargs
-            )
-        return kwargs['combine_results']
+            combine_results.extend(response['json_content']['content'])
+        # pages keep the workflowLevel filter of the first one
+        page_exts = ["&".join(filter(None, (kwargs.get('ext'), page_ext))) for page_ext in
+                     TransplatformResources._memsource_page_exts(response.get('json_content') or {})]
+        for page_response in TransplatformResources._fetch_pages(
+                TRANSPLATFORM_ENGINES[4], base_url, resource, page_exts, *url_params, **kwargs):
+            combine_results.extend((page_response.get('json_content') or {}).get('content') or [])
+        return combine_results
 
     @staticmethod
     def _locate_damnedlies_stats(module_stat):
@@ -485,17 +561,26 @@ class TransplatformResources(ResourcesBase):
         return translated, fuzzy, untranslated, total
 
     @staticmethod
-    @call_service(TRANSPLATFORM_ENGINES[0])
-    def _fetch_damnedlies_locale_release_stats(base_url, resource, *url_params, **kwargs):
+    def _damnedlies_locale_stat_dict(locale, stats_tuple):
         locale_stat_dict = {}
         locale_stat_dict["unit"] = "MESSAGE"
-        locale_stat_dict["locale"] = url_params[0]
+        locale_stat_dict["locale"] = locale
+        if stats_tuple:
+            locale_stat_dict["translated"] = stats_tuple[0]
+            locale_stat_dict["untranslated"] = stats_tuple[1]
+            locale_stat_dict["fuzzy"] = stats_tuple[2]
+            locale_stat_dict["total"] = stats_tuple[3]
+        return locale_stat_dict
+
+    @staticmethod
+    @call_service(TRANSPLATFORM_ENGINES[0])
+    def _fetch_damnedlies_locale_release_stats(base_url, resource, *url_params, **kwargs):
         response = kwargs.get('rest_response', {})
+        stats_tuple = ()
         if response.get('text'):
             json_content = parse(response['text'])
             gnome_module_categories = json_content['stats']['category'] or []
             for category in gnome_module_categories:
-                stats_tuple = ()
                 modules = category.get('module')
                 if isinstance(modules, list):
                     for module in modules:
@@ -506,12 +591,61 @@ class TransplatformResources(ResourcesBase):
                     if modules.get('@id') == kwargs.get('package_name', ''):
                         stats_tuple = \
                             TransplatformResources._locate_damnedlies_stats(modules)
-                if stats_tuple:
-                    locale_stat_dict["translated"] = stats_tuple[0]
-                    locale_stat_dict["untranslated"] = stats_tuple[1]
-                    locale_stat_dict["fuzzy"] = stats_tuple[2]
-                    locale_stat_dict["total"] = stats_tuple[3]
-        return locale_stat_dict
+        return TransplatformResources._damnedlies_locale_stat_dict(url_params[0], stats_tuple)
+
+    @staticmethod
+    @call_service(TRANSPLATFORM_ENGINES[0])
+    def _index_damnedlies_locale_release_stats(base_url, resource, *url_params, **kwargs):
+        """stats of every module of a locale-release document, by module id"""
+        response = kwargs.get('rest_response', {})
+        modules_stats = {}
+        if response.get('text'):
+            json_content = parse(response['text'])
+            categories = json_content['stats']['category'] or []
+            if isinstance(categories, OrderedDict):
+                categories = [categories]
+            for category in categories:
+                modules = category.get('module')
+                if isinstance(modules, OrderedDict):
+                    modules = [modules]
+                for module in modules if isinstance(modules, list) else []:
+                    if module.get('@id'):
+                        modules_stats[module['@id']] = \
+                            TransplatformResources._locate_damnedlies_stats(module)
+        return modules_stats
+
+    @staticmethod
+    def _damnedlies_locale_release_index(stats_index, base_url, resource, locale, release):
+        """
+        Module stats of a locale-release, fetched and parsed once per stats_index
+        :param stats_index: dict, lives as long as one sync run
+        :return: dict of module id: stats tuple
+        """
+        key = (base_url, locale, release)
+        if key in stats_index:
+            return stats_index[key]
+        with TransplatformResources.damnedlies_stats_index_lock:
+            key_lock = stats_index.setdefault(
+                TransplatformResources.DAMNEDLIES_INDEX_LOCKS, {}
+            ).setdefault(key, threading.Lock())
+        with key_lock:
+            if key in stats_index:
+                return stats_index[key]
+            modules_stats = TransplatformResources._index_damnedlies_locale_release_stats(
+                base_url, resource, locale, release
+            )
+            if modules_stats:
+                stats_index[key] = modules_stats
+            return modules_stats or {}
+
+    @staticmethod
+    def _damnedlies_locale_release_stats_from_index(base_url, resource, *url_params, **kwargs):
+        modules_stats = TransplatformResources._damnedlies_locale_release_index(
+            kwargs['stats_index'], base_url, resource, url_params[0], url_params[1]
+        )
+        return TransplatformResources._damnedlies_locale_stat_dict(
+            url_params[0], modules_stats.get(kwargs.get('package_name', ''), ())
+        )
 
     @staticmethod
     @call_service(TRANSPLATFORM_ENGINES[1])
@@ -529,16 +663,14 @@ class TransplatformResources(ResourcesBase):
     @call_service(TRANSPLATFORM_ENGINES[3])
     def _fetch_weblate_proj_tran_stats(base_url, resource, *url_params, **kwargs):
         response = kwargs.get('rest_response', {})
+        combine_results = kwargs['combine_results']
         if response.get('json_content', {}).get('results'):
-            kwargs['combine_results'].extend(response['json_content']['results'])
-        if response.get('json_content', {}).get('next'):
-            next_api_url = urlparse(response['json_content']['next'])
-            if next_api_url.query:
-                kwargs['ext'] = next_api_url.query
-            TransplatformResources._fetch_weblate_proj_tran_stats(
-                base_url, resource, *url_params, **kwargs
-            )
-        return dict(id=url_params[1], stats=kwargs['combine_results'])
+            combine_results.extend(response['json_content']['results'])
+        page_exts = TransplatformResources._weblate_page_exts(response.get('json_content') or {})
+        for page_response in TransplatformResources._fetch_pages(
+                TRANSPLATFORM_ENGINES[3], base_url, resource, page_exts, *url_params, **kwargs):
+            combine_results.extend((page_response.get('json_content') or {}).get('results') or [])
+        return dict(id=url_params[1], stats=combine_results)
 
     @staticmethod
     def __push_response(service_resp):
@@ -576,6 +708,9 @@ class TransplatformResources(ResourcesBase):
     @staticmethod
     def __pull_response(service_resp):
         if service_resp.get('raw').ok:
+            # unread response when asked to stream
+            if 'content' not in service_resp:
+                return True, service_resp['raw']
             return True, service_resp.get('content')
         return False, {service_resp.get('status_code', 'Error'): service_resp.get('text')}
 
@@ -607,16 +742,14 @@ class TransplatformResources(ResourcesBase):
     @call_service(TRANSPLATFORM_ENGINES[4])
     def _memsource_fetch_project_templates(base_url, resource, *url_params, **kwargs):
         response = kwargs.get('rest_response', {})
+        combine_results = kwargs['combine_results']
         if response.get("json_content", {}).get("content"):
-            kwargs['combine_results'].extend(response['json_content']['content'])
-        resp_page_number = response.get("json_content", {}).get("pageNumber", 0)
-        resp_total_pages = response.get("json_content", {}).get("totalPages", 0)
-        if resp_total_pages > 1 and resp_page_number < resp_total_pages:
-            kwargs['ext'] = "{}={}".format("pageNumber", resp_page_number + 1)
-            TransplatformResources._memsource_fetch_project_templates(
-                base_url, resource, *url_params, **kwargs
-            )
-        return kwargs['combine_results']
+            combine_results.extend(response['json_content']['content'])
+        page_exts = TransplatformResources._memsource_page_exts(response.get('json_content') or {})
+        for page_response in TransplatformResources._fetch_pages(
+                TRANSPLATFORM_ENGINES[4], base_url, resource, page_exts, *url_params, **kwargs):
+            combine_results.extend((page_response.get('json_content') or {}).get('content') or [])
+        return combine_results
 
     def fetch_all_projects(self, translation_platform, instance_url, *args, **kwargs):
         """
@@ -739,9 +872,12 @@ class TransplatformResources(ResourcesBase):
         :param kwargs: Keyword Args: dict
         :return: dict
         """
+        stats_index = kwargs.pop('stats_index', None)
         method_mapper = {
             TRANSPLATFORM_ENGINES[0]: {
-                'method': self._fetch_damnedlies_locale_release_stats,
+                # within a sync run: serve every package from one parsed document per locale-release
+                'method': partial(self._damnedlies_locale_release_stats_from_index, stats_index=stats_index)
+                if stats_index is not None else self._fetch_damnedlies_locale_release_stats,
                 'base_url': instance_url,
                 'resources': ['release_trans_stats'],
                 'locale': args[0],
@@ -893,20 +1029,153 @@ class TransplatformResources(ResourcesBase):
         return self._execute_method(selected_config, *args, **kwargs)
 
 
-class KojiResources(object):
-    """Koji Resources"""
+class KojiSessionPool(object):
+    """
+    Pooled koji.ClientSession objects, per hub url
+        - a session serves one thread at a time, idle ones are kept alive for reuse
+        - login happens on first checkout of a session, only for hubs asking for it
+        - sessions whose auth expired, or older than MAX_AGE_SEC, are recycled
+        - settings.KOJI_SESSION_POOL overrides class defaults
+    """
+
+    MAX_IDLE = 4
+    MAX_AGE_SEC = 900
+    LOGIN_HUBS = ()
+
+    def __init__(self):
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _config(self, key):
+        pool_config = getattr(settings, 'KOJI_SESSION_POOL', None) or {}
+        return pool_config.get(key, getattr(self, key))
 
     @staticmethod
-    def _session(hub):
+    def _create_session(hub):
         krb_service = ''
         if BUILD_SYSTEMS[0] in hub:
             krb_service = 'brewhub'
         elif BUILD_SYSTEMS[1] in hub:
             krb_service = 'kojihub'
-        return koji.ClientSession(
+        koji_session = koji.ClientSession(
             hub, opts={'krbservice': krb_service, 'no_ssl_verify': True}
         )
-        # self.session.gssapi_login()
+        koji_session.created_at = time.monotonic()
+        return koji_session
+
+    def _reset_after_fork(self):
+        # celery prefork workers must not share sockets with the parent
+        if self._pid != os.getpid():
+            self._idle = {}
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+
+    def checkout(self, hub):
+        """
+        Take an idle session of the hub, or create one
+        :param hub: str
+        :return: koji.ClientSession
+        """
+        self._reset_after_fork()
+        koji_session, expired_sessions = None, []
+        with self._lock:
+            idle_sessions = self._idle.get(hub) or []
+            while idle_sessions and not koji_session:
+                koji_session = idle_sessions.pop()
+                if time.monotonic() - koji_session.created_at > self._config('MAX_AGE_SEC'):
+                    expired_sessions.append(koji_session)
+                    koji_session = None
+        for expired_session in expired_sessions:
+            self.discard(expired_session)
+        if not koji_session:
+            koji_session = self._create_session(hub)
+        if hub in self._config('LOGIN_HUBS') and not koji_session.logged_in:
+            koji_session.gssapi_login()
+        return koji_session
+
+    def checkin(self, hub, koji_session):
+        """Return a session to the pool, closing it if the pool is full"""
+        with self._lock:
+            idle_sessions = self._idle.setdefault(hub, [])
+            if len(idle_sessions) < self._config('MAX_IDLE'):
+                idle_sessions.append(koji_session)
+                return
+        self.discard(koji_session)
+
+    @staticmethod
+    def discard(koji_session):
+        try:
+            if koji_session.logged_in:
+                koji_session.logout()
+            if koji_session.rsession:
+                koji_session.rsession.close()
+        except Exception:
+            # session is being thrown away anyway
+            pass
+
+    @contextmanager
+    def session(self, hub):
+        """
+        Checked out session for the duration of the block
+            - dropped instead of returned when the block fails with an auth error
+        """
+        koji_session = self.checkout(hub)
+        try:
+            yield koji_session
+        except (koji.AuthExpired, koji.AuthError):
+            self.discard(koji_session)
+            raise
+        except Exception:
+            self.checkin(hub, koji_session)
+            raise
+        else:
+            self.checkin(hub, koji_session)
+
+    def call(self, hub, method, *args, **kwargs):
+        """
+        Call a hub method over a pooled session, once more on a fresh one if auth expired
+        :param hub: str
+        :param method: hub method name
+        :return: method result
+        """
+        try:
+            with self.session(hub) as koji_session:
+                return getattr(koji_session, method)(*args, **kwargs)
+        except koji.AuthExpired:
+            with self.session(hub) as koji_session:
+                return getattr(koji_session, method)(*args, **kwargs)
+
+    def close_all(self):
+        """Close every idle session"""
+        with self._lock:
+            for idle_sessions in self._idle.values():
+                for koji_session in idle_sessions:
+                    self.discard(koji_session)
+            self._idle = {}
+
+
+koji_session_pool = KojiSessionPool()
+
+
+class KojiResources(object):
+    """Koji Resources"""
+
+    LATEST_BUILDS_SNAPSHOT_TTL_SEC = 1800
+
+    # (hub_url, tag): (taken at, {package name: latest build})
+    latest_builds_snapshots = {}
+    # (hub_url, tag): lock, a tag being fetched does not hold up the others
+    latest_builds_snapshot_locks = {}
+    latest_builds_snapshots_lock = threading.Lock()
+
+    @staticmethod
+    def _session(hub):
+        return koji_session_pool.session(hub)
+
+    @staticmethod
+    def _call(hub, method, *args, **kwargs):
+        return koji_session_pool.call(hub, method, *args, **kwargs)
 
     def establish_kerberos_ticket(self):
         """Get kerberos ticket in-place"""
@@ -922,11 +1191,13 @@ class KojiResources(object):
     def build_tags(self, hub_url, product):
         """Get build tags"""
         all_tags = []
-        active_repos = self._session(hub_url).getActiveRepos()
         tag_starts_with = ''
+        with self._session(hub_url) as koji_session:
+            active_repos = koji_session.getActiveRepos()
+            if BUILD_SYSTEMS[0] in hub_url:
+                all_tags = koji_session.listTags()
 
         if BUILD_SYSTEMS[0] in hub_url:
-            all_tags = self._session(hub_url).listTags()
             if product.product_slug == RELSTREAM_SLUGS[0]:
                 tag_starts_with = 'rhel'
             elif product.product_slug == RELSTREAM_SLUGS[2]:
@@ -958,20 +1229,70 @@ class KojiResources(object):
             ))
         return sorted(processed_tags, reverse=True)
 
-    def build_info(self, hub_url, tag, pkg):
-        return self._session(hub_url).getLatestBuilds(tag, package=pkg)
+    def _fresh_snapshot(self, hub_url, tag):
+        snapshot = self.latest_builds_snapshots.get((hub_url, tag))
+        if snapshot and time.monotonic() - snapshot[0] < self.LATEST_BUILDS_SNAPSHOT_TTL_SEC:
+            return snapshot[1]
+
+    def _snapshot_lock(self, hub_url, tag):
+        with self.latest_builds_snapshots_lock:
+            return self.latest_builds_snapshot_locks.setdefault((hub_url, tag), threading.Lock())
+
+    def _store_snapshot(self, hub_url, tag, snapshot):
+        now = time.monotonic()
+        with self.latest_builds_snapshots_lock:
+            # tags nobody asked for within the TTL are let go
+            for key, (taken_at, _) in list(self.latest_builds_snapshots.items()):
+                if now - taken_at >= self.LATEST_BUILDS_SNAPSHOT_TTL_SEC:
+                    del self.latest_builds_snapshots[key]
+                    snapshot_lock = self.latest_builds_snapshot_locks.get(key)
+                    if snapshot_lock and not snapshot_lock.locked():
+                        del self.latest_builds_snapshot_locks[key]
+            self.latest_builds_snapshots[(hub_url, tag)] = (now, snapshot)
+
+    def latest_builds_snapshot(self, hub_url, tag):
+        """
+        Latest builds of every package in a tag, taken in one hub call
+            - held in process memory for LATEST_BUILDS_SNAPSHOT_TTL_SEC
+        :param hub_url: str
+        :param tag: str
+        :return: dict of package name: latest build
+        """
+        snapshot = self._fresh_snapshot(hub_url, tag)
+        if snapshot is not None:
+            return snapshot
+        with self._snapshot_lock(hub_url, tag):
+            snapshot = self._fresh_snapshot(hub_url, tag)
+            if snapshot is None:
+                snapshot = {build['package_name']: build
+                            for build in self._call(hub_url, 'getLatestBuilds', tag) or []
+                            if build.get('package_name')}
+                self._store_snapshot(hub_url, tag, snapshot)
+            return snapshot
+
+    def build_info(self, hub_url, tag, pkg, snapshot=False):
+        """
+        Latest build of a package in a tag
+        :param snapshot: answer from the tag-wide snapshot, instead of a call per package;
+                         for bulk checks only, jobs need the live build
+        :return: list
+        """
+        if snapshot:
+            latest_build = self.latest_builds_snapshot(hub_url, tag).get(pkg)
+            return [dict(latest_build)] if latest_build else []
+        return self._call(hub_url, 'getLatestBuilds', tag, package=pkg)
 
     def get_build(self, hub_url, build_id):
-        return self._session(hub_url).getBuild(build_id)
+        return self._call(hub_url, 'getBuild', build_id)
 
     def list_RPMs(self, hub_url, build_id):
-        return self._session(hub_url).listRPMs(buildID=build_id)
+        return self._call(hub_url, 'listRPMs', buildID=build_id)
 
     def package_id(self, hub_url, pkg):
-        return self._session(hub_url).getPackageID(pkg)
+        return self._call(hub_url, 'getPackageID', pkg)
 
     def list_builds(self, hub_url, pkg_id):
-        pkg_builds = self._session(hub_url).listBuilds(packageID=pkg_id)
+        pkg_builds = self._call(hub_url, 'listBuilds', packageID=pkg_id)
         try:
             return sorted(pkg_builds, key=lambda x: x['build_id'])
         except Exception as e:
@@ -980,15 +1301,72 @@ class KojiResources(object):
         return pkg_builds or []
 
     def list_tags(self, hub_url, build_id):
-        build_tags = self._session(hub_url).listTags(build=build_id)
+        build_tags = self._call(hub_url, 'listTags', build=build_id)
         return [tag['name'] for tag in build_tags if tag.get('name')]
 
+    def _multicall(self, hub_url, calls):
+        """
+        Send many hub calls in a single round trip
+        :param hub_url: str
+        :param calls: list of (method name, args, kwargs)
+        :return: list of results in order of calls, None for a faulted call
+        """
+        if not calls:
+            return []
+        with self._session(hub_url) as koji_session:
+            koji_session.multicall = True
+            try:
+                for method, args, kwargs in calls:
+                    getattr(koji_session, method)(*args, **kwargs)
+                call_results = koji_session.multiCall()
+            finally:
+                koji_session.multicall = False
+        results = []
+        for call, call_result in zip(calls, call_results):
+            if isinstance(call_result, dict):
+                # fault of this call only, rest of the batch stands
+                logger.warning("Koji multicall %s failed: %s" % (call[0], call_result.get('faultString')))
+                results.append(None)
+            else:
+                results.append(call_result[0])
+        return results
+
+    def list_tags_bulk(self, hub_url, build_ids):
+        """
+        Tags of many builds, in one hub round trip
+        :param hub_url: str
+        :param build_ids: list
+        :return: dict of build_id: tag names
+        """
+        build_ids = list(build_ids)
+        builds_tags = self._multicall(
+            hub_url, [('listTags', (), {'build': build_id}) for build_id in build_ids]
+        )
+        return {build_id: [tag['name'] for tag in build_tags or [] if tag.get('name')]
+                for build_id, build_tags in zip(build_ids, builds_tags)}
+
+    def build_with_rpms(self, hub_url, build_id):
+        """
+        Build details and its RPMs, in one hub round trip
+        :param hub_url: str
+        :param build_id: int
+        :return: tuple of build info and list of RPMs
+        :raise koji.GenericError: when the build could not be fetched
+        """
+        build_info, rpms = self._multicall(hub_url, [
+            ('getBuild', (build_id,), {}), ('listRPMs', (), {'buildID': build_id})
+        ])
+        if not build_info:
+            # as getBuild would have, outside a multicall
+            raise koji.GenericError("Build %s could not be fetched from %s" % (build_id, hub_url))
+        return build_info, rpms or []
+
     def task_info(self, hub_url, task_id):
-        task_info = self._session(hub_url).getTaskInfo(task_id=task_id)
+        task_info = self._call(hub_url, 'getTaskInfo', task_id=task_id)
         return task_info
 
     def task_result(self, hub_url, task_id):
-        task_result = self._session(hub_url).getTaskResult(taskId=task_id)
+        task_result = self._call(hub_url, 'getTaskResult', taskId=task_id)
         return task_result
 
     def get_path_info(self, build=None, srpm=None, task=None):
@@ -1009,3 +1387,64 @@ class APIResources(GitPlatformResources,
      REST Communications
     """
     pass
+
+
+class AsyncAPIResources(object):
+    """
+    asyncio Entry Point to
+     REST Communications
+        - every public APIResources method is available as a coroutine
+        - gather() runs many of them with bounded concurrency
+    """
+
+    MAX_CONCURRENCY = 8
+
+    def __init__(self, max_concurrency=None):
+        self.api_resources = APIResources()
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        self._loop_semaphore = (None, None)
+
+    def _semaphore(self):
+        loop = asyncio.get_event_loop()
+        if self._loop_semaphore[0] is not loop:
+            self._loop_semaphore = (loop, asyncio.Semaphore(self.max_concurrency))
+        return self._loop_semaphore[1]
+
+    def __getattr__(self, name):
+        method = getattr(self.api_resources, name)
+        if name.startswith('_') or not callable(method):
+            raise AttributeError(name)
+
+        async def async_method(*args, **kwargs):
+            async with self._semaphore():
+                return await asyncio.get_event_loop().run_in_executor(
+                    None, partial(release_db_connection(method), *args, **kwargs)
+                )
+        async_method.__name__ = name
+        return async_method
+
+    async def agather(self, calls):
+        """
+        Run APIResources calls concurrently
+        :param calls: iterable of (method_name, args, kwargs)
+        :return: list of results, in order of calls
+        """
+        return await asyncio.gather(*[
+            getattr(self, method_name)(*args, **kwargs) for method_name, args, kwargs in calls
+        ])
+
+    def gather(self, calls):
+        """
+        Blocking entry point of agather for synchronous callers
+            - inside a running event loop (asyncio.run can not nest),
+              calls run on a fresh loop in a helper thread
+        :param calls: iterable of (method_name, args, kwargs)
+        :return: list of results, in order of calls
+        """
+        calls = list(calls)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.agather(calls))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.agather(calls)).result()
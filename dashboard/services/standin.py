@@ -0,0 +1,185 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+# Offline stand-in of the platforms: serves recorded responses of the
+# configured REST resources, and a fake Koji hub, for benchmarks and CI.
+
+import os
+import re
+import json
+import time
+import random
+import xmlrpc.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dashboard.services.consume.replay import ResponseRecorder
+from dashboard.services.consume.restclient import ServiceConfig
+
+
+__all__ = ['FakeKojiHub', 'StandInServer']
+
+KOJI_HUB_PATH = '/kojihub'
+KOJI_FIXTURE = 'koji.json'
+
+
+class FakeKojiHub(object):
+    """
+    XML-RPC Koji hub answering from a json fixture
+        - {"getLatestBuilds": [{"args": ["f42"], "kwargs": {"package": "pkg"}, "result": [...]},
+                               {"result": []}], ...}
+        - an entry without args and kwargs answers every other call of the method
+        - multiCall batches are answered call by call
+    """
+
+    def __init__(self, fixture_path):
+        self.fixture_path = fixture_path
+        try:
+            with open(fixture_path) as f:
+                self.fixture = json.load(f)
+        except (OSError, ValueError):
+            self.fixture = {}
+
+    @staticmethod
+    def _decode_params(params):
+        # koji sends keyword arguments as a trailing struct flagged __starstar
+        args, kwargs = list(params), {}
+        if args and isinstance(args[-1], dict) and args[-1].get('__starstar'):
+            kwargs = dict(args.pop())
+            kwargs.pop('__starstar')
+        return args, kwargs
+
+    def call(self, method, params):
+        """
+        Recorded result of a hub call
+        :raise xmlrpc.client.Fault: when nothing is recorded for it
+        """
+        args, kwargs = self._decode_params(params)
+        default = None
+        for entry in self.fixture.get(method) or []:
+            if 'args' not in entry and 'kwargs' not in entry:
+                default = entry
+            elif list(entry.get('args') or []) == args and (entry.get('kwargs') or {}) == kwargs:
+                return entry.get('result')
+        if default is not None:
+            return default.get('result')
+        raise xmlrpc.client.Fault(1000, 'No fixture recorded for %s%s' % (method, tuple(params)))
+
+    def multi_call(self, calls):
+        results = []
+        for call in calls:
+            try:
+                results.append([self.call(call['methodName'], call.get('params') or [])])
+            except xmlrpc.client.Fault as fault:
+                results.append({'faultCode': fault.faultCode, 'faultString': fault.faultString})
+        return results
+
+    def handle(self, request_body):
+        """
+        XML-RPC request in, XML-RPC response out
+        :param request_body: bytes
+        :return: bytes
+        """
+        try:
+            params, method = xmlrpc.client.loads(request_body)
+            if method == 'multiCall':
+                result = self.multi_call(params[0] if params else [])
+            else:
+                result = self.call(method, params)
+            response = xmlrpc.client.dumps((result,), methodresponse=True, allow_none=True)
+        except xmlrpc.client.Fault as fault:
+            response = xmlrpc.client.dumps(fault, allow_none=True)
+        return response.encode('utf-8')
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Local HTTP server standing in for every platform
+        - recorded fixtures (see ResponseRecorder) are served regardless of host
+        - POSTs to /kojihub are answered by a FakeKojiHub
+        - latency_ms delays every response, error_rate fails a share of them
+    """
+
+    daemon_threads = True
+
+    def __init__(self, server_address, fixtures_dir, latency_ms=0, error_rate=0.0,
+                 error_status=503, seed=None):
+        super(StandInServer, self).__init__(server_address, StandInRequestHandler)
+        self.recorder = ResponseRecorder(fixtures_dir=fixtures_dir, mode='')
+        self.koji_hub = FakeKojiHub(os.path.join(fixtures_dir, KOJI_FIXTURE))
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.resource_patterns = [
+            (re.compile('^' + re.sub(r'\\\{[^}]+\\\}', '[^/]+', re.escape(config.resource)) + '$'),
+             service, resource)
+            for (service, resource), config in ServiceConfig.registry.items()
+        ]
+
+    def match_resource(self, path):
+        """(service, resource) configured for the path, if any"""
+        for pattern, service, resource in self.resource_patterns:
+            if pattern.match(path):
+                return service, resource
+        return None
+
+    def inject_error(self):
+        return self.error_rate and self.random.random() < self.error_rate
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # keep benchmark output clean
+        pass
+
+    def _send(self, status_code, body, headers=None):
+        self.send_response(status_code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _send_json(self, status_code, json_body):
+        self._send(status_code, json.dumps(json_body).encode('utf-8'),
+                   {'Content-Type': 'application/json'})
+
+    def _handle(self):
+        request_body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000.0)
+        if self.server.inject_error():
+            self._send_json(self.server.error_status, {'detail': 'Injected error'})
+            return
+        path = self.path.split('?')[0]
+        if path.rstrip('/') == KOJI_HUB_PATH and self.command == 'POST':
+            self._send(200, self.server.koji_hub.handle(request_body), {'Content-Type': 'text/xml'})
+            return
+        fixture = self.server.recorder.find(self.command, self.path)
+        if fixture:
+            self._send(fixture['status_code'], self.server.recorder.fixture_body(fixture),
+                       fixture.get('headers'))
+            return
+        service_resource = self.server.match_resource(path)
+        self._send_json(404, {'detail': 'No fixture recorded for %s %s%s' % (
+            self.command, self.path,
+            ' (%s %s)' % service_resource if service_resource else ''
+        )})
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _handle
@@ -18,12 +18,14 @@
 from django.conf.urls import url
 from dashboard.services.expose.views import (
     PingServer, PackageStatus, GraphRuleCoverage, ReleaseStatus, ReleaseStatusDetail,
-    PackageExist, ReleaseStatusLocale, RunJob, JobLog, PackageHealth, AddPackage
+    PackageExist, ReleaseStatusLocale, RunJob, JobLog, JobStatus, CancelJob, PackageHealth, AddPackage,
+    ServicesHealth
 )
 
 
 api_urls = [
     url(r'^ping$', PingServer.as_view(), name='api_ping_server'),
+    url(r'^services/health$', ServicesHealth.as_view(), name='api_services_health'),
     url(r'^package/(?P<package_name>[\w-]+)/exist$', PackageExist.as_view(), name='api_package_exist'),
     url(r'^package/(?P<package_name>[\w-]+)/health', PackageHealth.as_view(), name='api_package_health'),
     url(r'^package/create$', AddPackage.as_view(), name='api_package_new'),
@@ -37,4 +39,6 @@ api_urls = [
         ReleaseStatusLocale.as_view(), name='api_release_status_locale'),
     url(r'^job/run$', RunJob.as_view(), name='api_job_run'),
     url(r'^job/(?P<job_id>[0-9a-f-]+)/log$', JobLog.as_view(), name='api_job_log'),
+    url(r'^job/(?P<job_id>[0-9a-f-]+)/status$', JobStatus.as_view(), name='api_job_status'),
+    url(r'^job/(?P<job_id>[0-9a-f-]+)/cancel$', CancelJob.as_view(), name='api_job_cancel'),
 ]
@@ -37,11 +37,13 @@ from dashboard.constants import (
     TS_JOB_TYPES, BRANCH_MAPPING_KEYS, WEBLATE_SLUGS, SYS_EMAIL_ADDR
 )
 from dashboard.managers.packages import PackagesManager
-from dashboard.managers.jobs import JobTemplateManager, YMLBasedJobManager
+from dashboard.managers.jobs import JobManager, JobTemplateManager, YMLBasedJobManager
 from dashboard.managers.graphs import (
     GraphManager, ReportsManager, GeoLocationManager
 )
 from dashboard.managers.pipelines import CIPipelineManager
+from dashboard.services.consume.cache import CacheAPIManager
+from dashboard.services.consume.warmup import CacheWarmer
 
 
 logger = get_task_logger(__name__)
@@ -57,8 +59,11 @@ def task_sync_packages_with_platform():
     reports_manager = ReportsManager()
     pipeline_manager = CIPipelineManager()
 
+    # platform documents fetched in this run, shared by its packages
+    stats_index = {}
+
     def _sync_package(pkg):
-        package_manager.sync_update_package_stats(pkg)
+        package_manager.sync_update_package_stats(pkg, stats_index=stats_index)
         package_manager.fetch_latest_builds(pkg)
         pipeline_manager.refresh_pkg_pipelines(pkg)
 
@@ -86,7 +91,6 @@ def task_sync_packages_with_platform():
         )
         th.start()
         th.join()
-        time.sleep(randrange(5, 10))
 
     logger.info("%s Packages sync'd with Translation Platform" % len(all_packages))
     if reports_manager.analyse_releases_status():
@@ -95,6 +99,27 @@ def task_sync_packages_with_platform():
         logger.info("Packages Summary Updated")
 
 
+def _post_fedora_messaging(package_name, build_sys, build_tag, job_uuid):
+    """Post to fedora messaging system."""
+    server_domain = "http://localhost:8080"
+    if os.environ.get("DEPLOY_ENV") == "prod":
+        server_domain = "https://transtats.fedoraproject.org"
+    elif os.environ.get("DEPLOY_ENV") == "staging":
+        server_domain = "https://transtats.stg.fedoraproject.org"
+
+    fedmsg_config.conf.load_config("deploy/docker/conf/transtats.toml")
+    job_url = f"{server_domain}{reverse('log-detail', args=[job_uuid])}"
+    api_url = f"{server_domain}{reverse('api_job_log', args=[job_uuid])}"
+    topic_msg = fedmsg_msg.Message(
+        topic=u'org.fedoraproject.transtats.build_system.sync_job_run',
+        headers={u'package': package_name,
+                 u'build_system': build_sys,
+                 u'build_tag': build_tag},
+        body={u'url': job_url, u'api_url': api_url}
+    )
+    fedmsg_api.publish(topic_msg)
+
+
 @shared_task()
 def task_sync_packages_with_build_system():
     """sync all packages with build system"""
@@ -120,26 +145,6 @@ def task_sync_packages_with_build_system():
             # pass for now
             pass
 
-    def _post_fedora_messaging(package_name, build_sys, build_tag, job_uuid):
-        """Post to fedora messaging system."""
-        server_domain = "http://localhost:8080"
-        if os.environ.get("DEPLOY_ENV") == "prod":
-            server_domain = "https://transtats.fedoraproject.org"
-        elif os.environ.get("DEPLOY_ENV") == "staging":
-            server_domain = "https://transtats.stg.fedoraproject.org"
-
-        fedmsg_config.conf.load_config("deploy/docker/conf/transtats.toml")
-        job_url = f"{server_domain}{reverse('log-detail', args=[job_uuid])}"
-        api_url = f"{server_domain}{reverse('api_job_log', args=[job_uuid])}"
-        topic_msg = fedmsg_msg.Message(
-            topic=u'org.fedoraproject.transtats.build_system.sync_job_run',
-            headers={u'package': package_name,
-                     u'build_system': build_sys,
-                     u'build_tag': build_tag},
-            body={u'url': job_url, u'api_url': api_url}
-        )
-        fedmsg_api.publish(topic_msg)
-
     def _sync_build_system(template, params):
 
         if package_manager.is_package_build_latest(params):
@@ -170,8 +175,7 @@ def task_sync_packages_with_build_system():
                 **job_data, **{'params': [p.upper() for p in t_params],
                                'type': TS_JOB_TYPES[3]},
                 **{'active_user_email': SYS_EMAIL_ADDR},
-                **{'sandbox_path': temp_path},
-                **{'job_log_file': temp_path + '.log'}
+                **{'sandbox_path': temp_path}
             )
 
             try:
@@ -232,3 +236,42 @@ def task_sync_packages_with_build_system():
     time.sleep(5)
     if location_manager.save_territory_build_system_stats():
         logger.info("Territory Summary Updated")
+
+
+@shared_task()
+def task_purge_expired_api_cache():
+    """delete expired cached API responses"""
+
+    deleted = CacheAPIManager().purge_expired()
+    logger.info("%s expired API responses purged from cache" % deleted)
+
+
+@shared_task()
+def task_warm_api_cache():
+    """refresh hot cached API responses before they expire"""
+
+    # lookups counted by this worker process
+    CacheAPIManager.flush_access_counts()
+    refreshed = CacheWarmer().warm()
+    logger.info("%s hot API responses refreshed in cache" % refreshed)
+
+
+@shared_task()
+def task_run_yml_job(job_kwargs):
+    """run a queued YML job"""
+
+    job_manager = JobManager(job_kwargs.get('type'), job_kwargs.get('job_uuid'))
+    if job_manager.is_cancelled():
+        logger.info("Job %s cancelled before it started" % job_manager.uuid)
+        return
+    try:
+        job_uuid, can_publish = YMLBasedJobManager(**job_kwargs).execute_job()
+    except Exception as e:
+        logger.error("Job %s failed: %s" % (job_manager.uuid, e))
+        # jobs failing before their tasks run are never closed otherwise
+        job_manager.mark_job_failed(remarks=str(e)[:200])
+    else:
+        # as a job run from the web page does
+        if settings.FAS_AUTH and job_uuid and can_publish:
+            _post_fedora_messaging(job_kwargs.get('PACKAGE_NAME'), job_kwargs.get('BUILD_SYSTEM') or 'koji',
+                                   job_kwargs.get('BUILD_TAG'), job_uuid)
@@ -17,6 +17,7 @@ import os
 import json
 import pytz
 import yaml
+from uuid import uuid4
 from datetime import datetime
 from collections import OrderedDict
 from django import template
@@ -358,6 +359,8 @@ def tag_packages_summary():
 )
 def tag_job_form(template_type):
     return_value = OrderedDict()
+    # the form follows the log of its job by it
+    return_value['job_uuid'] = uuid4()
     job_template_manager = JobTemplateManager()
     filter_kwargs = {}
     if template_type in TS_JOB_TYPES:
@@ -0,0 +1,149 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+import time
+import threading
+
+import yaml
+
+from django.conf import settings
+from fixture import DjangoFixture
+from fixture.style import NamedDataStyle
+from fixture.django_testcase import FixtureTestCase
+
+from dashboard.constants import TS_JOB_TYPES, TRANSPLATFORM_ENGINES
+from dashboard.managers.jobs import YMLBasedJobManager
+from dashboard.managers.packages import PackagesManager
+from dashboard.models import CacheAPI, Job, Package, Platform, Product, SyncStats
+from dashboard.services.consume.cache import CacheAPIManager
+from dashboard.services.consume.replay import response_recorder
+from dashboard.services.resources import KojiResources, koji_session_pool
+from dashboard.services.standin import StandInServer
+from dashboard.tests.testdata.db_fixtures import (
+    LanguageData, LanguageSetData, ProductData, ReleaseData, PackageData, JobTemplateData
+)
+
+db_fixture = DjangoFixture(style=NamedDataStyle())
+
+
+class StandInBenchmarkTest(FixtureTestCase):
+    """
+    Sync paths timed against the stand-in serving the recorded fixtures
+        - every round starts with empty response caches
+        - a path slower than settings.STANDIN_BENCHMARK MAX_SECONDS fails
+    """
+
+    fixture = db_fixture
+    datasets = [LanguageData, LanguageSetData, ProductData, ReleaseData, PackageData, JobTemplateData]
+
+    package_name = PackageData.package_anaconda.package_name
+    build_tag = 'f37'
+
+    @classmethod
+    def setUpClass(cls):
+        super(StandInBenchmarkTest, cls).setUpClass()
+        cls.benchmark = settings.STANDIN_BENCHMARK
+        cls.server = StandInServer(('127.0.0.1', 0), response_recorder.fixtures_dir,
+                                   latency_ms=cls.benchmark['LATENCY_MS'])
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.server_url = 'http://127.0.0.1:%s' % cls.server.server_address[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super(StandInBenchmarkTest, cls).tearDownClass()
+        # pages fetched on worker threads commit their rows outside the test transaction
+        CacheAPI.objects.all().delete()
+
+    def setUp(self):
+        platform = Platform.objects.create(
+            engine_name=TRANSPLATFORM_ENGINES[3], subject='fedora', api_url=self.server_url,
+            platform_slug='WLTEFED', server_status=True, auth_token_key='token'
+        )
+        Package.objects.filter(package_name=self.package_name).update(
+            platform_slug=platform, package_details_json_str=json.dumps({
+                'slug': self.package_name, 'components': [{'slug': 'master'}, {'slug': 'f37'}]
+            })
+        )
+        Product.objects.filter(product_slug=ProductData.product_fedora.product_slug).update(
+            product_server=self.server_url + '/kojihub', product_build_system='koji'
+        )
+        self.packages_manager = PackagesManager()
+
+    def tearDown(self):
+        self._empty_caches()
+        koji_session_pool.close_all()
+
+    @staticmethod
+    def _empty_caches():
+        CacheAPI.objects.all().delete()
+        CacheAPIManager.memory_cache.clear()
+        KojiResources.latest_builds_snapshots.clear()
+
+    def _time(self, path, run):
+        """Seconds a run of the path takes, on average over ROUNDS"""
+        elapsed = 0.0
+        for _ in range(self.benchmark['ROUNDS']):
+            self._empty_caches()
+            started = time.perf_counter()
+            run()
+            elapsed += time.perf_counter() - started
+        seconds = elapsed / self.benchmark['ROUNDS']
+        self.assertLessEqual(seconds, self.benchmark['MAX_SECONDS'][path],
+                             '%s took %.3fs against the stand-in' % (path, seconds))
+        return seconds
+
+    def test_sync_update_package_stats(self):
+        """Benchmark a Weblate stats sync, two components of three stats pages each"""
+        self._time('sync_update_package_stats', lambda: self.assertTrue(
+            self.packages_manager.sync_update_package_stats(self.package_name)))
+        synced_stats = SyncStats.objects.filter(package_name__package_name=self.package_name)
+        self.assertSetEqual({stats.project_version for stats in synced_stats}, {'master', 'f37'})
+        self.assertEqual(len(synced_stats.get(project_version='master').stats_raw_json['stats']), 6)
+
+    def test_fetch_latest_builds(self):
+        """Benchmark latest builds of a package, with their tags in one hub round trip"""
+        self._time('fetch_latest_builds', lambda: self.assertTrue(
+            self.packages_manager.fetch_latest_builds(self.package_name)))
+        latest_builds = Package.objects.get(package_name=self.package_name).package_latest_builds_json
+        builds = list(latest_builds.values())[0]
+        self.assertEqual(len(builds), PackagesManager.LATEST_BUILD_COUNT)
+        self.assertListEqual(builds[0]['build_tags'], ['f37', 'f37-updates-candidate'])
+
+    def test_yml_job(self):
+        """Benchmark a syncdownstream YML job, fetching the latest build of a tag"""
+        # as the job form sends it
+        yml_file = yaml.dump(json.loads(JobTemplateData.template_syncdownstream.job_template_json_str),
+                             default_flow_style=False).replace("\'", "")
+
+        def run():
+            job_manager = YMLBasedJobManager(**{
+                'PACKAGE_NAME': self.package_name, 'BUILD_SYSTEM': 'koji', 'BUILD_TAG': self.build_tag,
+                'YML_FILE': yml_file, 'DRY_RUN': True,
+                'params': ['PACKAGE_NAME', 'BUILD_SYSTEM', 'BUILD_TAG'],
+                'type': TS_JOB_TYPES[3], 'active_user_email': 'testuser@transtats.org'
+            })
+            job_uuid, _ = job_manager.execute_job()
+            job_uuids.append(job_uuid)
+
+        job_uuids = []
+        self._time('yml_job', run)
+        jobs = Job.objects.filter(job_uuid__in=job_uuids)
+        self.assertEqual(len(jobs), self.benchmark['ROUNDS'])
+        for job in jobs:
+            self.assertTrue(job.job_result)
+            self.assertIn('anaconda-37.11-1.fc37', job.job_log_json_str)
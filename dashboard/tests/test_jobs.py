@@ -13,16 +13,43 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import io
+import os
+import time
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from tempfile import TemporaryDirectory
+from uuid import uuid4
+
+import billiard
 from mock import patch
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
 from fixture import DjangoFixture
 from fixture.style import NamedDataStyle
 from fixture.django_testcase import FixtureTestCase
 
-from dashboard.constants import TS_JOB_TYPES
-from dashboard.managers.jobs import JobTemplateManager
+from dashboard.constants import TS_JOB_TYPES, JOB_STATUSES
+from dashboard.jobs_framework.action_mapper import ActionMapper
+from dashboard.jobs_framework.artifacts import ArtifactCache
+from dashboard.jobs_framework.cmds.apply import Apply
+from dashboard.jobs_framework.cmds import calculate
+from dashboard.jobs_framework.cmds.download import Download
+from dashboard.jobs_framework.ds import TaskList
+from dashboard.jobs_framework.parser import YMLPreProcessor, YMLJobParser
+from dashboard.jobs_framework.sandbox import JobSandbox
+from dashboard.managers.jobs import (
+    JobManager, JobsLogManager, JobTemplateManager, YMLBasedJobManager
+)
 from dashboard.managers.pipelines import (
     CIPipelineManager, PipelineConfigManager
 )
+from dashboard.models import Job
+from dashboard.services.expose.views import CancelJob, JobStatus
+from dashboard.views import read_file_logs
 from dashboard.tests.testdata.db_fixtures import (
     JobTemplateData, CIPipelineData, PipelineConfigData
 )
@@ -76,3 +103,427 @@ class PipelineConfigManagerTest(FixtureTestCase):
         self.assertEquals(pipeline_configs[0].pipeline_config_event, 'Push Translations')
         self.assertEqual(len(pipeline_configs[0].pipeline_config_repo_branches), 1, "one branch")
         self.assertEquals(pipeline_configs[0].pipeline_config_created_by, 'testuser@transtats.org')
+
+
+class ActionMapperTest(SimpleTestCase):
+
+    yml_file = 'dashboard/tests/testdata/job-templates/pulltransmerge_parallel.yml'
+
+    def _action_mapper(self):
+        tasks = TaskList()
+        with open(self.yml_file) as yml_file:
+            yml_preprocessed = YMLPreProcessor(yml_file.read(), **{
+                'PACKAGE_NAME': 'anaconda', 'REPO_TYPE': 'default', 'REPO_BRANCH': 'master'
+            }).output
+        for task in YMLJobParser(yml_stream=io.StringIO(yml_preprocessed)).tasks:
+            tasks.add_task(task)
+        action_mapper = ActionMapper(tasks, *[''] * 27)
+        action_mapper.set_actions()
+        return action_mapper
+
+    def test_task_graph(self):
+        """Test _task_graph"""
+        task_graph = self._action_mapper()._task_graph()
+        clone, download, copy, pullrequest = list(task_graph)
+        self.assertListEqual(task_graph[clone], [])
+        self.assertListEqual(task_graph[download], [])
+        self.assertListEqual(task_graph[copy], [clone, download])
+        self.assertListEqual(task_graph[pullrequest], [copy])
+        self.assertNotIn('needs', copy.kwargs)
+        self.assertNotIn('id', clone.kwargs)
+
+    def test_execute_task_graph(self):
+        """Test execute_tasks in parallel"""
+        action_mapper = self._action_mapper()
+        outputs = {
+            'git_repository': {'src_tar_dir': 'repo'},
+            'pull_translations': {'download_dir': 'downloads'},
+        }
+
+        def _run_task(node):
+            return dict(outputs.get(node.get_method(), {}), ran=node.get_method()), {}
+
+        with patch.object(action_mapper, '_run_task', side_effect=_run_task):
+            action_mapper.execute_tasks(parallel=True)
+        clone, download, copy, pullrequest = list(action_mapper._task_graph())
+        self.assertEqual(copy.input['src_tar_dir'], 'repo')
+        self.assertEqual(copy.input['download_dir'], 'downloads')
+        self.assertEqual(pullrequest.input['ran'], 'downloaded_files')
+        self.assertTrue(action_mapper.status)
+
+
+class JobSandboxTest(SimpleTestCase):
+
+    yml_file = ActionMapperTest.yml_file
+    _action_mapper = ActionMapperTest._action_mapper
+
+    def setUp(self):
+        self.root_dir = TemporaryDirectory()
+        self.settings_override = override_settings(JOB_SANDBOX={
+            'ROOT': self.root_dir.name, 'MAX_BYTES': 1024, 'MAX_AGE_HOURS': 24})
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.root_dir.cleanup()
+
+    def test_directory_per_job(self):
+        """Test each job gets an empty directory of its own, removed on exit"""
+        job_uuid = uuid4()
+        with JobSandbox(job_uuid) as job_sandbox, JobSandbox(uuid4()) as other_sandbox:
+            self.assertEqual(job_sandbox.path, os.path.join(self.root_dir.name, str(job_uuid), ''))
+            self.assertNotEqual(job_sandbox.path, other_sandbox.path)
+            self.assertListEqual(os.listdir(job_sandbox.path), [])
+            with open(job_sandbox.path + 'pkg.src.rpm', 'w') as srpm_file:
+                srpm_file.write('srpm')
+            # a rerun starts empty
+            job_sandbox.create()
+            self.assertListEqual(os.listdir(job_sandbox.path), [])
+        self.assertListEqual(os.listdir(self.root_dir.name), [])
+
+    def test_removed_on_failure(self):
+        """Test the sandbox is removed when a task of the job fails"""
+        action_mapper = self._action_mapper()
+        action_mapper.sandbox = JobSandbox(uuid4())
+        action_mapper.sandbox.create()
+
+        def _run_task(node):
+            with open(action_mapper.sandbox_path + 'repo.tar', 'w') as tar_file:
+                tar_file.write('tar')
+            raise Exception('Cloning failed.')
+
+        with patch.object(action_mapper, '_run_task', side_effect=_run_task), \
+                self.assertRaises(Exception):
+            action_mapper.execute_tasks(parallel=True)
+        self.assertTrue(os.listdir(action_mapper.sandbox_path))
+        action_mapper.clean_workspace()
+        self.assertFalse(os.path.exists(action_mapper.sandbox_path))
+
+        with self.assertRaises(ValueError), JobSandbox(uuid4()) as job_sandbox:
+            raise ValueError()
+        self.assertFalse(os.path.exists(job_sandbox.path))
+
+    def test_log_per_job(self):
+        """Test the job log lives in the sandbox, and is read back by job UUID"""
+        request_factory = RequestFactory()
+        job_uuid = uuid4()
+        with JobSandbox(job_uuid) as job_sandbox, JobSandbox(uuid4()) as other_sandbox:
+            self.assertTrue(job_sandbox.log_file.startswith(job_sandbox.path))
+            self.assertNotEqual(job_sandbox.log_file, other_sandbox.log_file)
+            with open(job_sandbox.log_file, 'w') as log_file:
+                log_file.write('<b>Clone Repository</b>\nDone\n')
+            for job_id, log in ((job_uuid, '<b>Clone Repository</b><br/>Done'),
+                                (other_sandbox.job_id, ''), ('../../etc', '')):
+                request = request_factory.post('/read-file-logs', {'JOB_UUID': job_id},
+                                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+                self.assertEqual(read_file_logs(request).content.decode(), log)
+
+    def test_quota_and_stale_sandboxes(self):
+        """Test disk quota, and purge of sandboxes left over by crashed runs"""
+        stale_path = os.path.join(self.root_dir.name, 'crashed-job')
+        os.makedirs(stale_path)
+        os.utime(stale_path, (time.time() - 25 * 3600,) * 2)
+        with JobSandbox(uuid4()) as job_sandbox:
+            self.assertFalse(os.path.exists(stale_path))
+            with open(job_sandbox.path + 'big.tar', 'wb') as tar_file:
+                tar_file.write(b'0' * 2048)
+            with self.assertRaisesRegex(Exception, 'disk quota'):
+                job_sandbox.check_quota()
+
+
+class DownloadTest(SimpleTestCase):
+
+    srpm_content = os.urandom(256 * 1024)
+
+    class _Handler(BaseHTTPRequestHandler):
+        # drops the connection half way through the first full response
+        drop_connection = True
+        ranges = []
+
+        def do_GET(self):
+            content = DownloadTest.srpm_content
+            if not self.path.endswith('.src.rpm'):
+                self.send_error(404)
+                return
+            start = int(self.headers.get('Range', 'bytes=0-')[len('bytes='):].rstrip('-'))
+            self.ranges.append(start)
+            self.send_response(206 if start else 200)
+            self.send_header('Content-Length', str(len(content) - start))
+            self.end_headers()
+            if not start and self.drop_connection:
+                self.__class__.drop_connection = False
+                self.wfile.write(content[:len(content) // 2])
+                self.wfile.flush()
+                self.close_connection = True
+                return
+            self.wfile.write(content[start:])
+
+        def log_message(self, *args):
+            pass
+
+    def setUp(self):
+        self._Handler.drop_connection, self._Handler.ranges = True, []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = 'http://127.0.0.1:%s/' % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_download_resumes_with_checksum(self):
+        """Test _download_file resumes an interrupted download"""
+        with TemporaryDirectory() as sandbox_dir:
+            download = Download(sandbox_path=os.path.join(sandbox_dir, ''))
+            file_path = download._download_file(
+                self.base_url + 'pkg-1.0-1.src.rpm', checksum='sha256', chunk_size=4096
+            )
+            self.assertEqual(file_path, os.path.join(sandbox_dir, 'pkg-1.0-1.src.rpm'))
+            with open(file_path, 'rb') as srpm_file:
+                self.assertEqual(srpm_file.read(), self.srpm_content)
+            self.assertEqual(self._Handler.ranges[0], 0)
+            self.assertGreater(self._Handler.ranges[-1], 0)
+            self.assertEqual(download.checksums[file_path],
+                             hashlib.sha256(self.srpm_content).hexdigest())
+            self.assertFalse(os.path.exists(file_path + '.part'))
+
+    def test_download_not_found(self):
+        """Test _download_file on 404"""
+        with TemporaryDirectory() as sandbox_dir:
+            download = Download(sandbox_path=os.path.join(sandbox_dir, ''))
+            self.assertEqual(download._download_file(self.base_url + 'pkg.pot'), '404')
+
+
+class ArtifactCacheTest(SimpleTestCase):
+
+    def setUp(self):
+        self.cache_dir, self.sandbox_dir = TemporaryDirectory(), TemporaryDirectory()
+        self.settings_override = override_settings(
+            ARTIFACT_CACHE={'ROOT': self.cache_dir.name, 'MAX_BYTES': 3072})
+        self.settings_override.enable()
+        self.artifact_cache = ArtifactCache()
+        self.srpm_path = os.path.join(self.sandbox_dir.name, 'pkg-1.0-1.src.rpm')
+        with open(self.srpm_path, 'wb') as srpm_file:
+            srpm_file.write(b'srpm' * 512)
+        self.sha256 = hashlib.sha256(b'srpm' * 512).hexdigest()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.cache_dir.cleanup()
+        self.sandbox_dir.cleanup()
+
+    def test_file_keyed_by_source(self):
+        """Test SRPMs are looked up by their source, not their file name"""
+        build_source = 'https://koji.example.org/kojihub/build/7'
+        self.artifact_cache.put_file(build_source, self.srpm_path, self.sha256)
+        dest_path = os.path.join(self.sandbox_dir.name, 'copy', 'pkg-1.0-1.src.rpm')
+        os.makedirs(os.path.dirname(dest_path))
+        self.assertEqual(self.artifact_cache.get_file(build_source, dest_path), self.sha256)
+        with open(dest_path, 'rb') as srpm_file:
+            self.assertEqual(srpm_file.read(), b'srpm' * 512)
+        # same NVR, a scratch build or another hub
+        self.assertIsNone(self.artifact_cache.get_file(
+            'https://koji.example.org/kojihub/task/9', dest_path))
+        self.assertIsNone(self.artifact_cache.get_file(
+            'https://brew.example.org/brewhub/build/7', dest_path))
+
+    def test_tree_and_eviction(self):
+        """Test extracted trees are kept, and evicted beyond MAX_BYTES"""
+        source = 'https://koji.example.org/kojihub/build/7'
+        self.artifact_cache.put_file(source, self.srpm_path, self.sha256)
+        tree_dir = os.path.join(self.sandbox_dir.name, 'extract')
+        os.makedirs(os.path.join(tree_dir, 'pkg-1.0'))
+        with open(os.path.join(tree_dir, 'pkg-1.0', 'pkg.spec'), 'w') as spec_file:
+            spec_file.write('Name: pkg')
+        self.artifact_cache.put_tree(
+            self.sha256, 'pkg-1.0.tar.gz', os.path.join(tree_dir, 'pkg-1.0'), 'pkg-1.0')
+        dest_dir = os.path.join(self.sandbox_dir.name, 'dest')
+        self.assertEqual(self.artifact_cache.get_tree(self.sha256, 'pkg-1.0.tar.gz', dest_dir), 'pkg-1.0')
+        self.assertTrue(os.path.isfile(os.path.join(dest_dir, 'pkg-1.0', 'pkg.spec')))
+
+        with open(self.srpm_path, 'wb') as srpm_file:
+            srpm_file.write(b'x' * 2048)
+        newer_source, newer_sha256 = 'https://koji.example.org/kojihub/build/8', hashlib.sha256(b'x' * 2048).hexdigest()
+        self.artifact_cache.put_file(newer_source, self.srpm_path, newer_sha256)
+        self.assertIsNone(self.artifact_cache.lookup(source, 'pkg-1.0-1.src.rpm'))
+        self.assertEqual(self.artifact_cache.lookup(newer_source, 'pkg-1.0-1.src.rpm'), newer_sha256)
+
+    def test_eviction_reads_recorded_sizes(self):
+        """Test entries record their size, eviction does not walk the cache for it"""
+        self.artifact_cache.put_file('https://koji.example.org/kojihub/build/7', self.srpm_path, self.sha256)
+        tree_dir = os.path.join(self.sandbox_dir.name, 'extract')
+        os.makedirs(tree_dir)
+        with open(os.path.join(tree_dir, 'pkg.spec'), 'w') as spec_file:
+            spec_file.write('Name: pkg')
+        self.artifact_cache.put_tree(self.sha256, 'pkg-1.0.tar.gz', tree_dir)
+        entry_dir = self.artifact_cache._entry_dir(self.sha256)
+        self.assertEqual(self.artifact_cache._recorded_size(entry_dir), 2048 + len('Name: pkg'))
+
+        with patch.object(ArtifactCache, '_dir_size', wraps=ArtifactCache._dir_size) as dir_size:
+            with open(self.srpm_path, 'wb') as srpm_file:
+                srpm_file.write(b'y' * 512)
+            self.artifact_cache.put_file('https://koji.example.org/kojihub/build/8', self.srpm_path,
+                                         hashlib.sha256(b'y' * 512).hexdigest())
+            self.artifact_cache.evict()
+        # only the new entry, once
+        self.assertEqual(dir_size.call_count, 1)
+        self.assertEqual(self.artifact_cache.lookup('https://koji.example.org/kojihub/build/7',
+                                                    'pkg-1.0-1.src.rpm'), self.sha256)
+
+
+class ApplyTest(SimpleTestCase):
+
+    patches = {
+        # -p1, the usual git style
+        'hello.patch': 'a/src/hello.c',
+        # -p0
+        'readme.patch': 'README',
+        # -p2, made from a parent of the tree
+        'hello-h.patch': 'pkg-1.0.orig/pkg-1.0/src/hello.h',
+    }
+
+    def setUp(self):
+        self.extract_dir = TemporaryDirectory()
+        self.tree_dir = os.path.join(self.extract_dir.name, 'pkg-1.0')
+        os.makedirs(os.path.join(self.tree_dir, 'src'))
+        for file_path in ('src/hello.c', 'README', 'src/hello.h'):
+            with open(os.path.join(self.tree_dir, file_path), 'w') as tree_file:
+                tree_file.write('old\n')
+        for patch_name, patched_path in self.patches.items():
+            self._write_patch(patch_name, patched_path, patched_path)
+        self._write_patch('new.patch', '/dev/null', 'b/src/new.c', old_lines='')
+
+    def tearDown(self):
+        self.extract_dir.cleanup()
+
+    def _write_patch(self, patch_name, old_path, new_path, old_lines='-old\n'):
+        with open(os.path.join(self.extract_dir.name, patch_name), 'w') as patch_file:
+            patch_file.write('--- %s\t2020-01-01 00:00:00\n+++ %s\n@@ -%s +1 @@\n%s+new\n' % (
+                old_path, new_path, '0,0' if not old_lines else '1', old_lines))
+
+    def test_strip_level(self):
+        """Test _strip_level"""
+        apply = Apply()
+        for patch_name, strip_level in (('hello.patch', 1), ('readme.patch', 0),
+                                        ('hello-h.patch', 2), ('new.patch', 1)):
+            self.assertEqual(apply._strip_level(
+                os.path.join(self.extract_dir.name, patch_name), self.tree_dir), strip_level)
+
+    def test_patch(self):
+        """Test patches are applied in the tree"""
+        job_input = {
+            'src_tar_dir': self.tree_dir, 'extract_dir': self.extract_dir.name,
+            'spec_obj': SimpleNamespace(patches=[]), 'src_translations': [],
+            'log_f': os.path.join(self.extract_dir.name, 'job.log'),
+        }
+        Apply().patch(job_input, {})
+        for file_path in ('src/hello.c', 'README', 'src/hello.h', 'src/new.c'):
+            with open(os.path.join(self.tree_dir, file_path)) as tree_file:
+                self.assertEqual(tree_file.read(), 'new\n')
+        with open(job_input['log_f']) as log_file:
+            self.assertIn('4 patches applied', log_file.read())
+
+    def test_patch_failed(self):
+        """Test a patch already applied fails without prompting, and is not logged as applied"""
+        job_input = {
+            'src_tar_dir': self.tree_dir, 'extract_dir': self.extract_dir.name,
+            'spec_obj': SimpleNamespace(patches=[]), 'src_translations': [],
+            'log_f': os.path.join(self.extract_dir.name, 'job.log'),
+        }
+        with open(os.path.join(self.tree_dir, 'README'), 'w') as tree_file:
+            tree_file.write('new\n')
+        Apply().patch(job_input, {})
+        with open(job_input['log_f']) as log_file:
+            failed_log, applied_log = log_file.read().split('<b>Apply Patches</b>')[1:]
+        self.assertIn('1 patches failed to apply \n readme.patch', failed_log)
+        self.assertIn('3 patches applied', applied_log)
+        self.assertNotIn('readme.patch', applied_log)
+
+
+class JobQueueTest(TestCase):
+
+    def _enqueue(self):
+        job_manager = YMLBasedJobManager(**{
+            'PACKAGE_NAME': 'anaconda', 'YML_FILE': '', 'params': ['PACKAGE_NAME'],
+            'type': TS_JOB_TYPES[3], 'active_user_email': 'testuser@transtats.org'
+        })
+        with patch('dashboard.tasks.task_run_yml_job.delay') as delay:
+            delay.return_value.id = 'celery-task-id'
+            job_uuid = job_manager.enqueue_job()
+        self.assertEqual(delay.call_args[0][0]['job_uuid'], str(job_uuid))
+        return job_uuid
+
+    def _job_status(self, job_uuid):
+        request = APIRequestFactory().get('/api/job/%s/status' % job_uuid)
+        return JobStatus.as_view()(request, job_id=str(job_uuid))
+
+    def test_enqueue_and_start(self):
+        """Test a queued job is logged, and keeps its start time once running"""
+        job_uuid = self._enqueue()
+        job = Job.objects.get(job_uuid=job_uuid)
+        self.assertEqual(job.job_task_id, 'celery-task-id')
+        self.assertEqual(self._job_status(job_uuid).data['status'], JOB_STATUSES[0])
+
+        job_manager = JobManager(TS_JOB_TYPES[3], str(job_uuid))
+        self.assertTrue(job_manager.create_job(user_email='worker@transtats.org'))
+        job_started = Job.objects.get(job_uuid=job_uuid)
+        self.assertEqual(job_started.job_status, JOB_STATUSES[1])
+        self.assertEqual(job_started.job_start_time, job.job_start_time)
+        self.assertEqual(job_manager.start_time, job.job_start_time)
+
+    def test_cancel(self):
+        """Test a cancelled job is revoked and never starts"""
+        job_uuid = self._enqueue()
+        request = APIRequestFactory().post('/api/job/%s/cancel' % job_uuid)
+        force_authenticate(request, user=get_user_model().objects.create(username='testuser'))
+        with patch('dashboard.managers.jobs.current_app') as celery_app:
+            response = CancelJob.as_view()(request, job_id=str(job_uuid))
+        self.assertEqual(response.status_code, 200)
+        celery_app.control.revoke.assert_called_once_with('celery-task-id')
+        self.assertEqual(self._job_status(job_uuid).data['status'], JOB_STATUSES[4])
+
+        # the worker picks it up after all
+        self.assertFalse(JobManager(TS_JOB_TYPES[3], str(job_uuid)).create_job())
+        self.assertEqual(Job.objects.get(job_uuid=job_uuid).job_status, JOB_STATUSES[4])
+        self.assertFalse(JobsLogManager().cancel_job(job_uuid))
+        self.assertEqual(self._job_status(uuid4()).status_code, 404)
+
+
+class CalculateTest(SimpleTestCase):
+
+    def setUp(self):
+        self.po_dir = TemporaryDirectory()
+        self.po_files = []
+        for index in range(10):
+            po_file = os.path.join(self.po_dir.name, 'lang%s.po' % index)
+            with open(po_file, 'w') as po:
+                po.write('msgid ""\nmsgstr ""\n"Content-Type: text/plain; charset=UTF-8\\n"\n')
+                for msg_index in range(index + 2):
+                    po.write('\nmsgid "msg %s"\nmsgstr "%s"\n' % (msg_index, 'x' if msg_index <= index else ''))
+            self.po_files.append(po_file)
+        self.po_files.append(os.path.join(self.po_dir.name, 'missing.po'))
+
+    def tearDown(self):
+        self.po_dir.cleanup()
+
+    def _pooled_stats(self, queue=None):
+        with patch('os.cpu_count', return_value=4), \
+                patch.object(calculate, 'Pool', wraps=calculate.Pool) as pool:
+            po_files_stats = calculate.Calculate()._po_files_stats(self.po_files)
+        if queue:
+            queue.put((pool.called, po_files_stats))
+        return pool.called, po_files_stats
+
+    def test_pooled_stats_match_serial(self):
+        """Test _po_files_stats in a process pool equals parsing serially"""
+        serial_stats = [calculate.po_file_stats(po_file) for po_file in self.po_files]
+        self.assertEqual(serial_stats[0], ((1, 1, 0), None))
+        self.assertIsNotNone(serial_stats[-1][1])
+        self.assertEqual(self._pooled_stats(), (True, serial_stats))
+
+        # as in a celery prefork worker
+        queue = billiard.Queue()
+        worker = billiard.Process(target=self._pooled_stats, args=(queue,), daemon=True)
+        worker.start()
+        self.assertEqual(queue.get(timeout=60), (True, serial_stats))
+        worker.join()
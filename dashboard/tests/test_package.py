@@ -57,7 +57,7 @@ class PackagesManagerTest(FixtureTestCase):
         self.assertTrue(self.packages_manager.is_package_exist(PackageData.package_anaconda.package_name))
         self.assertFalse(self.packages_manager.is_package_exist('otherpackage'))
 
-    @patch('requests.request', new=mock_requests_get_add_package)
+    @patch('requests.Session.request', new=mock_requests_get_add_package)
     def test_add_package(self):
         """Test add_package"""
         transplatform = PlatformData.platform_zanata_fedora.platform_slug
@@ -80,7 +80,7 @@ class PackagesManagerTest(FixtureTestCase):
         self.assertEqual(len(tuples), 4)
         self.assertEquals(tuples[0], ('anaconda', 'anaconda'))
 
-    @patch('requests.request', new=mock_requests_get_validate_package)
+    @patch('requests.Session.request', new=mock_requests_get_validate_package)
     def xtest_validate_package(self):
         """Test validate_package"""
         transplatform = PlatformData.platform_zanata_public.platform_slug
@@ -110,7 +110,7 @@ class PackagesManagerTest(FixtureTestCase):
         self.assertEquals(package_releases[0].product_slug.product_name, 'Fedora')
         self.assertEquals(package_releases[0].language_set_slug.lang_set_name, 'F27 Set')
 
-    @patch('requests.request', new=mock_requests_get_git_branches)
+    @patch('requests.Session.request', new=mock_requests_get_git_branches)
     def xtest_git_branches(self):
         """Test git_branches"""
         scm_branch = self.packages_manager.git_branches(
@@ -0,0 +1,902 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import json
+import time
+import zlib
+import asyncio
+import http.client
+import threading
+import xmlrpc.client
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from time import sleep
+from urllib.parse import parse_qsl
+
+import koji
+import requests
+from celery.signals import worker_process_shutdown
+from mock import Mock, patch
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from dashboard.constants import GIT_PLATFORMS, TRANSPLATFORM_ENGINES
+from dashboard.jobs_framework.cmds.get import Get
+from dashboard.models import CacheAPI, Platform
+from dashboard.services.consume.cache import CacheAPIManager, LRUResponseCache
+from dashboard.services.consume.ratelimit import RateLimiter, RateLimiterRegistry
+from dashboard.services.consume.replay import ResponseRecorder
+from dashboard.services.consume.retry import CircuitBreaker, RetryPolicy, retry_policy
+from dashboard.services.consume.restclient import (
+    LazyResponseDict, RestClient, RestHandle, ServiceConfig, SingleFlight
+)
+from dashboard.services.consume.sessions import SessionRegistry
+from dashboard.services.resources import (
+    AsyncAPIResources, GitPlatformResources, KojiResources, KojiSessionPool, ResourcesBase,
+    TransplatformResources, koji_session_pool
+)
+from dashboard.services.standin import StandInServer
+
+
+class SessionRegistryTest(SimpleTestCase):
+
+    def test_shared_session_keeps_no_cookies(self):
+        url = 'https://translate.example.org/api/'
+        session = SessionRegistry().get(url)
+        response_headers = http.client.HTTPMessage()
+        response_headers['Set-Cookie'] = 'sessionid=user-a; Path=/'
+        session.cookies.extract_cookies(
+            requests.cookies.MockResponse(response_headers),
+            requests.cookies.MockRequest(requests.Request('GET', url).prepare())
+        )
+        self.assertEqual(len(session.cookies), 0)
+
+
+class LRUResponseCacheTest(SimpleTestCase):
+
+    def test_lru_eviction(self):
+        """Test size bounded eviction and counters"""
+        lru_cache = LRUResponseCache(max_entries=2, ttl_sec=60)
+        lru_cache.set('a', 1)
+        lru_cache.set('b', 2)
+        self.assertEqual(lru_cache.get('a'), 1)
+        lru_cache.set('c', 3)
+        self.assertIsNone(lru_cache.get('b'))
+        self.assertEqual(lru_cache.get('c'), 3)
+        stats = lru_cache.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['evictions'], 1)
+
+    def test_lru_expiry(self):
+        """Test ttl bounded entries"""
+        lru_cache = LRUResponseCache(max_entries=2, ttl_sec=60)
+        lru_cache.set('a', 1, ttl_sec=0)
+        self.assertIsNone(lru_cache.get('a'))
+
+    def test_lru_byte_budget(self):
+        """Test entries are evicted by bytes of their content, an oversized one is not kept"""
+        lru_cache = LRUResponseCache(max_entries=10, max_bytes=100, ttl_sec=60)
+        lru_cache.set('a', ('a' * 40, {}, None))
+        lru_cache.set('b', ('b' * 40, {}, None))
+        lru_cache.set('a', ('a' * 30, {}, None))
+        self.assertEqual(lru_cache.stats()['bytes'], 70)
+        lru_cache.set('c', ('c' * 50, {}, None))
+        self.assertIsNone(lru_cache.get('b'))
+        self.assertEqual(lru_cache.get('a')[0], 'a' * 30)
+        self.assertEqual(lru_cache.stats()['bytes'], 80)
+        lru_cache.set('d', ('d' * 101, {}, None))
+        self.assertIsNone(lru_cache.get('d'))
+        self.assertEqual(lru_cache.stats()['entries'], 2)
+        lru_cache.clear()
+        self.assertEqual(lru_cache.stats()['bytes'], 0)
+
+    def test_limits_from_settings(self):
+        """Test settings.API_MEMORY_CACHE overrides class defaults, arguments override both"""
+        with override_settings(API_MEMORY_CACHE={'MAX_ENTRIES': 1, 'MAX_BYTES': 10, 'TTL_SEC': 5}):
+            lru_cache = LRUResponseCache(max_bytes=20)
+            self.assertTupleEqual((lru_cache.max_entries, lru_cache.max_bytes, lru_cache.ttl_sec), (1, 20, 5))
+            lru_cache.set('a', 'a' * 15, ttl_sec=60)
+            self.assertLessEqual(lru_cache._entries['a'][0] - time.monotonic(), 5)
+            lru_cache.set('b', 'b')
+            self.assertIsNone(lru_cache.get('a'))
+        self.assertEqual(lru_cache.max_entries, LRUResponseCache.MAX_ENTRIES)
+
+
+class CacheAPIManagerTest(SimpleTestCase):
+
+    def test_access_counts_flushed_off_lookup_path(self):
+        """Test lookups are counted in memory, and written by flush_access_counts"""
+        cache_key = ('https://translate.example.org', '/api/projects/')
+        with patch('dashboard.services.consume.cache.CacheAPI') as cache_api:
+            CacheAPIManager.access_counts.clear()
+            for _ in range(2):
+                CacheAPIManager()._record_access(*cache_key)
+            self.assertEqual(CacheAPIManager.access_counts[cache_key], 2)
+            cache_api.objects.filter.assert_not_called()
+            CacheAPIManager.flush_access_counts()
+            cache_api.objects.filter.assert_called_once_with(base_url=cache_key[0], resource=cache_key[1])
+            self.assertFalse(CacheAPIManager.access_counts)
+
+    def test_access_counts_flushed_on_exit(self):
+        """Test counts left in memory are written when the process or the pool worker exits"""
+        cache_key = ('https://translate.example.org', '/api/components/')
+        with patch('dashboard.services.consume.cache.CacheAPI') as cache_api, \
+                patch('dashboard.services.consume.cache.atexit.register') as atexit_register, \
+                patch.object(CacheAPIManager, 'access_flusher_pid', [None]), \
+                patch('dashboard.services.consume.cache.threading.Thread'):
+            CacheAPIManager.access_counts.clear()
+            CacheAPIManager()._record_access(*cache_key)
+            CacheAPIManager()._record_access(*cache_key)
+            atexit_register.assert_called_once_with(CacheAPIManager.flush_access_counts)
+            cache_api.objects.filter.assert_not_called()
+            worker_process_shutdown.send(sender=None, pid=os.getpid(), exitcode=0)
+            cache_api.objects.filter.assert_called_once_with(base_url=cache_key[0], resource=cache_key[1])
+            self.assertFalse(CacheAPIManager.access_counts)
+
+
+class CacheAPIStorageTest(TestCase):
+
+    base_url = 'https://translate.example.org'
+
+    def setUp(self):
+        CacheAPIManager.memory_cache.clear()
+
+    def tearDown(self):
+        CacheAPIManager.memory_cache.clear()
+
+    def test_compressed_round_trip(self):
+        """Test a response is stored once, zlib compressed, and read back as saved"""
+        content = json.dumps({'results': [{'name': 'project-%s' % index} for index in range(200)]})
+        CacheAPIManager().save_api_response(self.base_url, '/api/projects/', content.encode('utf-8'),
+                                            json.loads(content), service='weblate')
+        cache = CacheAPI.objects.get(resource='/api/projects/')
+        self.assertEqual(zlib.decompress(bytes(cache.response_content_gz)), content.encode('utf-8'))
+        self.assertLess(len(cache.response_content_gz), len(content))
+        self.assertEqual(cache.response_content_json, json.loads(content))
+        CacheAPIManager.memory_cache.clear()
+        self.assertTupleEqual(CacheAPIManager().get_cached_response(self.base_url, '/api/projects/')[:2],
+                              (content.encode('utf-8'), json.loads(content)))
+        CacheAPIManager().save_api_response(self.base_url, '/api/projects/', b'{}', {}, service='weblate')
+        self.assertEqual(CacheAPI.objects.filter(resource='/api/projects/').count(), 1)
+        self.assertEqual(CacheAPI(response_content_gz=None).response_content, b'')
+
+    def test_purge_expired(self):
+        """Test only expired rows go, those with validators after STALE_KEEP_DAYS"""
+        now = timezone.now()
+        rows = {
+            '/fresh/': (now + timedelta(minutes=5), None),
+            '/expired/': (now - timedelta(minutes=5), None),
+            '/expired-with-etag/': (now - timedelta(minutes=5), '"v1"'),
+            '/stale-with-etag/': (now - timedelta(days=CacheAPIManager.STALE_KEEP_DAYS + 1), '"v1"'),
+        }
+        for resource, (expiry, etag) in rows.items():
+            CacheAPI.objects.create(base_url=self.base_url, resource=resource, request_kwargs='{}',
+                                    response_content_gz=CacheAPI.compress(b'{}'),
+                                    response_etag=etag, expiry=expiry)
+        self.assertEqual(CacheAPIManager().purge_expired(), 2)
+        self.assertListEqual(sorted(CacheAPI.objects.values_list('resource', flat=True)),
+                             ['/expired-with-etag/', '/fresh/'])
+
+
+class AuthTokenTest(TestCase):
+
+    api_url = 'https://cloud.memsource.example.org/web'
+
+    def setUp(self):
+        Platform.objects.create(
+            engine_name=TRANSPLATFORM_ENGINES[4], api_url=self.api_url, platform_slug='MSRCTEST',
+            server_status=True, auth_login_id='ts-user', auth_token_key='secret'
+        )
+        CacheAPIManager.auth_tokens.pop(self.api_url, None)
+        self.posted = []
+
+    def tearDown(self):
+        CacheAPIManager.auth_tokens.pop(self.api_url, None)
+
+    def _post(self, url, **kwargs):
+        self.posted.append(url)
+        return _json_response(url, {
+            'token': 'token-%s' % len(self.posted), 'user': {'userName': 'ts-user'},
+            'expires': (timezone.now() + timedelta(hours=1)).isoformat(),
+        })
+
+    def _tally_auth_token(self, now=None):
+        with patch('dashboard.services.consume.cache.session_registry.get') as get_session, \
+                patch('dashboard.services.consume.cache.timezone.now', return_value=now or timezone.now()):
+            get_session.return_value.post.side_effect = self._post
+            return CacheAPIManager().tally_auth_token(self.api_url)
+
+    def test_token_reused_till_expiry(self):
+        """Test a token is held in memory, and refreshed once it is about to expire"""
+        self.assertEqual(self._tally_auth_token(), 'token-1')
+        self.assertEqual(Platform.objects.get(api_url=self.api_url).token_api_json['token'], 'token-1')
+        self.assertEqual(self._tally_auth_token(), 'token-1')
+        with patch('dashboard.services.consume.cache.Platform') as platform_model:
+            self.assertEqual(self._tally_auth_token(), 'token-1')
+            platform_model.objects.filter.assert_not_called()
+        self.assertEqual(len(self.posted), 1)
+
+        # within TOKEN_REFRESH_MIN of its expiry
+        self.assertEqual(self._tally_auth_token(now=timezone.now() + timedelta(minutes=55)), 'token-2')
+        self.assertEqual(len(self.posted), 2)
+        self.assertEqual(CacheAPIManager.auth_tokens[self.api_url][0], 'token-2')
+
+    def test_concurrent_callers_login_once(self):
+        """Test concurrent callers of an expired token wait for a single login"""
+        tokens = []
+
+        def _db_or_new_auth_token(server_url):
+            self.posted.append(server_url)
+            sleep(0.2)
+            return 'token', timezone.now() + timedelta(hours=1)
+
+        with patch.object(CacheAPIManager, '_db_or_new_auth_token', side_effect=_db_or_new_auth_token):
+            threads = [threading.Thread(
+                target=lambda: tokens.append(CacheAPIManager().tally_auth_token(self.api_url))
+            ) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertListEqual(tokens, ['token'] * 5)
+        self.assertEqual(len(self.posted), 1)
+
+
+class ServiceConfigTest(SimpleTestCase):
+
+    def test_response_media_type_of(self):
+        """Test media type lookup of a formatted resource"""
+        self.assertEqual(ServiceConfig.response_media_type_of(
+            'damnedlies', '/languages/ja/gnome-3-36/xml'), 'application/xml')
+        self.assertEqual(ServiceConfig.response_media_type_of(
+            'zanata', '/rest/projects/p/anaconda/iterations/i/master/locales'),
+            'application/vnd.zanata.project.locales+json')
+        self.assertEqual(ServiceConfig.response_media_type_of(
+            'weblate', '/api/projects/anaconda/?page=2'), 'application/json')
+        self.assertIsNone(ServiceConfig.response_media_type_of('weblate', '/api/unknown/'))
+
+
+class SingleFlightTest(SimpleTestCase):
+
+    def test_coalesce_calls(self):
+        """Test concurrent identical calls run once"""
+        single_flight = SingleFlight()
+        calls, results = [], []
+
+        def _slow_call():
+            calls.append(1)
+            sleep(0.2)
+            return 'response'
+
+        threads = [threading.Thread(
+            target=lambda: results.append(single_flight.do('key', _slow_call))
+        ) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertListEqual(results, ['response'] * 5)
+
+
+class RateLimiterTest(SimpleTestCase):
+
+    def test_adapt_to_headers(self):
+        """Test rate limit headers pace the bucket"""
+        rate_limiter = RateLimiter(rate=10, burst=5)
+        self.assertEqual(rate_limiter.acquire(), 0)
+        rate_limiter.update(200, {'X-RateLimit-Remaining': '300', 'X-RateLimit-Reset': '60'})
+        self.assertEqual(rate_limiter.rate, 5)
+        rate_limiter.update(429, {'Retry-After': '0.1'})
+        self.assertGreater(rate_limiter.acquire(), 0)
+
+    def test_rate_back_to_base_after_reset(self):
+        """Test a lowered rate lasts till the advertised window resets"""
+        rate_limiter = RateLimiter(rate=10, burst=5)
+        rate_limiter.update(200, {'X-RateLimit-Remaining': '1', 'X-RateLimit-Reset': '0.2'})
+        self.assertEqual(rate_limiter.rate, 5)
+        rate_limiter.update(200, {})
+        self.assertEqual(rate_limiter.rate, 5)
+        sleep(0.25)
+        rate_limiter.acquire()
+        self.assertEqual(rate_limiter.rate, 10)
+
+    def test_bare_429_backs_off(self):
+        """Test a 429 without rate limit headers blocks the host, longer in a row"""
+        rate_limiter = RateLimiter(rate=10, burst=5)
+        with patch('dashboard.services.consume.ratelimit.random.uniform',
+                   side_effect=lambda low, high: high):
+            for limited, backoff_sec in ((1, 1.0), (2, 2.0), (3, 4.0)):
+                rate_limiter.blocked_until = 0.0
+                rate_limiter.update(429, {})
+                self.assertEqual(rate_limiter.limited, limited)
+                self.assertAlmostEqual(rate_limiter.blocked_until - time.monotonic(), backoff_sec, places=1)
+            rate_limiter.update(429, {})
+            self.assertEqual(rate_limiter.limited, 4)
+            self.assertLessEqual(rate_limiter.blocked_until - time.monotonic(), 4.0)
+        rate_limiter.update(200, {})
+        self.assertEqual(rate_limiter.limited, 0)
+
+    def test_registry_reset_after_fork(self):
+        """Test a forked process gets limiters of its own"""
+        registry = RateLimiterRegistry()
+        rate_limiter = registry.get('https://translate.example.org/api/')
+        self.assertIs(registry.get('https://translate.example.org/projects/'), rate_limiter)
+        registry._pid = -1
+        self.assertIsNot(registry.get('https://translate.example.org/api/'), rate_limiter)
+
+
+class RetryPolicyTest(SimpleTestCase):
+
+    def test_backoff_is_capped(self):
+        retry_policy = RetryPolicy()
+        for attempt in range(10):
+            self.assertLessEqual(retry_policy.backoff(attempt),
+                                 min(RetryPolicy.BACKOFF_MAX_SEC, RetryPolicy.BACKOFF_SEC * 2 ** attempt))
+        self.assertEqual(retry_policy.max_retries('post'), 0)
+        self.assertEqual(retry_policy.max_retries('get'), RetryPolicy.MAX_RETRIES)
+
+    def test_breaker_per_host(self):
+        retry_policy = RetryPolicy()
+        self.assertIs(retry_policy.breaker('https://koji.example.org/a'),
+                      retry_policy.breaker('https://koji.example.org/b'))
+        self.assertIsNot(retry_policy.breaker('https://koji.example.org/a'),
+                         retry_policy.breaker('https://brew.example.org/a'))
+
+    @override_settings(HTTP_RETRY={'BACKOFF_SEC': 0})
+    def test_retried_responses_closed(self):
+        """Test a 5xx or 429 response is closed before the retry, the last one is returned open"""
+        uri = 'https://retry.example.org/api/'
+        rest_handle = RestHandle('https://retry.example.org', '/api/', 'GET')
+        responses = [Mock(status_code=503), Mock(status_code=200)]
+        rest_handle._send_request = Mock(side_effect=responses)
+        self.assertIs(rest_handle._send_with_retries(uri, 'GET', stream=True), responses[1])
+        responses[0].close.assert_called_once_with()
+        responses[1].close.assert_not_called()
+
+        responses = [Mock(status_code=429, headers={'Retry-After': '0'}), Mock(status_code=200, headers={})]
+        with patch('requests.Session.request', side_effect=responses):
+            self.assertIs(RestHandle('https://retry.example.org', '/api/', 'GET')._send_request(
+                uri, 'GET', stream=True), responses[1])
+        responses[0].close.assert_called_once_with()
+        responses[1].close.assert_not_called()
+
+
+class CircuitBreakerTest(SimpleTestCase):
+
+    def setUp(self):
+        self.circuit_breaker = CircuitBreaker('koji.example.org', 2, 0.1)
+
+    def _open(self):
+        for failure in range(2):
+            self.assertTrue(self.circuit_breaker.allow_request())
+            self.circuit_breaker.record_failure()
+        self.assertEqual(self.circuit_breaker.state, 'open')
+        self.assertFalse(self.circuit_breaker.allow_request())
+
+    def test_probe_success_closes(self):
+        self._open()
+        sleep(0.15)
+        self.assertTrue(self.circuit_breaker.allow_request())
+        self.assertEqual(self.circuit_breaker.state, 'half-open')
+        # one probe at a time
+        self.assertFalse(self.circuit_breaker.allow_request())
+        self.circuit_breaker.record_success()
+        self.assertEqual(self.circuit_breaker.state, 'closed')
+        self.assertTrue(self.circuit_breaker.allow_request())
+
+    def test_probe_failure_reopens(self):
+        self._open()
+        sleep(0.15)
+        self.assertTrue(self.circuit_breaker.allow_request())
+        self.circuit_breaker.record_failure()
+        self.assertEqual(self.circuit_breaker.state, 'open')
+        self.assertFalse(self.circuit_breaker.allow_request())
+        sleep(0.15)
+        self.assertTrue(self.circuit_breaker.allow_request())
+
+    def test_probe_error_is_recorded(self):
+        uri = 'https://probe.example.org/api/'
+        circuit_breaker = retry_policy.breaker(uri)
+        circuit_breaker.state, circuit_breaker.opened_at = 'open', 0.0
+        rest_handle = RestHandle('https://probe.example.org', '/api/', 'GET')
+
+        def _send_request(uri, http_method, **kwargs):
+            raise ValueError(uri)
+        rest_handle._send_request = _send_request
+        with self.assertRaises(ValueError):
+            rest_handle._send_with_retries(uri, 'GET')
+        self.assertEqual(circuit_breaker.state, 'open')
+        self.assertFalse(circuit_breaker._probing)
+
+
+class LazyResponseDictTest(SimpleTestCase):
+
+    def test_decode_on_first_access(self):
+        """Test lazy views are decoded once, when read"""
+        decoded = []
+        response_dict = LazyResponseDict(status_code=200)
+        response_dict.set_lazy('json_content', lambda: decoded.append(1) or {'a': 1})
+        self.assertIn('json_content', response_dict)
+        self.assertListEqual(decoded, [])
+        self.assertDictEqual(response_dict['json_content'], {'a': 1})
+        self.assertDictEqual(response_dict.get('json_content'), {'a': 1})
+        self.assertEqual(len(decoded), 1)
+        self.assertIsNone(response_dict.get('text'))
+
+
+class AsyncAPIResourcesTest(SimpleTestCase):
+
+    class _Resources(object):
+        def double(self, number):
+            return number * 2
+
+    def setUp(self):
+        self.async_api_resources = AsyncAPIResources(max_concurrency=2)
+        self.async_api_resources.api_resources = self._Resources()
+        self.calls = [('double', (number,), {}) for number in range(5)]
+
+    def test_gather(self):
+        self.assertListEqual(self.async_api_resources.gather(self.calls), [0, 2, 4, 6, 8])
+
+    def test_gather_inside_running_loop(self):
+        async def caller():
+            return self.async_api_resources.gather(self.calls)
+        self.assertListEqual(asyncio.run(caller()), [0, 2, 4, 6, 8])
+
+
+class TransplatformResourcesTest(SimpleTestCase):
+
+    def test_damnedlies_stats_index_of_sync_run(self):
+        """Test DamnedLies documents are parsed once per sync run, and live otherwise"""
+        resources = TransplatformResources()
+        url_params = ('damnedlies', 'https://l10n.gnome.org', 'ja', 'gnome-3-36')
+        with patch.object(TransplatformResources, '_index_damnedlies_locale_release_stats',
+                          return_value={'pkg': (5, 1, 0, 6), 'other': (1, 0, 0, 1)}) as index_stats, \
+                patch.object(TransplatformResources, '_fetch_damnedlies_locale_release_stats',
+                             return_value={'locale': 'ja'}) as live_stats:
+            stats_index = {}
+            for package_name in ('pkg', 'other'):
+                resources.fetch_translation_statistics(
+                    *url_params, package_name=package_name, stats_index=stats_index)
+            self.assertEqual(index_stats.call_count, 1)
+            self.assertEqual(resources.fetch_translation_statistics(
+                *url_params, package_name='pkg', stats_index=stats_index
+            ).get('translated'), 5)
+            resources.fetch_translation_statistics(*url_params, package_name='pkg', stats_index={})
+            self.assertEqual(index_stats.call_count, 2)
+            # a package refresh
+            resources.fetch_translation_statistics(*url_params, package_name='pkg')
+            self.assertEqual(index_stats.call_count, 2)
+            self.assertEqual(live_stats.call_count, 1)
+
+    def test_damnedlies_stats_index_locks(self):
+        """Test concurrent lookups fetch a document once, with locks kept in the index"""
+        stats_index, results = {}, []
+
+        def _index_stats(*args):
+            sleep(0.2)
+            return {'pkg': (5, 1, 0, 6)}
+
+        with patch.object(TransplatformResources, '_index_damnedlies_locale_release_stats',
+                          side_effect=_index_stats) as index_stats:
+            threads = [threading.Thread(target=lambda: results.append(
+                TransplatformResources._damnedlies_locale_release_index(
+                    stats_index, 'https://l10n.gnome.org', 'release_stats', 'ja', 'gnome-3-36'))
+            ) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(index_stats.call_count, 1)
+        self.assertListEqual(results, [{'pkg': (5, 1, 0, 6)}] * 4)
+        self.assertListEqual(list(stats_index[TransplatformResources.DAMNEDLIES_INDEX_LOCKS]),
+                             [('https://l10n.gnome.org', 'ja', 'gnome-3-36')])
+
+    def test_memsource_project_jobs_pages(self):
+        """Test Memsource project jobs are listed from every page, with the workflowLevel filter"""
+        def _process_request(base_url, resource, *args, **kwargs):
+            page_number = int(dict(parse_qsl(kwargs['ext'])).get('pageNumber', 0))
+            return {'json_content': {'content': [{'uid': 'job-%s' % page_number}],
+                                     'pageNumber': page_number, 'totalPages': 3}}
+
+        with patch('dashboard.services.resources.RestClient.process_request',
+                   side_effect=_process_request) as request:
+            project_jobs = TransplatformResources._fetch_memsource_project_jobs(
+                'https://cloud.memsource.example.org/web', 'project_jobs', 'project-uid',
+                ext='workflowLevel=1', combine_results=[]
+            )
+        self.assertListEqual(project_jobs, [{'uid': 'job-0'}, {'uid': 'job-1'}, {'uid': 'job-2'}])
+        self.assertListEqual(sorted(call[1]['ext'] for call in request.call_args_list), [
+            'workflowLevel=1', 'workflowLevel=1&pageNumber=1', 'workflowLevel=1&pageNumber=2'])
+
+
+def _json_response(url, json_body, status_code=200, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers['Content-Type'] = 'application/json'
+    response.headers.update(headers or {})
+    response._content = json.dumps(json_body).encode('utf-8')
+    response.url = url
+    return response
+
+
+class PaginationTest(SimpleTestCase):
+
+    def test_weblate_page_exts(self):
+        """Test remaining pages of a Weblate listing, from count and next"""
+        self.assertListEqual(ResourcesBase._weblate_page_exts({
+            'count': 5, 'results': [1, 2], 'next': 'https://translate.example.org/api/projects/?page=2'
+        }), ['page=2', 'page=3'])
+        self.assertListEqual(ResourcesBase._weblate_page_exts({'count': 2, 'results': [1, 2], 'next': None}), [])
+
+    def test_memsource_page_exts(self):
+        """Test remaining pages of a Memsource listing, 0-based"""
+        self.assertListEqual(ResourcesBase._memsource_page_exts({'pageNumber': 0, 'totalPages': 3}),
+                             ['pageNumber=1', 'pageNumber=2'])
+        self.assertListEqual(ResourcesBase._memsource_page_exts({'pageNumber': 0, 'totalPages': 1}), [])
+
+    def test_github_page_exts(self):
+        """Test remaining pages of a GitHub listing, from the Link header"""
+        header_link = '<https://api.github.com/repos/o/r/branches?per_page=2&page=2>; rel="next", ' \
+                      '<https://api.github.com/repos/o/r/branches?per_page=2&page=4>; rel="last"'
+        self.assertListEqual(ResourcesBase._github_page_exts(header_link),
+                             ['per_page=2&page=2', 'per_page=2&page=3', 'per_page=2&page=4'])
+        self.assertListEqual(ResourcesBase._github_page_exts(None), [])
+
+    def test_fetch_pages(self):
+        """Test pages are fetched with their own query, and returned in order"""
+        with patch('dashboard.services.resources.RestClient.process_request',
+                   side_effect=lambda base_url, resource, *args, **kwargs: {'ext': kwargs['ext']}) as request:
+            page_responses = ResourcesBase._fetch_pages(
+                'weblate', 'https://translate.example.org', 'project_details', ['page=2', 'page=3', 'page=4'],
+                rest_response={}, combine_results=[], headers={'Authorization': 'Token t'}
+            )
+        self.assertListEqual(page_responses, [{'ext': 'page=2'}, {'ext': 'page=3'}, {'ext': 'page=4'}])
+        for call in request.call_args_list:
+            self.assertNotIn('rest_response', call[1])
+            self.assertNotIn('combine_results', call[1])
+            self.assertEqual(call[1]['headers'], {'Authorization': 'Token t'})
+        self.assertListEqual(ResourcesBase._fetch_pages('weblate', '', '', []), [])
+
+
+class GitHubBranchPagesTest(TestCase):
+
+    branches_url = 'https://api.github.com/repos/o/r/branches'
+
+    def setUp(self):
+        CacheAPIManager.memory_cache.clear()
+        self.requested = []
+
+    def tearDown(self):
+        CacheAPIManager.memory_cache.clear()
+
+    def _send_request(self, uri, http_method, **kwargs):
+        self.requested.append(uri)
+        page = int(uri.split('page=')[1]) if 'page=' in uri else 1
+        return _json_response(uri, [{'name': 'branch-%s' % page}], headers={
+            'Link': '<%s?page=%s>; rel="next", <%s?page=3>; rel="last"' % (
+                self.branches_url, page + 1, self.branches_url)
+        } if page < 3 else {})
+
+    def _fetch_branches(self):
+        with patch('dashboard.services.consume.restclient.RestHandle._send_request',
+                   side_effect=self._send_request):
+            return GitPlatformResources().fetch_repo_branches(GIT_PLATFORMS[0], '', 'o', 'r')
+
+    def test_pages_of_cached_first_page(self):
+        """Test every page is listed, with the first page fetched or served from cache"""
+        all_branches = ['branch-1', 'branch-2', 'branch-3']
+        self.assertListEqual(self._fetch_branches(), all_branches)
+        self.assertListEqual(sorted(self.requested), [
+            self.branches_url, self.branches_url + '?page=2', self.branches_url + '?page=3'])
+        self.assertIn('rel="next"', CacheAPI.objects.get(
+            resource='/repos/o/r/branches').response_link)
+
+        # from memory, then from db
+        self.requested.clear()
+        self.assertListEqual(self._fetch_branches(), all_branches)
+        CacheAPIManager.memory_cache.clear()
+        self.assertListEqual(self._fetch_branches(), all_branches)
+        self.assertListEqual(self.requested, [])
+
+
+class ConditionalGetTest(TestCase):
+
+    base_url = 'https://translate.example.org'
+    resource = '/api/projects/'
+
+    def setUp(self):
+        CacheAPIManager.memory_cache.clear()
+        CacheAPIManager().save_api_response(
+            self.base_url, self.resource, b'{"count": 1}', {'count': 1}, service='weblate',
+            resp_headers={'ETag': '"v1"', 'Last-Modified': 'Wed, 14 Oct 2026 10:00:00 GMT'}
+        )
+        # expired, kept for revalidation
+        CacheAPI.objects.filter(resource=self.resource).update(expiry=timezone.now() - timedelta(minutes=1))
+        CacheAPIManager.memory_cache.clear()
+        self.sent_headers = []
+
+    def tearDown(self):
+        CacheAPIManager.memory_cache.clear()
+
+    def _list_projects(self, response):
+        def _send_request(uri, http_method, **kwargs):
+            self.sent_headers.append(kwargs['headers'])
+            return response
+        with patch('dashboard.services.consume.restclient.RestHandle._send_request',
+                   side_effect=_send_request):
+            return RestClient('weblate').process_request(self.base_url, 'list_projects')
+
+    def test_not_modified(self):
+        """Test validators are sent, and a 304 extends expiry of the cached content"""
+        cached_gz = bytes(CacheAPI.objects.get(resource=self.resource).response_content_gz)
+        response = self._list_projects(_json_response(self.base_url + self.resource, {}, status_code=304))
+        self.assertEqual(self.sent_headers[0]['If-None-Match'], '"v1"')
+        self.assertEqual(self.sent_headers[0]['If-Modified-Since'], 'Wed, 14 Oct 2026 10:00:00 GMT')
+        self.assertEqual(response['json_content'], {'count': 1})
+        cache = CacheAPI.objects.get(resource=self.resource)
+        self.assertGreater(cache.expiry, timezone.now())
+        self.assertEqual(bytes(cache.response_content_gz), cached_gz)
+        self.assertEqual(cache.response_etag, '"v1"')
+        # served from cache till it expires again
+        self.assertEqual(self._list_projects(None)['json_content'], {'count': 1})
+        self.assertEqual(len(self.sent_headers), 1)
+
+    def test_modified(self):
+        """Test a 200 replaces the cached response and its validators"""
+        response = self._list_projects(_json_response(
+            self.base_url + self.resource, {'count': 2}, headers={'ETag': '"v2"'}))
+        self.assertEqual(response['json_content'], {'count': 2})
+        cache = CacheAPI.objects.get(resource=self.resource)
+        self.assertEqual(cache.response_content_json, {'count': 2})
+        self.assertEqual(cache.response_etag, '"v2"')
+        self.assertIsNone(cache.response_last_modified)
+        self.assertGreater(cache.expiry, timezone.now())
+        self.assertEqual(CacheAPI.objects.filter(resource=self.resource).count(), 1)
+
+
+class KojiSessionPoolTest(SimpleTestCase):
+
+    hub_url = 'https://koji.example.org/kojihub'
+
+    def setUp(self):
+        self.pool = KojiSessionPool()
+        self.created = []
+        patcher = patch.object(KojiSessionPool, '_create_session', side_effect=self._create_session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _create_session(self, hub):
+        koji_session = SimpleNamespace(
+            hub=hub, logged_in=False, rsession=Mock(), created_at=time.monotonic(), getTag=Mock()
+        )
+        self.created.append(koji_session)
+        return koji_session
+
+    def test_reuse_per_hub(self):
+        """Test an idle session is reused for its hub only"""
+        with self.pool.session(self.hub_url) as koji_session:
+            pass
+        with self.pool.session(self.hub_url) as reused_session:
+            self.assertIs(reused_session, koji_session)
+        with self.pool.session('https://brewhub.example.org/brewhub') as other_session:
+            self.assertIsNot(other_session, koji_session)
+        self.assertEqual(len(self.created), 2)
+
+    def test_concurrent_checkouts(self):
+        """Test a session serves one thread at a time, and idle ones are bounded"""
+        in_use, overlaps, lock = set(), [], threading.Lock()
+
+        def _use_session():
+            with self.pool.session(self.hub_url) as koji_session:
+                with lock:
+                    if id(koji_session) in in_use:
+                        overlaps.append(koji_session)
+                    in_use.add(id(koji_session))
+                sleep(0.05)
+                with lock:
+                    in_use.discard(id(koji_session))
+
+        threads = [threading.Thread(target=_use_session) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertListEqual(overlaps, [])
+        self.assertLessEqual(len(self.pool._idle[self.hub_url]), KojiSessionPool.MAX_IDLE)
+        # discarded sessions beyond MAX_IDLE are closed
+        closed = [koji_session for koji_session in self.created if koji_session.rsession.close.called]
+        self.assertEqual(len(closed), len(self.created) - len(self.pool._idle[self.hub_url]))
+
+    def test_session_after_error(self):
+        """Test a session is kept after a call error, and dropped after an auth error"""
+        with self.assertRaises(ValueError):
+            with self.pool.session(self.hub_url) as koji_session:
+                raise ValueError()
+        with self.assertRaises(koji.AuthError):
+            with self.pool.session(self.hub_url) as reused_session:
+                self.assertIs(reused_session, koji_session)
+                raise koji.AuthError()
+        koji_session.rsession.close.assert_called_once_with()
+        with self.pool.session(self.hub_url) as new_session:
+            self.assertIsNot(new_session, koji_session)
+
+    def test_call_retried_once_on_expired_auth(self):
+        """Test a call is sent once more over a fresh session when auth expired"""
+        with self.pool.session(self.hub_url) as koji_session:
+            koji_session.getTag.side_effect = koji.AuthExpired()
+        self.assertIsInstance(self.pool.call(self.hub_url, 'getTag', 'f42'), Mock)
+        self.assertEqual(len(self.created), 2)
+        self.created[1].getTag.assert_called_once_with('f42')
+        self.assertListEqual(self.pool._idle[self.hub_url], [self.created[1]])
+
+    def test_expired_sessions_recycled(self):
+        """Test sessions older than MAX_AGE_SEC are not reused"""
+        with self.pool.session(self.hub_url) as koji_session:
+            koji_session.created_at -= KojiSessionPool.MAX_AGE_SEC + 1
+        with self.pool.session(self.hub_url) as new_session:
+            self.assertIsNot(new_session, koji_session)
+        koji_session.rsession.close.assert_called_once_with()
+
+
+class KojiResourcesTest(SimpleTestCase):
+
+    koji_fixture = {
+        'getBuild': [{'args': [7], 'result': {'id': 7, 'nvr': 'pkg-1.0-1'}}],
+        'listRPMs': [{'kwargs': {'buildID': 7}, 'result': [{'id': 70, 'arch': 'src'}]},
+                     {'result': []}],
+        'listTags': [{'kwargs': {'build': 7}, 'result': [{'name': 'f42'}, {'name': 'f42-updates'}]}],
+        'getLatestBuilds': [
+            {'args': ['f42'], 'result': [{'id': 7, 'package_name': 'pkg', 'nvr': 'pkg-1.0-1'},
+                                         {'id': 5, 'package_name': 'other', 'nvr': 'other-2.0-1'}]},
+            {'args': ['f42'], 'kwargs': {'package': 'pkg'},
+             'result': [{'id': 7, 'package_name': 'pkg', 'nvr': 'pkg-1.0-1'}]},
+        ],
+    }
+
+    def setUp(self):
+        self.fixtures_dir = TemporaryDirectory()
+        with open(os.path.join(self.fixtures_dir.name, 'koji.json'), 'w') as f:
+            json.dump(self.koji_fixture, f)
+        self.server = StandInServer(('127.0.0.1', 0), self.fixtures_dir.name)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.hub_url = 'http://127.0.0.1:%s/kojihub' % self.server.server_address[1]
+        self.koji_resources = KojiResources()
+        KojiResources.latest_builds_snapshots.clear()
+        KojiResources.latest_builds_snapshot_locks.clear()
+
+    def tearDown(self):
+        KojiResources.latest_builds_snapshots.clear()
+        KojiResources.latest_builds_snapshot_locks.clear()
+        koji_session_pool.close_all()
+        self.server.shutdown()
+        self.server.server_close()
+        self.fixtures_dir.cleanup()
+
+    def test_multicall(self):
+        """Test a batch is answered in order, a faulted call as None"""
+        self.assertListEqual(self.koji_resources._multicall(self.hub_url, [
+            ('getBuild', (7,), {}), ('getBuild', (8,), {}), ('listRPMs', (), {'buildID': 7})
+        ]), [{'id': 7, 'nvr': 'pkg-1.0-1'}, None, [{'id': 70, 'arch': 'src'}]])
+        self.assertListEqual(self.koji_resources._multicall(self.hub_url, []), [])
+        with self.koji_resources._session(self.hub_url) as koji_session:
+            self.assertFalse(koji_session.multicall)
+
+    def test_list_tags_bulk(self):
+        """Test tags of many builds, a faulted build without tags"""
+        self.assertDictEqual(self.koji_resources.list_tags_bulk(self.hub_url, [7, 8]),
+                             {7: ['f42', 'f42-updates'], 8: []})
+
+    def test_build_with_rpms(self):
+        """Test build and its RPMs in one batch, and an error for a build which is not there"""
+        self.assertTupleEqual(self.koji_resources.build_with_rpms(self.hub_url, 7), (
+            {'id': 7, 'nvr': 'pkg-1.0-1'}, [{'id': 70, 'arch': 'src'}]))
+        with self.assertRaises(koji.GenericError):
+            self.koji_resources.build_with_rpms(self.hub_url, 8)
+
+    def _tag_a_new_build(self):
+        self.server.koji_hub.fixture['getLatestBuilds'][1]['result'] = [
+            {'id': 9, 'package_name': 'pkg', 'nvr': 'pkg-1.1-1'}]
+
+    def test_latest_builds_snapshot(self):
+        """Test snapshot lookups share one hub call, and are taken again once stale"""
+        with patch.object(KojiResources, '_call', wraps=KojiResources._call) as hub_call:
+            self.assertEqual(self.koji_resources.build_info(self.hub_url, 'f42', 'pkg', snapshot=True)[0]['id'], 7)
+            self.assertEqual(self.koji_resources.build_info(self.hub_url, 'f42', 'other', snapshot=True)[0]['id'], 5)
+            self.assertListEqual(self.koji_resources.build_info(self.hub_url, 'f42', 'gone', snapshot=True), [])
+            hub_call.assert_called_once_with(self.hub_url, 'getLatestBuilds', 'f42')
+
+            # from memory, though the hub has a newer build
+            self._tag_a_new_build()
+            self.server.koji_hub.fixture['getLatestBuilds'][0]['result'][0]['id'] = 9
+            self.assertEqual(self.koji_resources.build_info(self.hub_url, 'f42', 'pkg', snapshot=True)[0]['id'], 7)
+            self.assertEqual(hub_call.call_count, 1)
+
+            with patch.object(KojiResources, 'LATEST_BUILDS_SNAPSHOT_TTL_SEC', 0):
+                self.assertEqual(self.koji_resources.build_info(
+                    self.hub_url, 'f42', 'pkg', snapshot=True)[0]['id'], 9)
+            self.assertEqual(hub_call.call_count, 2)
+
+    def test_snapshot_per_tag(self):
+        """Test a tag being fetched does not hold up another, and stale tags are let go"""
+        stale_key = (self.hub_url, 'f40')
+        KojiResources.latest_builds_snapshots[stale_key] = (
+            time.monotonic() - KojiResources.LATEST_BUILDS_SNAPSHOT_TTL_SEC - 1, {})
+        self.koji_resources._snapshot_lock(*stale_key)
+        with self.koji_resources._snapshot_lock(self.hub_url, 'f41'):
+            fetch = threading.Thread(target=self.koji_resources.latest_builds_snapshot,
+                                     args=(self.hub_url, 'f42'))
+            fetch.start()
+            fetch.join(5)
+            self.assertFalse(fetch.is_alive())
+        self.assertListEqual(list(KojiResources.latest_builds_snapshots), [(self.hub_url, 'f42')])
+        self.assertNotIn(stale_key, KojiResources.latest_builds_snapshot_locks)
+
+    def test_live_build_info_for_jobs(self):
+        """Test jobs get the live latest build, even when a snapshot of the tag is held"""
+        self.koji_resources.latest_builds_snapshot(self.hub_url, 'f42')
+        self._tag_a_new_build()
+        with patch.object(KojiResources, '_call', wraps=KojiResources._call) as hub_call:
+            self.assertEqual(self.koji_resources.build_info(self.hub_url, 'f42', 'pkg')[0]['id'], 9)
+            hub_call.assert_called_once_with(self.hub_url, 'getLatestBuilds', 'f42', package='pkg')
+            with TemporaryDirectory() as log_dir:
+                builds = Get().latest_build_info({
+                    'hub_url': self.hub_url, 'build_tag': 'f42', 'package': 'pkg',
+                    'log_f': os.path.join(log_dir, 'job.log')
+                }, {})[0]['builds']
+            self.assertEqual(builds[0]['id'], 9)
+        self.assertEqual(self.koji_resources.build_info(self.hub_url, 'f42', 'pkg', snapshot=True)[0]['id'], 7)
+
+
+class StandInServerTest(SimpleTestCase):
+
+    def test_replay_and_koji_hub(self):
+        """Test recorded responses and fake koji hub are served offline"""
+        default_fixtures_dir = ResponseRecorder().fixtures_dir
+        default_fixtures = os.listdir(default_fixtures_dir)
+        with TemporaryDirectory() as fixtures_dir:
+            recorder = ResponseRecorder(fixtures_dir=fixtures_dir)
+            response = requests.Response()
+            response.status_code = 200
+            response.headers['Content-Type'] = 'application/json'
+            response._content = b'{"count": 0}'
+            recorder.record('GET', 'https://weblate.example.com/api/projects/?page=2', response)
+            with open(fixtures_dir + '/koji.json', 'w') as f:
+                f.write('{"getPackageID": [{"args": ["pkg"], "result": 7}, {"result": null}]}')
+
+            server = StandInServer(('127.0.0.1', 0), fixtures_dir)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = 'http://127.0.0.1:%s' % server.server_address[1]
+            try:
+                self.assertDictEqual(recorder.replay(
+                    'GET', 'https://weblate.example.com/api/projects/?page=2').json(), {'count': 0})
+                self.assertEqual(requests.get(base_url + '/api/projects/?page=2').json(), {'count': 0})
+                self.assertEqual(requests.get(base_url + '/api/projects/').status_code, 404)
+                koji_hub = xmlrpc.client.ServerProxy(base_url + '/kojihub', allow_none=True)
+                self.assertEqual(koji_hub.getPackageID('pkg'), 7)
+                self.assertListEqual(koji_hub.multiCall([
+                    {'methodName': 'getPackageID', 'params': ['pkg']},
+                    {'methodName': 'listTags', 'params': []},
+                ])[0], [7])
+            finally:
+                server.shutdown()
+                server.server_close()
+        # an explicit fixtures_dir wins over settings, the committed fixtures stay untouched
+        self.assertListEqual(os.listdir(default_fixtures_dir), default_fixtures)
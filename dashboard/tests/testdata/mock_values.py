@@ -19,30 +19,30 @@ from dashboard.tests.testdata.test_data import mock_response_add_package, \
     mock_response_validate_package, mock_response_repo_branches
 
 
-def mock_requests_get_add_package(uri, **kwargs):
+def mock_requests_get_add_package(*args, **kwargs):
     """
-    Mock function to patch requests.get for test_add_package
-    :param uri: uri of api end point
+    Mock function to patch requests.Session.request for test_add_package
+    :param args: session, http method and uri of api end point
     :return: mock response object
     """
     response = mock_response_add_package()
     return response
 
 
-def mock_requests_get_validate_package(uri, **kwargs):
+def mock_requests_get_validate_package(*args, **kwargs):
     """
-    Mock function to patch requests.get for test_validate_package
-    :param uri: uri of api end point
+    Mock function to patch requests.Session.request for test_validate_package
+    :param args: session, http method and uri of api end point
     :return: mock response object
     """
     response = mock_response_validate_package()
     return response
 
 
-def mock_requests_get_git_branches(uri, **kwargs):
+def mock_requests_get_git_branches(*args, **kwargs):
     """
-    Mock function to patch requests.get for test_git_branches
-    :param uri: uri of api end point
+    Mock function to patch requests.Session.request for test_git_branches
+    :param args: session, http method and uri of api end point
     :return: mock response object
     """
     response = mock_response_repo_branches()
@@ -44,6 +44,10 @@ class mock_response:
     def text(self):
         return self.resp_text
 
+    @property
+    def content(self):
+        return self.resp_text.encode()
+
     @property
     def url(self):
         return self.resp_url
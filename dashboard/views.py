@@ -22,6 +22,7 @@ from datetime import datetime
 from pathlib import Path
 import threading
 from urllib.parse import urlencode
+from uuid import UUID
 
 # django
 from django.conf import settings
@@ -57,7 +58,7 @@ from dashboard.constants import (
     TS_JOB_TYPES, TRANSPLATFORM_ENGINES, RELSTREAM_SLUGS,
     WEBLATE_SLUGS, TRANSIFEX_SLUGS, TS_CI_JOBS, PIPELINE_CONFIG_EVENTS,
     JOB_MULTIPLE_BRANCHES_VAR, TP_BRANCH_CALLING_NAME, SYS_EMAIL_ADDR,
-    TRANSLATION_FILE_FORMATS, MEMSOURCE_SLUGS
+    TRANSLATION_FILE_FORMATS, MEMSOURCE_SLUGS, JOB_STATUSES
 )
 from dashboard.forms import (
     NewPackageForm, UpdatePackageForm, NewReleaseBranchForm, NewGraphRuleForm,
@@ -65,6 +66,7 @@ from dashboard.forms import (
     NewTransPlatformForm, UpdateTransPlatformForm, UpdateGraphRuleForm,
     CreateCIPipelineForm, PlatformProjectTemplatesForm
 )
+from dashboard.jobs_framework.sandbox import JobSandbox
 from dashboard.managers.inventory import (
     InventoryManager, ReleaseBranchManager, SyncStatsManager
 )
@@ -1335,6 +1337,14 @@ class FedoraAuthRequestView(OIDCAuthenticationRequestView):
         return HttpResponseRedirect(redirect_url)
 
 
+def _new_job_uuid(job_uuid):
+    """Whether a job could be logged under this UUID"""
+    try:
+        return not Job.objects.filter(job_uuid=UUID(job_uuid or '')).exists()
+    except ValueError:
+        return False
+
+
 def schedule_job(request):
     """Handles job schedule AJAX POST request"""
     message = "&nbsp;&nbsp;<span class='text-warning'>Request could not be processed.</span>"
@@ -1380,11 +1390,27 @@ def schedule_job(request):
             else:
                 fields.append('DRY_RUN')
                 fields.append('SCRATCH')
+                if _new_job_uuid(request.POST.dict().get('JOB_UUID')):
+                    # the form follows the job log by it
+                    fields.append('JOB_UUID')
                 job_manager = YMLBasedJobManager(
                     **{field: request.POST.dict().get(field) for field in fields},
                     **{'params': req_params, 'type': job_type},
                     **{'active_user_email': active_user_email}
                 )
+                if getattr(settings, 'YML_JOBS_ASYNC', False):
+                    # a worker runs it, the page follows its status by UUID
+                    try:
+                        job_uuid = job_manager.enqueue_job()
+                    except Exception as e:
+                        message = "&nbsp;&nbsp;<span class='text-danger'>{}</span>".format(e)
+                        return HttpResponse(message, status=500)
+                    status_url = reverse('api_job_status', args=[job_uuid])
+                    message = "&nbsp;&nbsp;<span class='text-info job-queued' data-status-url='" + \
+                              status_url + "'>Job queued. UUID: <a href='" + status_url + "'>" + \
+                              str(job_uuid) + "</a> Status: <span id='job-status'>" + \
+                              JOB_STATUSES[0] + "</span></span>"
+                    return HttpResponse(message, status=202)
                 try:
                     job_uuid, _ = job_manager.execute_job()
                 except Exception as e:
@@ -1429,15 +1455,11 @@ def schedule_job(request):
 def read_file_logs(request):
     message = ''
     if request.is_ajax():
-        post_params = request.POST.dict()
-        job_params = [str(param).upper() for param in ast.literal_eval(post_params.get('params', ''))]
-        job_manager = YMLBasedJobManager(
-            **{'params': job_params, 'type': post_params.get('job', 'YMLbasedJob')}
-        )
-        suffix = job_manager.job_suffix(
-            [post_params.get(param, '') for param in job_params][:3]
-        )
-        log_file_path = job_manager.job_log_file + ".%s.%s" % (suffix, job_manager.type)
+        try:
+            job_uuid = UUID(request.POST.dict().get('JOB_UUID', ''))
+        except ValueError:
+            return HttpResponse(message)
+        log_file_path = JobSandbox(job_uuid).log_file
         log_file = Path(log_file_path)
         if log_file.is_file():
             with open(log_file_path) as f:
@@ -1954,8 +1976,7 @@ def ajax_run_pipeline_config(request):
             **job_data, **{'params': [p.upper() for p in t_params],
                            'type': job_type},
             **{'active_user_email': request.user.email},
-            **{'sandbox_path': temp_path},
-            **{'job_log_file': temp_path + '.log'}
+            **{'sandbox_path': temp_path}
         )
 
         try:
@@ -51,7 +51,20 @@ __all__ = [
     'STATIC_ROOT',
     'CRISPY_TEMPLATE_PACK',
     'CACHES',
-    'REST_FRAMEWORK'
+    'REST_FRAMEWORK',
+    'HTTP_SESSION_POOL',
+    'HTTP_RATE_LIMITS',
+    'HTTP_RETRY',
+    'API_MEMORY_CACHE',
+    'KOJI_SESSION_POOL',
+    'ARTIFACT_CACHE',
+    'DOWNLOAD_CHUNK_SIZE',
+    'HTTP_RECORD_REPLAY',
+    'STANDIN_BENCHMARK',
+    'CACHE_WARMUP',
+    'JOB_SANDBOX',
+    'YML_JOBS_ASYNC',
+    'YML_JOBS_PARALLEL_TASKS'
 ]
 
 # Imports from your apps
@@ -166,6 +179,14 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'dashboard.tasks.task_sync_packages_with_build_system',
         'schedule': crontab(minute='0', hour='4'),
     },
+    'task_purge_expired_api_cache': {
+        'task': 'dashboard.tasks.task_purge_expired_api_cache',
+        'schedule': crontab(minute='30', hour='3'),
+    },
+    'task_warm_api_cache': {
+        'task': 'dashboard.tasks.task_warm_api_cache',
+        'schedule': crontab(minute='*/5'),
+    },
 }
 
 # Database
@@ -276,3 +297,101 @@ CACHES = {
 }
 
 REST_FRAMEWORK = {'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.coreapi.AutoSchema'}
+
+# Pooled HTTP sessions for platform APIs, timeouts are (connect, read) seconds
+HTTP_SESSION_POOL = {
+    'POOL_CONNECTIONS': 10,
+    'POOL_MAXSIZE': 20,
+    'KEEP_ALIVE': True,
+    'TIMEOUT': (10, 120),
+    'SERVICE_TIMEOUTS': {
+        'damnedlies': (10, 300),
+        'phrase': (10, 180),
+        'download': (10, 600),
+    },
+}
+
+# Per platform host token buckets, HOSTS maps scheme://host to (requests per second, burst)
+HTTP_RATE_LIMITS = {
+    'RATE': 10,
+    'BURST': 20,
+    'RETRIES_ON_LIMIT': 3,
+    'HOSTS': {
+        'https://api.github.com': (1.2, 10),
+    },
+}
+
+# Retries of idempotent platform requests and per host circuit breakers
+HTTP_RETRY = {
+    'MAX_RETRIES': 3,
+    'BACKOFF_SEC': 0.5,
+    'BACKOFF_MAX_SEC': 30,
+    'FAILURE_THRESHOLD': 5,
+    'RESET_TIMEOUT_SEC': 120,
+}
+
+# In-process LRU of decoded API responses in front of the CacheAPI table,
+# bounded by entries and by bytes of their content
+API_MEMORY_CACHE = {
+    'MAX_ENTRIES': 512,
+    'MAX_BYTES': 64 * 1024 ** 2,
+    'TTL_SEC': 600,
+}
+
+# Pooled koji.ClientSession objects per hub, LOGIN_HUBS lists hubs needing gssapi login
+KOJI_SESSION_POOL = {
+    'MAX_IDLE': 4,
+    'MAX_AGE_SEC': 900,
+    'LOGIN_HUBS': (),
+}
+
+# Content addressed SRPM and extracted tree cache shared across jobs,
+# kept outside of the job sandboxes
+ARTIFACT_CACHE = {
+    'ROOT': 'dashboard/artifacts/',
+    'MAX_BYTES': 20 * 1024 ** 3,
+}
+
+# Bytes read and written at a time while streaming SRPMs and translation files to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Per job run working directories, MAX_BYTES is the disk quota of each
+JOB_SANDBOX = {
+    'ROOT': 'dashboard/sandbox/jobs/',
+    'MAX_BYTES': 5 * 1024 ** 3,
+    'MAX_AGE_HOURS': 24,
+}
+
+# Queue YML jobs run from the dashboard and the API on celery workers, instead of
+# running them within the request; API clients may also ask for it with ?ASYNC=true
+YML_JOBS_ASYNC = False
+
+# Tasks of a YML job with 'execution: parallel' running at the same time
+YML_JOBS_PARALLEL_TASKS = 4
+
+# Record platform responses to fixtures, or replay them offline: MODE is 'record', 'replay' or empty
+HTTP_RECORD_REPLAY = {
+    'MODE': os.getenv('TS_HTTP_RECORD_REPLAY', ''),
+    'FIXTURES_DIR': 'dashboard/tests/testdata/platforms/',
+}
+
+# Sync paths timed against the offline stand-in (make benchmark), a path averaging
+# more than its MAX_SECONDS per run fails the test suite
+STANDIN_BENCHMARK = {
+    'ROUNDS': int(os.getenv('TS_BENCHMARK_ROUNDS', 3)),
+    'LATENCY_MS': int(os.getenv('TS_BENCHMARK_LATENCY_MS', 0)),
+    'MAX_SECONDS': {
+        'sync_update_package_stats': 5,
+        'fetch_latest_builds': 5,
+        'yml_job': 10,
+    },
+}
+
+# Refresh of hot cached API responses, ahead of their expiry
+CACHE_WARMUP = {
+    'AHEAD_MIN': 10,
+    'MIN_HITS': 3,
+    'HOT_WINDOW_HOURS': 24,
+    'MAX_KEYS': 200,
+    'CONCURRENCY': 4,
+}